@@ -1,118 +1,446 @@
 """
 Multi-Agent Consensus Mechanism
-Coordinates all 5 AI agents and calculates consensus results
+Coordinates the registered AI agents and calculates consensus results
 """
 import json
+import time
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from app.ai_agents import lex, sofia, equity, holmes, sentinel
-from app.llm_provider import get_llm_provider
-from app.models.schemas import AgentVote, ConsensusResult
+from app import legal_corpus, metrics, tracing
+from app.ai_agents import single_call
+from app.ai_agents.registry import AgentSpec, get_agents
+from app.cancellation import CancellationToken, DeadlineExceeded
+from app.config import Config, ConsensusStrategy
+from app.llm_provider import BaseLLMProvider, Completion, get_llm_provider
+from app.models.schemas import AgentTiming, AgentVote, AnalysisPriority, ConsensusResult, ConsensusTiming
+from app.scheduler import priority_for_case, scheduler, wait_for_all
 
-
-# All available agents
-AGENTS = [
-    {"module": lex, "name": lex.AGENT_NAME, "role": lex.AGENT_ROLE},
-    {"module": sofia, "name": sofia.AGENT_NAME, "role": sofia.AGENT_ROLE},
-    {"module": equity, "name": equity.AGENT_NAME, "role": equity.AGENT_ROLE},
-    {"module": holmes, "name": holmes.AGENT_NAME, "role": holmes.AGENT_ROLE},
-    {"module": sentinel, "name": sentinel.AGENT_NAME, "role": sentinel.AGENT_ROLE},
-]
+TITLE_IX_QUESTION = "Does this incident meet Title IX hostile environment standard and fall within institutional jurisdiction?"
 
 
 def parse_agent_response(response_text: str, agent_name: str) -> Dict[str, Any]:
     """Parse JSON response from agent, with error handling"""
+    with tracing.span("parse_agent_response", agent=agent_name, response_chars=len(response_text)):
+        try:
+            # Try to parse as JSON
+            data = json.loads(response_text)
+            return data
+        except json.JSONDecodeError:
+            # If not valid JSON, try to extract JSON from markdown code blocks
+            if "```json" in response_text:
+                json_start = response_text.find("```json") + 7
+                json_end = response_text.find("```", json_start)
+                json_str = response_text[json_start:json_end].strip()
+                try:
+                    return json.loads(json_str)
+                except:
+                    pass
+
+            # Fallback: return a default response
+            print(f"Warning: Could not parse response from {agent_name}. Using default.")
+            metrics.AGENT_PARSE_FAILURES.inc(agent_name)
+            return default_agent_response(agent_name)
+
+
+def default_agent_response(agent_name: str) -> Dict[str, Any]:
+    """Abstaining response used when an agent's output can't be parsed"""
+    return {
+        "vote": "ABSTAIN",
+        "confidence": 0.5,
+        "reasoning": f"Agent {agent_name} response could not be parsed.",
+        "error": "Parse failure"
+    }
+
+
+def timed_out_agent_response(agent_name: str) -> Dict[str, Any]:
+    """Abstaining response used when an agent runs past Config.AGENT_DEADLINE_SECONDS"""
+    return {
+        "vote": "ABSTAIN",
+        "confidence": 0.5,
+        "reasoning": f"Agent {agent_name} did not respond within {Config.AGENT_DEADLINE_SECONDS:g}s.",
+        "error": "Deadline exceeded"
+    }
+
+
+def generate_within_deadline(
+    llm_provider: BaseLLMProvider,
+    cancel: CancellationToken,
+    *args
+) -> Optional[Completion]:
+    """
+    llm_provider.generate_completion(*args) under the per-agent deadline
+
+    Returns None if the agent's own deadline passed; cancellation of the whole
+    analysis (disconnect or analysis deadline) propagates.
+    """
+    agent_cancel = cancel.child(Config.AGENT_DEADLINE_SECONDS)
     try:
-        # Try to parse as JSON
-        data = json.loads(response_text)
-        return data
-    except json.JSONDecodeError:
-        # If not valid JSON, try to extract JSON from markdown code blocks
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            json_str = response_text[json_start:json_end].strip()
-            try:
-                return json.loads(json_str)
-            except:
-                pass
-
-        # Fallback: return a default response
-        print(f"Warning: Could not parse response from {agent_name}. Using default.")
-        return {
-            "vote": "ABSTAIN",
-            "confidence": 0.5,
-            "reasoning": f"Agent {agent_name} response could not be parsed.",
-            "error": "Parse failure"
-        }
-
-
-def run_consensus(question: str, case_data: Dict[str, Any]) -> ConsensusResult:
+        return llm_provider.generate_completion(*args, cancel=agent_cancel)
+    except DeadlineExceeded:
+        cancel.raise_if_cancelled()
+        return None
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(1000 * seconds, 1) if seconds is not None else None
+
+
+def build_agent_timing(
+    completion: Optional[Completion],
+    scheduler_wait: float,
+    parse_time: Optional[float],
+    total: float
+) -> AgentTiming:
+    """Timing section for a vote; completion is None when the agent ran out of time"""
+    timing = AgentTiming(
+        scheduler_wait_ms=_ms(scheduler_wait),
+        queue_wait_ms=_ms(scheduler_wait + (completion.limiter_wait if completion else 0.0)),
+        parse_ms=_ms(parse_time),
+        total_ms=_ms(total)
+    )
+    if completion is not None:
+        tokens_per_second = completion.tokens_per_second
+        timing.backend = completion.backend
+        timing.model = completion.model
+        timing.fallback = completion.fallback
+        timing.limiter_wait_ms = _ms(completion.limiter_wait)
+        timing.time_to_first_token_ms = _ms(completion.time_to_first_token)
+        timing.generation_ms = _ms(completion.generation_time)
+        timing.prompt_tokens = completion.prompt_tokens
+        timing.completion_tokens = completion.completion_tokens
+        timing.tokens_per_second = round(tokens_per_second, 1) if tokens_per_second else None
+    return timing
+
+
+def build_consensus_timing(agent_votes: List[AgentVote], total: float) -> ConsensusTiming:
     """
-    Run multi-agent consensus analysis
+    Totals over the LLM calls behind the final votes (single-call votes share one
+    call; cascade fast-tier calls that were escalated are not counted)
+    """
+    calls = list({id(v.timing): v.timing for v in agent_votes if v.timing and v.timing.backend}.values())
+    timed = [v for v in agent_votes if v.timing and v.timing.total_ms is not None]
+    slowest = max(timed, key=lambda v: v.timing.total_ms, default=None)
+    queue_waits = [v.timing.queue_wait_ms for v in timed if v.timing.queue_wait_ms is not None]
+
+    return ConsensusTiming(
+        total_ms=_ms(total),
+        llm_calls=len(calls),
+        prompt_tokens=sum(t.prompt_tokens or 0 for t in calls),
+        completion_tokens=sum(t.completion_tokens or 0 for t in calls),
+        slowest_agent=slowest.agent_name if slowest else None,
+        slowest_agent_ms=slowest.timing.total_ms if slowest else None,
+        max_queue_wait_ms=max(queue_waits, default=None)
+    )
 
-    Args:
-        question: The question to analyze (e.g., "Does this meet Title IX standards?")
-        case_data: Dictionary containing case information
 
-    Returns:
-        ConsensusResult with all agent votes and consensus decision
+def build_agent_vote(agent: AgentSpec, parsed_response: Dict[str, Any]) -> AgentVote:
+    """Turn an agent's parsed JSON response into an AgentVote"""
+
+    # Extract vote data
+    vote = parsed_response.get("vote", "ABSTAIN")
+    confidence = float(parsed_response.get("confidence", 0.5))
+    reasoning = parsed_response.get("reasoning", "No reasoning provided.")
+
+    # Extract optional fields (different for each agent)
+    citations = list(parsed_response.get("citations", []))
+    recommendations = list(parsed_response.get("recommendations", []))
+
+    # Combine all extra fields for display
+    if not recommendations:
+        # Check for agent-specific recommendation fields
+        recommendations.extend(parsed_response.get("procedural_notes", []))
+        recommendations.extend(parsed_response.get("trauma_indicators", []))
+        recommendations.extend(parsed_response.get("bias_flags", []))
+        recommendations.extend(parsed_response.get("pattern_flags", []))
+
+    # Check citations against the legal reference corpus (None when it is unavailable)
+    unverified = legal_corpus.unverified_citations([str(citation) for citation in citations]) if citations else None
+    if unverified:
+        metrics.AGENT_UNVERIFIED_CITATIONS.inc(agent.name, amount=len(unverified))
+
+    return AgentVote(
+        agent_name=agent.name,
+        agent_role=agent.role,
+        vote=vote,
+        confidence=confidence,
+        reasoning=reasoning,
+        citations=citations if citations else None,
+        unverified_citations=unverified,
+        recommendations=recommendations if recommendations else None,
+        error=parsed_response.get("error")
+    )
+
+
+def get_agent_provider(agent: AgentSpec, providers: Dict[tuple, BaseLLMProvider]) -> BaseLLMProvider:
+    """Provider for an agent's routing, shared between agents with identical routing"""
+    key = (agent.provider, agent.model, agent.temperature, agent.max_tokens)
+
+    if key not in providers:
+        providers[key] = get_llm_provider(
+            agent.provider,
+            model=agent.model,
+            temperature=agent.temperature,
+            max_tokens=agent.max_tokens
+        )
+
+    return providers[key]
+
+
+def collect_votes_fan_out(
+    agents: List[AgentSpec],
+    question: str,
+    case_data: Dict[str, Any],
+    priority: AnalysisPriority,
+    cancel: CancellationToken
+) -> List[AgentVote]:
     """
+    Fan-out strategy: one completion per agent, each on its own routed model
 
-    llm_provider = get_llm_provider()
-    agent_votes = []
+    Agents are consulted in parallel through the shared scheduler; each
+    provider's limiter decides how many of those calls actually hit the backend.
+    """
 
-    # Collect votes from all agents
-    for agent_config in AGENTS:
-        agent_module = agent_config["module"]
-        agent_name = agent_config["name"]
-        agent_role = agent_config["role"]
+    # Resolve providers up front so agents with identical routing share one
+    providers = {}
+    agent_providers = [get_agent_provider(agent, providers) for agent in agents]
 
-        print(f"Consulting {agent_name} ({agent_role})...")
+    def consult(agent: AgentSpec, llm_provider: BaseLLMProvider, submitted: float) -> AgentVote:
+        started = time.perf_counter()
+        try:
+            with tracing.span("consult_agent", agent=agent.name, scheduler_wait_ms=round(1000 * (started - submitted), 1)):
+                return consult_agent(agent, llm_provider, started - submitted, started)
+        finally:
+            metrics.AGENT_DURATION.observe(time.perf_counter() - started, agent.name)
+
+    def consult_agent(agent: AgentSpec, llm_provider: BaseLLMProvider, scheduler_wait: float, started: float) -> AgentVote:
+        print(f"Consulting {agent.name} ({agent.role})...")
 
         # Build prompts using agent's specific prompt builder
-        system_prompt = agent_module.SYSTEM_PROMPT
-        user_prompt = agent_module.build_prompt(question, case_data)
+        system_prompt = agent.module.SYSTEM_PROMPT
+        with tracing.span("build_prompt", agent=agent.name):
+            user_prompt = agent.module.build_prompt(question, case_data)
 
         # Get LLM response
-        response_text = llm_provider.generate(system_prompt, user_prompt)
+        completion = generate_within_deadline(llm_provider, cancel, system_prompt, user_prompt)
+        if completion is None:
+            print(f"Warning: {agent.name} exceeded its deadline. Abstaining.")
+            metrics.AGENT_DEADLINE_EXCEEDED.inc(agent.name)
+            vote = build_agent_vote(agent, timed_out_agent_response(agent.name))
+            vote.timing = build_agent_timing(None, scheduler_wait, None, time.perf_counter() - started)
+            return vote
 
         # Parse response
-        parsed_response = parse_agent_response(response_text, agent_name)
-
-        # Extract vote data
-        vote = parsed_response.get("vote", "ABSTAIN")
-        confidence = float(parsed_response.get("confidence", 0.5))
-        reasoning = parsed_response.get("reasoning", "No reasoning provided.")
-
-        # Extract optional fields (different for each agent)
-        citations = parsed_response.get("citations", [])
-        recommendations = parsed_response.get("recommendations", [])
-
-        # Combine all extra fields for display
-        if not recommendations:
-            # Check for agent-specific recommendation fields
-            recommendations.extend(parsed_response.get("procedural_notes", []))
-            recommendations.extend(parsed_response.get("trauma_indicators", []))
-            recommendations.extend(parsed_response.get("bias_flags", []))
-            recommendations.extend(parsed_response.get("pattern_flags", []))
-
-        # Create AgentVote object
-        agent_vote = AgentVote(
-            agent_name=agent_name,
-            agent_role=agent_role,
-            vote=vote,
-            confidence=confidence,
-            reasoning=reasoning,
-            citations=citations if citations else None,
-            recommendations=recommendations if recommendations else None
+        parse_started = time.perf_counter()
+        parsed_response = parse_agent_response(completion.text, agent.name)
+        vote = build_agent_vote(agent, parsed_response)
+        finished = time.perf_counter()
+
+        vote.timing = build_agent_timing(completion, scheduler_wait, finished - parse_started, finished - started)
+        return vote
+
+    submitted = time.perf_counter()
+    futures = [
+        scheduler.submit(consult, agent, llm_provider, submitted, priority=priority)
+        for agent, llm_provider in zip(agents, agent_providers)
+    ]
+    return wait_for_all(futures, cancel)
+
+
+def collect_votes_single_call(
+    agents: List[AgentSpec],
+    question: str,
+    case_data: Dict[str, Any],
+    priority: AnalysisPriority,
+    cancel: CancellationToken
+) -> List[AgentVote]:
+    """
+    Single-call strategy: one structured completion covering every agent
+
+    The case data is sent (and prompt-processed) once instead of once per agent,
+    on the default provider - per-agent model routing does not apply.
+    """
+
+    print(f"Consulting the council ({len(agents)} agents) in a single completion...")
+
+    with tracing.span("build_prompt", agent="Council"):
+        system_prompt = single_call.build_system_prompt(agents)
+        user_prompt = single_call.build_user_prompt(question, case_data)
+
+    llm_provider = get_llm_provider()
+    response_schema = single_call.build_response_schema(agents)
+    submitted = time.perf_counter()
+
+    def consult_council():
+        started = time.perf_counter()
+        completion = generate_within_deadline(
+            llm_provider, cancel, system_prompt, user_prompt, Config.SINGLE_CALL_MAX_TOKENS, response_schema
         )
+        return completion, started - submitted, started
+
+    completion, scheduler_wait, started = wait_for_all([scheduler.submit(consult_council, priority=priority)], cancel)[0]
+
+    if completion is None:
+        print("Warning: Council completion exceeded its deadline. All agents abstain.")
+        timing = build_agent_timing(None, scheduler_wait, None, time.perf_counter() - started)
+        agent_votes = []
+        for agent in agents:
+            metrics.AGENT_DEADLINE_EXCEEDED.inc(agent.name)
+            agent_votes.append(build_agent_vote(agent, timed_out_agent_response(agent.name)))
+            agent_votes[-1].timing = timing
+        return agent_votes
+
+    parse_started = time.perf_counter()
+    parsed_council = parse_agent_response(completion.text, "Council")
+    council_votes = single_call.split_council_votes(parsed_council, [agent.name for agent in agents])
+
+    agent_votes = []
+    for agent in agents:
+        parsed_response = council_votes[agent.name]
+        if parsed_response is None:
+            print(f"Warning: {agent.name} missing from council response. Using default.")
+            metrics.AGENT_PARSE_FAILURES.inc(agent.name)
+            parsed_response = default_agent_response(agent.name)
+        agent_votes.append(build_agent_vote(agent, parsed_response))
+
+    # Every vote came from the same completion, so they share its timing
+    finished = time.perf_counter()
+    timing = build_agent_timing(completion, scheduler_wait, finished - parse_started, finished - started)
+    for vote in agent_votes:
+        vote.timing = timing
+
+    return agent_votes
+
+
+def route_to_tier(agent: AgentSpec, provider: str, model: str) -> AgentSpec:
+    """Re-route an agent to a cascade tier; empty settings keep the agent's own routing"""
+    if not provider and not model:
+        return agent
+
+    return replace(
+        agent,
+        provider=provider or agent.provider,
+        model=model or (None if provider else agent.model)
+    )
+
+
+def select_escalations(first_pass: ConsensusResult) -> List[str]:
+    """
+    Names of the agents whose fast-tier votes should be re-run on the strong tier
+
+    Parse failures always escalate. When the council is in doubt (disagreement or
+    low overall confidence), minority and low-confidence votes escalate too; if no
+    single vote stands out, the whole council does.
+    """
+    votes = first_pass.agent_breakdown
+    escalate = {v.agent_name for v in votes if v.error}
+
+    in_doubt = first_pass.has_disagreement or first_pass.confidence < Config.CASCADE_MIN_CONFIDENCE
+    if not in_doubt:
+        return [v.agent_name for v in votes if v.agent_name in escalate]
+
+    for v in votes:
+        is_minority = v.vote in ("YES", "NO") and v.vote != first_pass.decision
+        if is_minority or v.confidence < Config.CASCADE_MIN_CONFIDENCE:
+            escalate.add(v.agent_name)
+
+    if not escalate:
+        escalate = {v.agent_name for v in votes}
+
+    return [v.agent_name for v in votes if v.agent_name in escalate]
 
-        agent_votes.append(agent_vote)
 
-    # Calculate consensus
-    consensus = calculate_consensus(question, agent_votes)
+def collect_votes_cascade(
+    agents: List[AgentSpec],
+    question: str,
+    case_data: Dict[str, Any],
+    priority: AnalysisPriority,
+    cancel: CancellationToken
+) -> List[AgentVote]:
+    """
+    Cascade strategy: run the council on the fast tier, then re-run only the
+    doubtful agents on the strong tier (CASCADE_STRONG_PROVIDER / _MODEL)
+    """
+
+    fast_agents = [
+        route_to_tier(agent, Config.CASCADE_FAST_PROVIDER, Config.CASCADE_FAST_MODEL) for agent in agents
+    ]
+    agent_votes = collect_votes_fan_out(fast_agents, question, case_data, priority, cancel)
+    for vote in agent_votes:
+        vote.tier = "fast"
+
+    escalate = select_escalations(calculate_consensus(question, agent_votes))
+    if not escalate:
+        return agent_votes
+
+    print(f"Escalating {', '.join(escalate)} to the strong tier...")
+
+    strong_agents = [
+        route_to_tier(agent, Config.CASCADE_STRONG_PROVIDER, Config.CASCADE_STRONG_MODEL)
+        for agent in agents if agent.name in escalate
+    ]
+    strong_votes = {vote.agent_name: vote for vote in collect_votes_fan_out(strong_agents, question, case_data, priority, cancel)}
+    for vote in strong_votes.values():
+        vote.tier = "strong"
+
+    return [strong_votes.get(vote.agent_name, vote) for vote in agent_votes]
+
+
+def run_consensus(
+    question: str,
+    case_data: Dict[str, Any],
+    strategy: Optional[str] = None,
+    priority: Optional[str] = None,
+    cancel: Optional[CancellationToken] = None
+) -> ConsensusResult:
+    """
+    Run multi-agent consensus analysis
+
+    Args:
+        question: The question to analyze (e.g., "Does this meet Title IX standards?")
+        case_data: Dictionary containing case information
+        strategy: "fan_out" (one completion per agent), "single_call" (all agents in
+            one completion) or "cascade" (fast model first, escalate doubtful agents).
+            Defaults to Config.CONSENSUS_STRATEGY.
+        priority: Scheduling class for the agent calls ("crisis" ... "background").
+            Defaults to the case's urgency (crisis flag, priority, deadline).
+        cancel: Token that aborts in-flight agent calls when cancelled. Defaults to
+            one expiring after Config.ANALYSIS_DEADLINE_SECONDS.
+
+    Returns:
+        ConsensusResult with all agent votes and consensus decision
+
+    Raises:
+        AnalysisCancelled: the token was cancelled (DeadlineExceeded if it expired)
+    """
+
+    strategy = ConsensusStrategy(strategy or Config.CONSENSUS_STRATEGY)
+    priority = AnalysisPriority(priority) if priority else priority_for_case(case_data)
+    cancel = cancel or CancellationToken(Config.ANALYSIS_DEADLINE_SECONDS)
+    agents = get_agents()
+    started = time.perf_counter()
+
+    with tracing.span(
+        "run_consensus", case_id=case_data.get("id"), strategy=strategy.value, priority=priority.value
+    ) as current:
+        # Collect votes from all enabled agents
+        if strategy == ConsensusStrategy.SINGLE_CALL:
+            agent_votes = collect_votes_single_call(agents, question, case_data, priority, cancel)
+        elif strategy == ConsensusStrategy.CASCADE:
+            agent_votes = collect_votes_cascade(agents, question, case_data, priority, cancel)
+        else:
+            agent_votes = collect_votes_fan_out(agents, question, case_data, priority, cancel)
+
+        # Calculate consensus
+        consensus = calculate_consensus(question, agent_votes)
+        consensus.strategy = strategy.value
+        consensus.timing = build_consensus_timing(agent_votes, time.perf_counter() - started)
+        current.set_attribute("consensus.decision", consensus.decision)
+
+    metrics.CONSENSUS_DURATION.observe(time.perf_counter() - started, strategy.value)
+    for vote in agent_votes:
+        metrics.AGENT_VOTES.inc(vote.agent_name, vote.vote)
 
     return consensus
 
@@ -186,7 +514,11 @@ def generate_recommendation(decision: str, confidence: float, has_disagreement:
 
 
 # Convenience function for common Title IX question
-def analyze_title_ix_jurisdiction(case_data: Dict[str, Any]) -> ConsensusResult:
+def analyze_title_ix_jurisdiction(
+    case_data: Dict[str, Any],
+    strategy: Optional[str] = None,
+    priority: Optional[str] = None,
+    cancel: Optional[CancellationToken] = None
+) -> ConsensusResult:
     """Shortcut to analyze if case meets Title IX jurisdiction"""
-    question = "Does this incident meet Title IX hostile environment standard and fall within institutional jurisdiction?"
-    return run_consensus(question, case_data)
+    return run_consensus(TITLE_IX_QUESTION, case_data, strategy, priority, cancel)
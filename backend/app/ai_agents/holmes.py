@@ -2,6 +2,7 @@
 Agent Holmes - Evidence Analysis Expert
 Analyzes factual evidence, credibility, and corroboration
 """
+from app import timeline
 
 SYSTEM_PROMPT = """You are Holmes, an evidence analysis and investigation expert. You specialize in:
 - Fact extraction and timeline reconstruction
@@ -31,17 +32,22 @@ AGENT_ROLE = "Evidence Analysis"
 
 def build_prompt(question: str, case_data: dict) -> str:
     """Build the user prompt for Holmes"""
+    dated = timeline.prompt_sections(case_data)
+    incident_date = "" if dated.incident_on_timeline else f"\n- Incident Date: {case_data.get('incident_date', 'Unknown')}"
+
     return f"""
 QUESTION: {question}
 
 CASE DATA:
-- Description: {case_data.get('description', 'No description provided')}
-- Incident Date: {case_data.get('incident_date', 'Unknown')}
+- Description: {case_data.get('description', 'No description provided')}{incident_date}
 - Evidence Count: {case_data.get('evidence_count', 0)}
 - Witness Count: {case_data.get('witness_count', 0)}
 
 AVAILABLE EVIDENCE:
-{case_data.get('evidence_summary', 'No evidence details provided')}
+{dated.evidence}
+
+TIMELINE (computed from the recorded dates; overlaps and contradictions are already checked):
+{dated.timeline}
 
 Analyze the evidence from an investigative perspective and respond in the JSON format specified in your system prompt.
 """
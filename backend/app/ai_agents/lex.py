@@ -2,6 +2,7 @@
 Agent Lex - Legal Compliance Expert
 Analyzes cases through Title IX legal standards
 """
+from app import legal_corpus
 
 SYSTEM_PROMPT = """You are Lex, a Title IX legal compliance expert. You have deep knowledge of:
 - Title IX of the Education Amendments Act of 1972 (20 U.S.C. § 1681)
@@ -22,6 +23,8 @@ You MUST respond in valid JSON format with this exact structure:
 }
 
 Be precise, cite specific legal standards, and maintain strict neutrality.
+Prefer the LEGAL REFERENCES provided with the case and cite them as written there; every citation
+you give is checked against the reference corpus.
 """
 
 AGENT_NAME = "Lex"
@@ -40,5 +43,8 @@ CASE DATA:
 - Location: {case_data.get('incident_location', 'Not specified')}
 - Is Ongoing: {case_data.get('is_ongoing', False)}
 
+LEGAL REFERENCES (retrieved from the local reference corpus):
+{legal_corpus.prompt_references(case_data, question)}
+
 Analyze this case from a legal compliance perspective and respond in the JSON format specified in your system prompt.
 """
@@ -0,0 +1,101 @@
+"""
+Agent Registry
+Declares which agents sit on the council and which model each one runs on
+"""
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, Any, List, Optional
+
+from app.config import Config
+
+
+@dataclass
+class AgentSpec:
+    """An agent module plus its model routing"""
+    module: ModuleType
+    name: str
+    role: str
+    provider: Optional[str] = None  # None = Config.LLM_PROVIDER
+    model: Optional[str] = None  # None = the provider's configured model
+    max_tokens: Optional[int] = None  # None = the provider's default
+    temperature: Optional[float] = None  # None = the provider's default
+    enabled: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public description of the agent (without the module object)"""
+        return {
+            "name": self.name,
+            "role": self.role,
+            "module": self.module.__name__,
+            "provider": self.provider or Config.get_llm_provider(),
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "enabled": self.enabled,
+        }
+
+
+_registry: Dict[str, AgentSpec] = {}
+_loaded = False
+
+
+def _setting(module: ModuleType, name: str, key: str, cast):
+    """Resolve a routing setting: AGENT_<NAME>_<KEY> env var, then module attribute"""
+    value = Config.get_agent_setting(name, key)
+    if value is None or value == "":
+        value = getattr(module, key, None)
+    return cast(value) if value is not None else None
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def register_agent(module: ModuleType) -> AgentSpec:
+    """
+    Add an agent module to the council
+
+    The module must define SYSTEM_PROMPT, AGENT_NAME, AGENT_ROLE and build_prompt().
+    It may also define PROVIDER, MODEL, MAX_TOKENS, TEMPERATURE and ENABLED defaults,
+    each overridable through AGENT_<NAME>_<SETTING> environment variables.
+    """
+    name = module.AGENT_NAME
+
+    enabled = _setting(module, name, "ENABLED", _parse_bool)
+    if name.lower() in Config.DISABLED_AGENTS:
+        enabled = False
+
+    spec = AgentSpec(
+        module=module,
+        name=name,
+        role=module.AGENT_ROLE,
+        provider=_setting(module, name, "PROVIDER", str),
+        model=_setting(module, name, "MODEL", str),
+        max_tokens=_setting(module, name, "MAX_TOKENS", int),
+        temperature=_setting(module, name, "TEMPERATURE", float),
+        enabled=enabled if enabled is not None else True,
+    )
+
+    _registry[name] = spec
+    return spec
+
+
+def load_agents() -> None:
+    """Import and register every module listed in Config.AGENT_MODULES"""
+    global _loaded
+
+    for module_path in Config.AGENT_MODULES:
+        register_agent(importlib.import_module(module_path))
+
+    _loaded = True
+
+
+def get_agents(include_disabled: bool = False) -> List[AgentSpec]:
+    """Council members in registration order"""
+    if not _loaded:
+        load_agents()
+
+    return [spec for spec in _registry.values() if include_disabled or spec.enabled]
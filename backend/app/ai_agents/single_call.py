@@ -0,0 +1,143 @@
+"""
+Single-Call Council Strategy
+Asks one completion for every agent's vote instead of one completion per agent
+"""
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from app import legal_corpus, timeline
+from app.ai_agents.registry import AgentSpec
+
+SECTION_HEADER = "=== COUNCIL MEMBER: {name} ==="
+SECTION_PATTERN = re.compile(r"^=== COUNCIL MEMBER: (.+?) ===$", re.MULTILINE)
+
+COUNCIL_PREAMBLE = """You are the SafeSpace AI Council, a panel of independent experts reviewing a single case.
+Each council member's brief is given below. For every member, adopt that member's persona and
+expertise and produce the JSON response that member's brief asks for. Members reason independently:
+do not let one member's conclusion influence another's vote.
+
+You MUST respond with ONE valid JSON object whose keys are the member names ({names}) and whose
+values are each member's JSON response. Do not include any text outside the JSON object.
+"""
+
+# Optional per-agent list fields that become citations / recommendations on the AgentVote
+OPTIONAL_LIST_FIELDS = [
+    "citations", "recommendations", "procedural_notes", "trauma_indicators", "bias_flags", "pattern_flags",
+]
+
+# Case fields shown once to the whole council (union of what the individual agents read)
+CASE_FIELDS = [
+    ("category", "Category", "Unknown"),
+    ("description", "Description", "No description provided"),
+    ("incident_date", "Incident Date", "Unknown"),
+    ("incident_location", "Location", "Not specified"),
+    ("is_ongoing", "Is Ongoing", False),
+    ("is_crisis", "Crisis Flag", False),
+    ("respondent_id", "Respondent", "Unknown"),
+    ("department", "Department/Unit", "Not specified"),
+    ("relationship", "Complainant-Respondent Relationship", "Not specified"),
+    ("complainant_demographics", "Complainant Demographics", "Not specified"),
+    ("respondent_demographics", "Respondent Demographics", "Not specified"),
+    ("evidence_count", "Evidence Count", 0),
+    ("witness_count", "Witness Count", 0),
+    ("prior_case_count", "Prior cases involving respondent", 0),
+    ("department_case_count", "Department case history", 0),
+]
+
+
+def build_system_prompt(agents: List[AgentSpec]) -> str:
+    """Combine every agent's system prompt into one council brief"""
+    names = ", ".join(f'"{agent.name}"' for agent in agents)
+    sections = [COUNCIL_PREAMBLE.format(names=names)]
+
+    for agent in agents:
+        sections.append(SECTION_HEADER.format(name=agent.name))
+        sections.append(agent.module.SYSTEM_PROMPT.strip())
+
+    return "\n\n".join(sections) + "\n"
+
+
+def build_user_prompt(question: str, case_data: dict) -> str:
+    """Build the shared user prompt - case data is sent once for the whole council"""
+    dated = timeline.prompt_sections(case_data)
+    case_lines = "\n".join(
+        f"- {label}: {case_data.get(key, default)}" for key, label, default in CASE_FIELDS
+        if not (key == "incident_date" and dated.incident_on_timeline)
+    )
+
+    return f"""
+QUESTION: {question}
+
+CASE DATA:
+{case_lines}
+
+AVAILABLE EVIDENCE:
+{dated.evidence}
+
+TIMELINE (computed from the recorded dates; overlaps and contradictions are already checked):
+{dated.timeline}
+
+LEGAL REFERENCES (retrieved from the local reference corpus):
+{legal_corpus.prompt_references(case_data, question)}
+
+Analyze this case as each council member and respond with the single JSON object specified in your system prompt.
+"""
+
+
+def build_response_schema(agents: List[AgentSpec]) -> Dict[str, Any]:
+    """
+    JSON schema for structured-output backends (LM Studio, Ollama)
+
+    Grammar-constrained decoders only emit keys the schema names, so the
+    optional fields build_agent_vote reads are listed, and each member may add
+    the other fields its own brief asks for.
+    """
+    string_list = {"type": "array", "items": {"type": "string"}}
+    vote_schema = {
+        "type": "object",
+        "properties": {
+            "vote": {"type": "string", "enum": ["YES", "NO", "ABSTAIN"]},
+            "confidence": {"type": "number"},
+            "reasoning": {"type": "string"},
+            **{field: string_list for field in OPTIONAL_LIST_FIELDS},
+        },
+        "required": ["vote", "confidence", "reasoning"],
+        "additionalProperties": True,
+    }
+
+    return {
+        "type": "object",
+        "properties": {agent.name: vote_schema for agent in agents},
+        "required": [agent.name for agent in agents],
+    }
+
+
+def split_persona_sections(system_prompt: str) -> List[Tuple[str, str]]:
+    """Split a council system prompt back into (agent name, agent system prompt) pairs"""
+    matches = list(SECTION_PATTERN.finditer(system_prompt))
+    sections = []
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(system_prompt)
+        sections.append((match.group(1), system_prompt[match.end():end].strip()))
+
+    return sections
+
+
+def split_council_votes(parsed: Any, agent_names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Map the council's JSON object onto individual agent responses
+
+    Matches member keys case-insensitively; agents missing from the output map to None.
+    """
+    if not isinstance(parsed, dict):
+        return {name: None for name in agent_names}
+
+    by_key = {str(key).strip().lower(): value for key, value in parsed.items()}
+
+    votes = {}
+    for name in agent_names:
+        value = by_key.get(name.lower())
+        votes[name] = value if isinstance(value, dict) else None
+
+    return votes
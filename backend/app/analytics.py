@@ -0,0 +1,209 @@
+"""
+What-if re-scoring of historical consensus votes
+Recomputes decision, confidence and disagreement for every stored analysis
+under a proposed rule set (agent weights, thresholds) in one vectorized NumPy
+pass, with no LLM calls, and counts the decisions that would flip
+
+The votes are loaded from the analysis history into dense arrays (analyses x
+agents) once; the history is append-only, so later calls only load the rows
+added since.
+"""
+import threading
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from app.data import analysis_history
+from app.models.schemas import WhatIfReport, WhatIfRules
+
+DECISIONS = np.array(["NO", "UNCERTAIN", "YES"])  # Indexed by decision code + 1
+SAMPLE_FLIPS = 20
+
+
+class VoteSnapshot(NamedTuple):
+    """The matrix's arrays at one point in time; refreshes replace arrays, never modify them"""
+    agents: Tuple[str, ...]
+    ids: np.ndarray
+    questions: np.ndarray
+    strategies: np.ndarray
+    analyzed_at: np.ndarray
+    decisions: np.ndarray
+    disagreement: np.ndarray
+    confidence: np.ndarray
+    votes: np.ndarray
+    vote_confidence: np.ndarray
+
+
+class VoteMatrix:
+    """Agent votes of every stored analysis as (analyses x agents) arrays"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_rowid = 0
+        self.agents: List[str] = []
+        self.ids = np.empty(0, dtype=object)
+        self.questions = np.empty(0, dtype=object)
+        self.strategies = np.empty(0, dtype=object)
+        self.analyzed_at = np.empty(0, dtype=object)
+        self.decisions = np.empty(0, dtype=np.int8)  # Stored decision: 1 YES, -1 NO, 0 UNCERTAIN
+        self.disagreement = np.empty(0, dtype=bool)
+        self.confidence = np.empty(0, dtype=np.float64)
+        self.votes = np.zeros((0, 0), dtype=np.int8)  # 1 YES, -1 NO, 0 abstain / no vote
+        self.vote_confidence = np.full((0, 0), np.nan)  # NaN where the agent didn't take part
+
+    def refresh(self) -> VoteSnapshot:
+        """Append analyses recorded since the last refresh and return a consistent snapshot"""
+        with self.lock:
+            self._append_new_rows()
+            return VoteSnapshot(
+                tuple(self.agents), self.ids, self.questions, self.strategies, self.analyzed_at,
+                self.decisions, self.disagreement, self.confidence, self.votes, self.vote_confidence
+            )
+
+    def _append_new_rows(self) -> None:
+        """Load analyses recorded since the last refresh (caller holds the lock)"""
+        conn = analysis_history._conn()
+        rows = conn.execute(
+            """SELECT rowid, id, question, strategy, analyzed_at, decision, has_disagreement, confidence
+               FROM analyses WHERE rowid > ? ORDER BY rowid""",
+            (self.last_rowid,)
+        ).fetchall()
+        if not rows:
+            return
+
+        new_ids = [row["id"] for row in rows]
+        index = {analysis_id: i for i, analysis_id in enumerate(new_ids)}
+        # Bounded by the rows just read: analyses recorded in between are left for the next refresh
+        votes = conn.execute(
+            """SELECT v.analysis_id, v.agent_name, v.vote, v.confidence FROM agent_votes v
+               JOIN analyses a ON a.id = v.analysis_id WHERE a.rowid > ? AND a.rowid <= ?""",
+            (self.last_rowid, rows[-1]["rowid"])
+        ).fetchall()
+
+        agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        for vote in votes:
+            if vote["agent_name"] not in agent_index:
+                agent_index[vote["agent_name"]] = len(self.agents)
+                self.agents.append(vote["agent_name"])
+
+        count, agents = len(rows), len(self.agents)
+        codes = {"YES": 1, "NO": -1}
+        rows_at = np.fromiter((index[vote[0]] for vote in votes), dtype=np.int64, count=len(votes))
+        columns_at = np.fromiter((agent_index[vote[1]] for vote in votes), dtype=np.int64, count=len(votes))
+        new_votes = np.zeros((count, agents), dtype=np.int8)
+        new_votes[rows_at, columns_at] = np.fromiter((codes.get(vote[2], 0) for vote in votes), dtype=np.int8,
+                                                     count=len(votes))
+        new_confidence = np.full((count, agents), np.nan)
+        new_confidence[rows_at, columns_at] = np.fromiter((vote[3] for vote in votes), dtype=np.float64,
+                                                          count=len(votes))
+
+        # Agents first seen in this batch get empty columns for the older analyses
+        grow = agents - self.votes.shape[1]
+        if grow:
+            self.votes = np.pad(self.votes, ((0, 0), (0, grow)))
+            self.vote_confidence = np.pad(self.vote_confidence, ((0, 0), (0, grow)), constant_values=np.nan)
+
+        self.votes = np.concatenate([self.votes, new_votes])
+        self.vote_confidence = np.concatenate([self.vote_confidence, new_confidence])
+        self.ids = np.concatenate([self.ids, np.array(new_ids, dtype=object)])
+        self.questions = np.concatenate([self.questions, np.array([r["question"] for r in rows], dtype=object)])
+        self.strategies = np.concatenate([self.strategies, np.array([r["strategy"] for r in rows], dtype=object)])
+        self.analyzed_at = np.concatenate([self.analyzed_at, np.array([r["analyzed_at"] for r in rows], dtype=object)])
+        self.decisions = np.concatenate([
+            self.decisions, np.array([codes.get(r["decision"], 0) for r in rows], dtype=np.int8)
+        ])
+        self.disagreement = np.concatenate([
+            self.disagreement, np.array([bool(r["has_disagreement"]) for r in rows])
+        ])
+        self.confidence = np.concatenate([self.confidence, np.array([r["confidence"] for r in rows])])
+        self.last_rowid = rows[-1]["rowid"]
+
+
+_matrix = VoteMatrix()
+
+
+def rescore(votes: np.ndarray, vote_confidence: np.ndarray, weights: np.ndarray, rules: WhatIfRules) -> Dict[str, np.ndarray]:
+    """
+    calculate_consensus over many analyses at once
+
+    With all weights 1 and the default rules this reproduces the council's
+    own decisions: confidence-weighted YES/NO votes, ties go to NO, and
+    disagreement when confidences spread by more than the threshold or the
+    vote is split. A weight of 0 removes the agent entirely.
+    """
+    present = ~np.isnan(vote_confidence) & (weights > 0)
+    confidence = np.where(present, vote_confidence, 0.0)
+    counted = present & (votes != 0) & (confidence >= rules.min_confidence)
+    weighted = confidence * weights
+
+    yes = counted & (votes == 1)
+    no = counted & (votes == -1)
+    yes_weight = np.where(yes, weighted, 0.0).sum(axis=1)
+    no_weight = np.where(no, weighted, 0.0).sum(axis=1)
+    total = yes_weight + no_weight
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(total > 0, np.maximum(yes_weight, no_weight) / total, 0.0)
+    decision = np.where(yes_weight > no_weight, 1, -1).astype(np.int8)
+    # Nothing counted, or a margin of victory below uncertain_margin, is no decision
+    decision[(total == 0) | (2 * share - 1 < rules.uncertain_margin)] = 0
+
+    highest = np.where(present, confidence, -np.inf).max(axis=1, initial=-np.inf)
+    spread = highest - np.where(present, confidence, np.inf).min(axis=1, initial=np.inf)
+    spread = np.where(present.any(axis=1), spread, 0.0)
+    disagreement = spread > rules.disagreement_spread
+    if rules.split_vote_disagreement:
+        disagreement |= yes.any(axis=1) & no.any(axis=1)
+
+    return {"decision": decision, "confidence": np.round(share, 2), "disagreement": disagreement}
+
+
+def what_if(rules: WhatIfRules) -> WhatIfReport:
+    """Re-score the stored analyses matching the rules' filters and compare with the recorded outcome"""
+    started = time.perf_counter()
+    m = _matrix.refresh()
+
+    mask = np.ones(len(m.ids), dtype=bool)
+    if rules.question:
+        mask &= m.questions == rules.question
+    if rules.strategy:
+        mask &= m.strategies == rules.strategy
+    if rules.since:
+        mask &= m.analyzed_at >= rules.since
+    if rules.until:
+        mask &= m.analyzed_at < rules.until
+
+    unknown = sorted(set(rules.agent_weights) - set(m.agents))
+    weights = np.array([rules.agent_weights.get(agent, 1.0) for agent in m.agents], dtype=np.float64)
+    result = rescore(m.votes[mask], m.vote_confidence[mask], weights, rules)
+
+    before, after = m.decisions[mask], result["decision"]
+    flipped = before != after
+    transitions: Dict[str, int] = {}
+    for old in (-1, 0, 1):
+        for new in (-1, 0, 1):
+            count = int(np.count_nonzero((before == old) & (after == new)))
+            if old != new and count:
+                transitions[f"{DECISIONS[old + 1]}->{DECISIONS[new + 1]}"] = count
+
+    def counts(codes: np.ndarray) -> Dict[str, int]:
+        return {str(DECISIONS[code + 1]): int(np.count_nonzero(codes == code)) for code in (1, -1, 0)}
+
+    total = int(mask.sum())
+    return WhatIfReport(
+        analyses=total,
+        flipped=int(flipped.sum()),
+        flip_rate=round(float(flipped.mean()), 4) if total else 0.0,
+        transitions=transitions,
+        decisions_before=counts(before),
+        decisions_after=counts(after),
+        disagreement_before=int(m.disagreement[mask].sum()),
+        disagreement_after=int(result["disagreement"].sum()),
+        mean_confidence_before=round(float(m.confidence[mask].mean()), 4) if total else 0.0,
+        mean_confidence_after=round(float(result["confidence"].mean()), 4) if total else 0.0,
+        flipped_analysis_ids=m.ids[mask][flipped][:SAMPLE_FLIPS].tolist(),
+        agents=list(m.agents),
+        unknown_agents=unknown,
+        seconds=round(time.perf_counter() - started, 4)
+    )
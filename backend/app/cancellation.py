@@ -0,0 +1,96 @@
+"""
+Cancellation and deadlines for in-flight analyses
+A token is passed from the route through consensus into the providers
+"""
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class AnalysisCancelled(Exception):
+    """The analysis was cancelled (e.g. the client disconnected)"""
+
+
+class DeadlineExceeded(AnalysisCancelled):
+    """The analysis or agent ran past its deadline"""
+
+
+class CancellationToken:
+    """
+    Cancellation flag with an optional deadline
+
+    Child tokens (per agent) are cancelled with their parent but can carry a
+    tighter deadline of their own. Callbacks registered with on_cancel() run
+    on cancel() - providers use them to close open HTTP streams immediately.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, parent: Optional["CancellationToken"] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.parent = parent
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+        if parent is not None:
+            if parent.deadline is not None and (self.deadline is None or parent.deadline < self.deadline):
+                self.deadline = parent.deadline
+            parent.on_cancel(lambda: self.cancel(parent.reason or "cancelled"))
+
+    def child(self, timeout: Optional[float] = None) -> "CancellationToken":
+        """Token cancelled with this one, with an optional tighter deadline"""
+        return CancellationToken(timeout, parent=self)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel and run registered callbacks (once)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancellation callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run callback on cancellation (immediately if already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def cancelled(self) -> bool:
+        if self.parent is not None and self.parent.cancelled:
+            return True
+        return self._event.is_set() or self.expired
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep, waking early with AnalysisCancelled if cancelled meanwhile"""
+        remaining = self.remaining()
+        self._event.wait(seconds if remaining is None else min(seconds, remaining))
+        self.raise_if_cancelled()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise DeadlineExceeded or AnalysisCancelled if the work should stop"""
+        if self.parent is not None:
+            self.parent.raise_if_cancelled()
+        if self._event.is_set():
+            raise AnalysisCancelled(self.reason or "cancelled")
+        if self.expired:
+            raise DeadlineExceeded("deadline exceeded")
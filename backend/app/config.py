@@ -10,6 +10,14 @@ class LLMProvider(str, Enum):
     LOCAL = "local"  # LM Studio or Ollama
     ANTHROPIC = "anthropic"  # Claude API
     MOCK = "mock"  # For testing without LLM
+    RECORD = "record"  # LLM_RECORD_PROVIDER, saving completions to LLM_CASSETTE_PATH
+    REPLAY = "replay"  # Recorded completions from LLM_CASSETTE_PATH, offline
+
+class ConsensusStrategy(str, Enum):
+    """Available consensus strategies"""
+    FAN_OUT = "fan_out"  # One completion per agent
+    SINGLE_CALL = "single_call"  # All agents in one structured completion
+    CASCADE = "cascade"  # Fast model first, escalate doubtful agents to a stronger one
 
 class Config:
     """Application configuration"""
@@ -29,6 +37,54 @@ class Config:
     LOCAL_LLM_URL = os.getenv("LOCAL_LLM_URL", "http://localhost:1234/v1")
     LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "default")
 
+    # Provider Capacity - requests/minute, tokens/minute (0 = unlimited) and max concurrency
+    LOCAL_LLM_RPM = int(os.getenv("LOCAL_LLM_RPM", "0"))
+    LOCAL_LLM_TPM = int(os.getenv("LOCAL_LLM_TPM", "0"))
+    LOCAL_LLM_MAX_CONCURRENCY = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", "4"))
+    ANTHROPIC_RPM = int(os.getenv("ANTHROPIC_RPM", "50"))
+    ANTHROPIC_TPM = int(os.getenv("ANTHROPIC_TPM", "30000"))
+    ANTHROPIC_MAX_CONCURRENCY = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))  # Retries after 429/5xx
+    LIMITER_LATENCY_SPIKE = float(os.getenv("LIMITER_LATENCY_SPIKE", "2.0"))  # x moving average
+
+    # Record / replay - capture real completions, then benchmark offline against them
+    LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "data/llm_cassette.jsonl.gz")
+    LLM_RECORD_PROVIDER = os.getenv("LLM_RECORD_PROVIDER", LLMProvider.LOCAL)
+    LLM_REPLAY_LATENCY = float(os.getenv("LLM_REPLAY_LATENCY", "0"))  # x recorded timing; 0 = instant
+
+    # LLM Scheduler - shared workers that run agent calls in priority order
+    SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "8"))
+    SCHEDULER_AGING_SECONDS = float(os.getenv("SCHEDULER_AGING_SECONDS", "30"))  # Wait that earns one priority class
+    DEADLINE_URGENT_DAYS = int(os.getenv("DEADLINE_URGENT_DAYS", "7"))  # Cases this close to deadline run as urgent
+
+    # Agent Registry - comma-separated agent modules, in council order
+    AGENT_MODULES = [
+        module.strip() for module in os.getenv(
+            "AGENT_MODULES",
+            "app.ai_agents.lex,app.ai_agents.sofia,app.ai_agents.equity,"
+            "app.ai_agents.holmes,app.ai_agents.sentinel"
+        ).split(",") if module.strip()
+    ]
+    DISABLED_AGENTS = {
+        name.strip().lower() for name in os.getenv("DISABLED_AGENTS", "").split(",") if name.strip()
+    }
+
+    # Consensus Settings
+    CONSENSUS_STRATEGY = os.getenv("CONSENSUS_STRATEGY", ConsensusStrategy.FAN_OUT)
+    SINGLE_CALL_MAX_TOKENS = int(os.getenv("SINGLE_CALL_MAX_TOKENS", "3000"))  # Room for all five votes
+
+    # Deadlines in seconds (0 = none) - an analysis past its deadline is aborted (504);
+    # an agent past its own deadline abstains and the rest of the council continues
+    ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "300"))
+    AGENT_DEADLINE_SECONDS = float(os.getenv("AGENT_DEADLINE_SECONDS", "120"))
+
+    # Cascade Strategy - empty fast tier settings keep each agent's registry routing
+    CASCADE_FAST_PROVIDER = os.getenv("CASCADE_FAST_PROVIDER", "")
+    CASCADE_FAST_MODEL = os.getenv("CASCADE_FAST_MODEL", "")
+    CASCADE_STRONG_PROVIDER = os.getenv("CASCADE_STRONG_PROVIDER", LLMProvider.ANTHROPIC)
+    CASCADE_STRONG_MODEL = os.getenv("CASCADE_STRONG_MODEL", "")
+    CASCADE_MIN_CONFIDENCE = float(os.getenv("CASCADE_MIN_CONFIDENCE", "0.7"))
+
     # CORS Settings (for frontend)
     CORS_ORIGINS = [
         "http://localhost:5173",  # Vite dev server
@@ -40,6 +96,55 @@ class Config:
     MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".doc", ".docx", ".txt"}
 
+    # Case Store (cases, evidence, pattern alerts; seeded with the demo data when empty)
+    CASE_DB_PATH = os.getenv("CASE_DB_PATH", "data/cases.db")
+    CASE_STORE_SEED_MOCK_DATA = os.getenv("CASE_STORE_SEED_MOCK_DATA", "true").lower() == "true"
+    CASE_PAGE_SIZE = int(os.getenv("CASE_PAGE_SIZE", "100"))  # Default page of GET /api/cases
+    PATTERN_MIN_CASES = int(os.getenv("PATTERN_MIN_CASES", "3"))  # Cases naming one respondent that raise an alert
+    TIMELINE_CACHE_SIZE = int(os.getenv("TIMELINE_CACHE_SIZE", "1024"))  # Case timelines kept per process
+
+    # Legal References - local corpus retrieved into Lex's prompt and used to verify citations
+    LEGAL_CORPUS_ENABLED = os.getenv("LEGAL_CORPUS_ENABLED", "true").lower() == "true"
+    LEGAL_CORPUS_PATH = os.getenv("LEGAL_CORPUS_PATH", "")  # JSONL; empty = bundled app/data/legal_corpus.jsonl
+    LEGAL_INDEX_DIR = os.getenv("LEGAL_INDEX_DIR", "data/legal_index")  # Built once per corpus version
+    LEGAL_TOP_K = int(os.getenv("LEGAL_TOP_K", "4"))  # Passages added to Lex's prompt
+
+    # Analysis Jobs (persistent queue + worker processes: python -m app.worker)
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", "data/jobs.db")
+    JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # Seconds between empty-queue polls
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))  # Requeue if a worker goes silent this long
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_CALLBACK_TIMEOUT = float(os.getenv("JOB_CALLBACK_TIMEOUT", "10"))
+
+    # Speculative pre-analysis - queue a Title IX analysis on intake and evidence upload
+    PRECOMPUTE_ANALYSES = os.getenv("PRECOMPUTE_ANALYSES", "true").lower() == "true"
+    PRECOMPUTE_PRIORITY = os.getenv("PRECOMPUTE_PRIORITY", "background")
+
+    # Model Warm-up - prime each agent's system prompt at startup and periodically
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_INTERVAL_SECONDS = float(os.getenv("WARMUP_INTERVAL_SECONDS", "600"))  # 0 = startup only
+    WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "120"))  # Per priming call (model load)
+    WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "15"))  # After a failed pass
+
+    # Health Probes - LLM reachability is checked in the background, never per request
+    HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "15"))
+    HEALTH_PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2"))
+
+    # Tracing - spans per request, deliberation and agent call ("none", "file" or "otlp")
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "data/traces.jsonl")
+    TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "safespace-api")
+
+    # Admin API - bearer token for export, bulk import and profiles (unset = those endpoints are disabled)
+    ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+
+    # Profiling - sample slow requests, or admin requests sent with X-Debug-Profile
+    PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))  # 0 = only on request
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))  # Profiles kept for download
+
     # Case Settings
     DEFAULT_INVESTIGATION_TIMELINE_DAYS = 60  # Title IX requirement
 
@@ -48,19 +153,21 @@ class Config:
         """Get the current LLM provider"""
         return cls.LLM_PROVIDER
 
+    @classmethod
+    def get_agent_setting(cls, agent_name: str, setting: str) -> Optional[str]:
+        """Per-agent routing override, e.g. AGENT_HOLMES_MODEL"""
+        return os.getenv(f"AGENT_{agent_name.upper()}_{setting}")
+
+    @classmethod
+    def get_provider_limits(cls, provider_name: str) -> tuple:
+        """(requests/minute, tokens/minute, max concurrency) for a provider"""
+        if provider_name == LLMProvider.ANTHROPIC:
+            return cls.ANTHROPIC_RPM, cls.ANTHROPIC_TPM, cls.ANTHROPIC_MAX_CONCURRENCY
+        return cls.LOCAL_LLM_RPM, cls.LOCAL_LLM_TPM, cls.LOCAL_LLM_MAX_CONCURRENCY
+
     @classmethod
     def is_anthropic_available(cls) -> bool:
         """Check if Anthropic API is configured"""
         return bool(cls.ANTHROPIC_API_KEY)
 
-    @classmethod
-    def is_local_llm_available(cls) -> bool:
-        """Check if local LLM is configured"""
-        import requests
-        try:
-            response = requests.get(f"{cls.LOCAL_LLM_URL}/models", timeout=2)
-            return response.status_code == 200
-        except:
-            return False
-
 config = Config()
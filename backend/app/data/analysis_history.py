@@ -0,0 +1,161 @@
+"""
+Analysis history (SQLite, append-only)
+Every ConsensusResult the council produces, with its full agent breakdown,
+so prior deliberations can be shown without re-running the council
+
+Lives in the case database. Rows are never updated or deleted (triggers
+reject it): a re-analysis appends a new row, and "latest" is a query.
+"""
+import json
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from app.config import Config
+from app.data.db import connect
+from app.models.schemas import ConsensusResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id TEXT PRIMARY KEY,
+    case_id TEXT NOT NULL,
+    question TEXT NOT NULL,
+    source TEXT NOT NULL,
+    job_id TEXT,
+    case_revision INTEGER,
+    strategy TEXT,
+    decision TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    yes_votes INTEGER NOT NULL,
+    no_votes INTEGER NOT NULL,
+    has_disagreement INTEGER NOT NULL,
+    analyzed_at TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_case_question ON analyses (case_id, question, analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_case_time ON analyses (case_id, analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_time ON analyses (analyzed_at);
+CREATE TABLE IF NOT EXISTS agent_votes (
+    analysis_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    agent_name TEXT NOT NULL,
+    vote TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    error TEXT,
+    tier TEXT,
+    PRIMARY KEY (analysis_id, position)
+);
+CREATE TRIGGER IF NOT EXISTS analyses_append_only_update BEFORE UPDATE ON analyses
+BEGIN SELECT RAISE(ABORT, 'analysis history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS analyses_append_only_delete BEFORE DELETE ON analyses
+BEGIN SELECT RAISE(ABORT, 'analysis history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS agent_votes_append_only_update BEFORE UPDATE ON agent_votes
+BEGIN SELECT RAISE(ABORT, 'analysis history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS agent_votes_append_only_delete BEFORE DELETE ON agent_votes
+BEGIN SELECT RAISE(ABORT, 'analysis history is append-only'); END;
+"""
+
+_local = threading.local()
+
+
+def _conn():
+    """Per-thread connection to the case database"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = connect(Config.CASE_DB_PATH)
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _row_to_record(row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "case_id": row["case_id"],
+        "question": row["question"],
+        "source": row["source"],
+        "job_id": row["job_id"],
+        "case_revision": row["case_revision"],
+        "recorded_at": row["recorded_at"],
+        "result": json.loads(row["result"]),
+    }
+
+
+def record_analysis(
+    case_id: str,
+    result: ConsensusResult,
+    source: str,
+    job_id: Optional[str] = None,
+    case_revision: Optional[int] = None
+) -> str:
+    """Append one analysis and its agent votes; returns the history id"""
+    analysis_id = f"analysis_{uuid.uuid4().hex[:12]}"
+    conn = _conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            """INSERT INTO analyses (id, case_id, question, source, job_id, case_revision, strategy, decision,
+                   confidence, yes_votes, no_votes, has_disagreement, analyzed_at, recorded_at, result)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (analysis_id, case_id, result.question, source, job_id, case_revision, result.strategy,
+             result.decision, result.confidence, result.yes_votes, result.no_votes, int(result.has_disagreement),
+             result.analyzed_at.isoformat(), datetime.now().isoformat(), result.model_dump_json())
+        )
+        conn.executemany(
+            """INSERT INTO agent_votes (analysis_id, position, agent_name, vote, confidence, error, tier)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(analysis_id, position, vote.agent_name, vote.vote, vote.confidence, vote.error, vote.tier)
+             for position, vote in enumerate(result.agent_breakdown)]
+        )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return analysis_id
+
+
+def try_record_analysis(case_id: str, result: ConsensusResult, source: str, **kwargs) -> Optional[str]:
+    """record_analysis for callers whose own work shouldn't fail with the history write"""
+    try:
+        return record_analysis(case_id, result, source, **kwargs)
+    except Exception as e:
+        print(f"Could not record analysis of case {case_id} in the history: {e}")
+        return None
+
+
+def case_history(
+    case_id: str,
+    question: Optional[str] = None,
+    limit: int = 50,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """A case's analyses, newest first; before (an analyzed_at) pages further back"""
+    clauses, params = ["case_id = ?"], [case_id]
+    if question:
+        clauses.append("question = ?")
+        params.append(question)
+    if before:
+        clauses.append("analyzed_at < ?")
+        params.append(before)
+    rows = _conn().execute(
+        f"SELECT * FROM analyses WHERE {' AND '.join(clauses)} ORDER BY analyzed_at DESC LIMIT ?",
+        params + [limit]
+    ).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+def latest_per_question(case_id: str) -> List[Dict[str, Any]]:
+    """The most recent analysis of each question asked about a case"""
+    # SQLite returns the row holding MAX() for the bare columns
+    rows = _conn().execute(
+        """SELECT *, MAX(analyzed_at) FROM analyses WHERE case_id = ?
+           GROUP BY question ORDER BY analyzed_at DESC""",
+        (case_id,)
+    ).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+def count_analyses() -> int:
+    return _conn().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
@@ -0,0 +1,614 @@
+"""
+Persistent case store (SQLite)
+Cases, evidence, pattern alerts and users, seeded from the mock data on first use
+
+Routes read and write through these functions; bulk loaders (the synthetic
+generator, imports) insert thousands of rows per transaction.
+"""
+import html
+import json
+import math
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import Config
+from app.data.db import connect
+from app.data.mock_data import MOCK_USERS, get_mock_cases, get_mock_evidence, get_mock_patterns
+from app.models.schemas import CaseStatus, ComplaintIntake, Priority
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    department TEXT
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id TEXT PRIMARY KEY,
+    case_number TEXT NOT NULL UNIQUE,
+    complainant_id TEXT NOT NULL,
+    respondent_id TEXT,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    filed_date TEXT NOT NULL,
+    deadline_date TEXT NOT NULL,
+    incident_date TEXT NOT NULL,
+    incident_location TEXT,
+    description TEXT NOT NULL,
+    is_ongoing INTEGER NOT NULL DEFAULT 0,
+    is_crisis INTEGER NOT NULL DEFAULT 0,
+    department TEXT,
+    evidence_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cases_filed ON cases (filed_date, id);
+CREATE INDEX IF NOT EXISTS idx_cases_status ON cases (status, filed_date, id);
+CREATE INDEX IF NOT EXISTS idx_cases_category ON cases (category, filed_date, id);
+CREATE INDEX IF NOT EXISTS idx_cases_respondent ON cases (respondent_id, filed_date);
+CREATE INDEX IF NOT EXISTS idx_cases_deadline ON cases (deadline_date);
+CREATE TABLE IF NOT EXISTS evidence (
+    id TEXT PRIMARY KEY,
+    case_id TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    file_data TEXT NOT NULL,
+    uploaded_by TEXT NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    description TEXT,
+    ai_extracted_data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_case ON evidence (case_id, uploaded_at);
+CREATE INDEX IF NOT EXISTS idx_evidence_uploaded ON evidence (uploaded_at, id);
+CREATE TABLE IF NOT EXISTS patterns (
+    id TEXT PRIMARY KEY,
+    respondent_id TEXT NOT NULL,
+    case_ids TEXT NOT NULL,
+    pattern_type TEXT NOT NULL,
+    risk_score REAL NOT NULL,
+    description TEXT NOT NULL,
+    detected_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_patterns_respondent ON patterns (respondent_id);
+CREATE INDEX IF NOT EXISTS idx_patterns_risk ON patterns (risk_score);
+"""
+
+# Full-text search: FTS5 indexes over the case and evidence text, kept current
+# by triggers (external content, so the text itself is stored only once).
+# Case numbers are looked up through their unique index instead.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+    description, incident_location, department,
+    content='cases', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS cases_fts_insert AFTER INSERT ON cases BEGIN
+    INSERT INTO cases_fts (rowid, description, incident_location, department)
+    VALUES (new.rowid, new.description, new.incident_location, new.department);
+END;
+CREATE TRIGGER IF NOT EXISTS cases_fts_delete AFTER DELETE ON cases BEGIN
+    INSERT INTO cases_fts (cases_fts, rowid, description, incident_location, department)
+    VALUES ('delete', old.rowid, old.description, old.incident_location, old.department);
+END;
+CREATE TRIGGER IF NOT EXISTS cases_fts_update AFTER UPDATE OF description, incident_location, department
+ON cases BEGIN
+    INSERT INTO cases_fts (cases_fts, rowid, description, incident_location, department)
+    VALUES ('delete', old.rowid, old.description, old.incident_location, old.department);
+    INSERT INTO cases_fts (rowid, description, incident_location, department)
+    VALUES (new.rowid, new.description, new.incident_location, new.department);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS evidence_fts USING fts5(
+    file_name, description, ai_extracted_data,
+    content='evidence', content_rowid='rowid', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS evidence_fts_insert AFTER INSERT ON evidence BEGIN
+    INSERT INTO evidence_fts (rowid, file_name, description, ai_extracted_data)
+    VALUES (new.rowid, new.file_name, new.description, new.ai_extracted_data);
+END;
+CREATE TRIGGER IF NOT EXISTS evidence_fts_delete AFTER DELETE ON evidence BEGIN
+    INSERT INTO evidence_fts (evidence_fts, rowid, file_name, description, ai_extracted_data)
+    VALUES ('delete', old.rowid, old.file_name, old.description, old.ai_extracted_data);
+END;
+CREATE TRIGGER IF NOT EXISTS evidence_fts_update AFTER UPDATE OF file_name, description, ai_extracted_data
+ON evidence BEGIN
+    INSERT INTO evidence_fts (evidence_fts, rowid, file_name, description, ai_extracted_data)
+    VALUES ('delete', old.rowid, old.file_name, old.description, old.ai_extracted_data);
+    INSERT INTO evidence_fts (rowid, file_name, description, ai_extracted_data)
+    VALUES (new.rowid, new.file_name, new.description, new.ai_extracted_data);
+END;
+"""
+
+# BM25 column weights: a location or file name hit counts double
+CASE_SEARCH_RANK = "bm25(1.0, 2.0, 1.0)"
+EVIDENCE_SEARCH_RANK = "bm25(2.0, 1.0, 1.0)"
+CASE_NUMBER_QUERY = re.compile(r"^[A-Za-z]+-\d{4}(-[A-Za-z]*(-[A-Za-z0-9]*)?)?$")
+# Private-use characters snippet() wraps matches in; they become <mark> tags once the text is escaped
+MATCH_START, MATCH_END = "\ue000", "\ue001"
+
+# Columns of the cases table; any other case field is kept in the details JSON
+# (e.g. witness_count, evidence_summary - context the agents read)
+CASE_COLUMNS = (
+    "id", "case_number", "complainant_id", "respondent_id", "category", "status", "priority",
+    "filed_date", "deadline_date", "incident_date", "incident_location", "description",
+    "is_ongoing", "is_crisis", "department", "evidence_count", "created_at", "updated_at",
+)
+EVIDENCE_COLUMNS = (
+    "id", "case_id", "file_name", "file_type", "file_data", "uploaded_by", "uploaded_at",
+    "hash", "description", "ai_extracted_data",
+)
+PATTERN_COLUMNS = ("id", "respondent_id", "case_ids", "pattern_type", "risk_score", "description", "detected_at")
+USER_COLUMNS = ("id", "email", "name", "role", "department")
+
+_local = threading.local()
+
+
+def _conn():
+    """Per-thread connection to the case database"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = connect(Config.CASE_DB_PATH)
+        conn.executescript(SCHEMA)
+        indexed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'").fetchone()
+        conn.executescript(SEARCH_SCHEMA)
+        if not indexed:
+            rebuild_search_index(conn)  # Store created before search existed
+        if Config.CASE_STORE_SEED_MOCK_DATA:
+            _seed(conn)
+        _local.conn = conn
+    return conn
+
+
+@contextmanager
+def transaction(conn=None) -> Iterator:
+    """One write transaction (BEGIN IMMEDIATE ... COMMIT, rolled back on error)"""
+    conn = conn or _conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _seed(conn) -> None:
+    """Load the demo cases, evidence, patterns and users into an empty store"""
+    if conn.execute("SELECT 1 FROM cases LIMIT 1").fetchone():
+        return
+    with transaction(conn):
+        _insert(conn, "users", USER_COLUMNS, [_user_row(user) for user in MOCK_USERS.values()])
+        _insert(conn, "cases", CASE_COLUMNS + ("details",), [_case_row(case) for case in get_mock_cases()])
+        _insert(conn, "evidence", EVIDENCE_COLUMNS, [_evidence_row(evd) for evd in get_mock_evidence()])
+        _insert(conn, "patterns", PATTERN_COLUMNS, [_pattern_row(p) for p in get_mock_patterns()])
+    print(f"Seeded case store {Config.CASE_DB_PATH} with the demo data")
+
+
+def _insert(conn, table: str, columns: Tuple[str, ...], rows: Iterable[tuple], replace: bool = False) -> int:
+    placeholders = ", ".join("?" for _ in columns)
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    cursor = conn.executemany(f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+    return cursor.rowcount
+
+
+def _text(value) -> Optional[str]:
+    """Dates and enums as the strings stored in SQLite"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+# Row conversion
+def _case_row(case: Dict[str, Any]) -> tuple:
+    details = {key: value for key, value in case.items() if key not in CASE_COLUMNS}
+    return tuple(
+        int(bool(case.get(column))) if column in ("is_ongoing", "is_crisis")
+        else int(case.get(column) or 0) if column == "evidence_count"
+        else _text(case.get(column))
+        for column in CASE_COLUMNS
+    ) + (json.dumps(details, default=str) if details else None,)
+
+
+def _row_to_case(row) -> Dict[str, Any]:
+    case = dict(row)
+    details = case.pop("details", None)
+    case["is_ongoing"] = bool(case["is_ongoing"])
+    case["is_crisis"] = bool(case["is_crisis"])
+    if details:
+        case.update(json.loads(details))
+    return case
+
+
+def _evidence_row(evidence: Dict[str, Any]) -> tuple:
+    return tuple(
+        json.dumps(evidence[column]) if column == "ai_extracted_data" and evidence.get(column) is not None
+        else _text(evidence.get(column))
+        for column in EVIDENCE_COLUMNS
+    )
+
+
+def _row_to_evidence(row) -> Dict[str, Any]:
+    evidence = dict(row)
+    evidence["ai_extracted_data"] = json.loads(evidence["ai_extracted_data"]) if evidence["ai_extracted_data"] else None
+    return evidence
+
+
+def _pattern_row(pattern: Dict[str, Any]) -> tuple:
+    return tuple(
+        json.dumps(pattern[column]) if column == "case_ids" else _text(pattern.get(column))
+        for column in PATTERN_COLUMNS
+    )
+
+
+def _row_to_pattern(row) -> Dict[str, Any]:
+    pattern = dict(row)
+    pattern["case_ids"] = json.loads(pattern["case_ids"])
+    return pattern
+
+
+def _user_row(user: Dict[str, Any]) -> tuple:
+    return tuple(_text(user.get(column)) for column in USER_COLUMNS)
+
+
+# Cases
+def get_case(case_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a case by id or case number"""
+    row = _conn().execute(
+        "SELECT * FROM cases WHERE id = ? OR case_number = ? LIMIT 1", (case_id, case_id)
+    ).fetchone()
+    return _row_to_case(row) if row else None
+
+
+def list_cases(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    respondent_id: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    A page of cases, newest filing first, and the cursor for the next page
+
+    Keyset pagination: the cursor is the last row's "filed_date|id", so deep
+    pages cost the same as the first one.
+    """
+    clauses, params = [], []
+    for column, value in (("status", status), ("category", category), ("respondent_id", respondent_id)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(_text(value))
+    if cursor:
+        filed_date, _, last_id = cursor.partition("|")
+        clauses.append("(filed_date, id) < (?, ?)")
+        params.extend([filed_date, last_id])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = _conn().execute(
+        f"SELECT * FROM cases {where} ORDER BY filed_date DESC, id DESC LIMIT ?", params + [limit]
+    ).fetchall()
+
+    cases = [_row_to_case(row) for row in rows]
+    next_cursor = f"{cases[-1]['filed_date']}|{cases[-1]['id']}" if len(cases) == limit else None
+    return cases, next_cursor
+
+
+def case_from_intake(complaint: ComplaintIntake, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """A new case record for a complaint, filed now"""
+    now = now or datetime.now()
+    return {
+        "id": f"case_{uuid.uuid4().hex[:8]}",
+        "case_number": f"NW-{now.year}-TIX-{uuid.uuid4().hex[:8].upper()}",
+        "complainant_id": complaint.complainant_email or "anonymous",
+        "respondent_id": None,
+        "category": complaint.category.value,
+        "status": CaseStatus.INTAKE.value,
+        "priority": (Priority.URGENT if complaint.is_crisis else Priority.STANDARD).value,
+        "filed_date": now.isoformat(),
+        "deadline_date": (now + timedelta(days=Config.DEFAULT_INVESTIGATION_TIMELINE_DAYS)).isoformat(),
+        "incident_date": complaint.incident_date,
+        "incident_location": complaint.incident_location,
+        "description": complaint.description,
+        "is_ongoing": complaint.is_ongoing,
+        "is_crisis": complaint.is_crisis,
+        "created_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "evidence_count": 0
+    }
+
+
+def existing_case_keys(ids: List[str], case_numbers: List[str], conn=None) -> Tuple[set, set]:
+    """Which of these case ids and case numbers are already stored"""
+    conn = conn or _conn()
+    found_ids, found_numbers = set(), set()
+    for column, values, found in (("id", ids, found_ids), ("case_number", case_numbers, found_numbers)):
+        # SQLite caps bound parameters per statement
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            rows = conn.execute(
+                f"SELECT {column} FROM cases WHERE {column} IN ({', '.join('?' for _ in chunk)})", chunk
+            ).fetchall()
+            found.update(row[0] for row in rows)
+    return found_ids, found_numbers
+
+
+def insert_case(case: Dict[str, Any]) -> None:
+    with transaction() as conn:
+        _insert(conn, "cases", CASE_COLUMNS + ("details",), [_case_row(case)])
+
+
+def insert_cases(cases: Iterable[Dict[str, Any]], conn=None) -> int:
+    """Bulk insert in the caller's transaction (or one of its own); existing ids are skipped"""
+    rows = [_case_row(case) for case in cases]
+    if conn is not None:
+        return _insert(conn, "cases", CASE_COLUMNS + ("details",), rows)
+    with transaction() as conn:
+        return _insert(conn, "cases", CASE_COLUMNS + ("details",), rows)
+
+
+def update_case_status(case_id: str, status: str) -> bool:
+    cursor = _conn().execute(
+        "UPDATE cases SET status = ?, updated_at = ? WHERE id = ? OR case_number = ?",
+        (_text(status), datetime.now().isoformat(), case_id, case_id)
+    )
+    return cursor.rowcount > 0
+
+
+def count_cases() -> int:
+    return _conn().execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+
+def dashboard_stats() -> Dict[str, Any]:
+    """Dashboard counts computed from the store"""
+    now = datetime.now()
+    row = _conn().execute(
+        """SELECT
+               COUNT(*) AS total_cases,
+               COALESCE(SUM(status != 'Closed'), 0) AS active_cases,
+               COALESCE(SUM(status = 'Review'), 0) AS pending_review,
+               COALESCE(SUM(status != 'Closed' AND deadline_date >= ? AND deadline_date <= ?), 0)
+                   AS approaching_deadline,
+               AVG(CASE WHEN status = 'Closed' THEN julianday(updated_at) - julianday(filed_date) END)
+                   AS average_resolution_days
+           FROM cases""",
+        (now.isoformat(), (now + timedelta(days=Config.DEADLINE_URGENT_DAYS)).isoformat())
+    ).fetchone()
+    stats = dict(row)
+    stats["average_resolution_days"] = round(stats["average_resolution_days"] or 0.0, 1)
+    return stats
+
+
+# Evidence
+def list_evidence(case_id: str) -> List[Dict[str, Any]]:
+    rows = _conn().execute(
+        "SELECT * FROM evidence WHERE case_id = ? ORDER BY uploaded_at", (case_id,)
+    ).fetchall()
+    return [_row_to_evidence(row) for row in rows]
+
+
+def list_evidence_metadata(case_id: str) -> List[Dict[str, Any]]:
+    """A case's evidence without the file contents"""
+    columns = ", ".join(column for column in EVIDENCE_COLUMNS if column != "file_data")
+    rows = _conn().execute(
+        f"SELECT {columns} FROM evidence WHERE case_id = ? ORDER BY uploaded_at", (case_id,)
+    ).fetchall()
+    return [_row_to_evidence(row) for row in rows]
+
+
+def get_evidence(evidence_id: str) -> Optional[Dict[str, Any]]:
+    row = _conn().execute("SELECT * FROM evidence WHERE id = ?", (evidence_id,)).fetchone()
+    return _row_to_evidence(row) if row else None
+
+
+def add_evidence(evidence: Dict[str, Any]) -> None:
+    """Store an evidence item and bump its case's evidence count"""
+    with transaction() as conn:
+        _insert(conn, "evidence", EVIDENCE_COLUMNS, [_evidence_row(evidence)])
+        conn.execute(
+            "UPDATE cases SET evidence_count = evidence_count + 1, updated_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), evidence["case_id"])
+        )
+
+
+def insert_evidence(items: Iterable[Dict[str, Any]], conn=None) -> int:
+    """Bulk insert (evidence_count on the cases is the caller's business)"""
+    rows = [_evidence_row(evidence) for evidence in items]
+    if conn is not None:
+        return _insert(conn, "evidence", EVIDENCE_COLUMNS, rows)
+    with transaction() as conn:
+        return _insert(conn, "evidence", EVIDENCE_COLUMNS, rows)
+
+
+# Users
+def insert_users(users: Iterable[Dict[str, Any]], conn=None) -> int:
+    rows = [_user_row(user) for user in users]
+    if conn is not None:
+        return _insert(conn, "users", USER_COLUMNS, rows)
+    with transaction() as conn:
+        return _insert(conn, "users", USER_COLUMNS, rows)
+
+
+# Pattern alerts
+def list_patterns(respondent_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """Pattern alerts, highest risk first"""
+    if respondent_id:
+        rows = _conn().execute(
+            "SELECT * FROM patterns WHERE respondent_id = ? ORDER BY risk_score DESC LIMIT ?", (respondent_id, limit)
+        ).fetchall()
+    else:
+        rows = _conn().execute("SELECT * FROM patterns ORDER BY risk_score DESC LIMIT ?", (limit,)).fetchall()
+    return [_row_to_pattern(row) for row in rows]
+
+
+def detect_patterns(respondent_ids: Optional[Iterable[str]] = None, conn=None) -> int:
+    """
+    Recompute repeat-respondent alerts, for the given respondents or all of them
+
+    A respondent named in Config.PATTERN_MIN_CASES or more cases gets one
+    alert, its risk rising with the case count and the share still open.
+    Bulk loaders call this once per batch with the respondents they touched.
+    """
+    conn = conn or _conn()
+    sql = """SELECT respondent_id, COUNT(*) AS cases, SUM(status != 'Closed') AS open_cases,
+                    GROUP_CONCAT(id) AS case_ids, MIN(filed_date) AS first_filed, MAX(filed_date) AS last_filed
+             FROM cases WHERE respondent_id IS NOT NULL {filter}
+             GROUP BY respondent_id HAVING COUNT(*) >= ?"""
+
+    if respondent_ids is None:
+        rows = conn.execute(sql.format(filter=""), (Config.PATTERN_MIN_CASES,)).fetchall()
+    else:
+        respondent_ids = list(set(respondent_ids))
+        rows = []
+        # SQLite caps bound parameters per statement
+        for start in range(0, len(respondent_ids), 500):
+            chunk = respondent_ids[start:start + 500]
+            rows.extend(conn.execute(
+                sql.format(filter=f"AND respondent_id IN ({', '.join('?' for _ in chunk)})"),
+                chunk + [Config.PATTERN_MIN_CASES]
+            ).fetchall())
+
+    now = datetime.now().isoformat()
+    patterns = []
+    for row in rows:
+        case_ids = row["case_ids"].split(",")
+        repeats = row["cases"] - Config.PATTERN_MIN_CASES
+        risk_score = 0.3 + 0.5 * (1 - math.exp(-repeats / 5)) + 0.19 * row["open_cases"] / row["cases"]
+        patterns.append({
+            "id": f"pattern_{row['respondent_id']}",
+            "respondent_id": row["respondent_id"],
+            "case_ids": case_ids[-50:],  # Most recent ids; the count is in the description
+            "pattern_type": "Repeat Allegations",
+            "risk_score": round(risk_score, 2),
+            "description": (
+                f"Respondent named in {row['cases']} cases ({row['open_cases']} open) "
+                f"between {row['first_filed'][:10]} and {row['last_filed'][:10]}."
+            ),
+            "detected_at": now,
+        })
+
+    if patterns:
+        _insert(conn, "patterns", PATTERN_COLUMNS, [_pattern_row(p) for p in patterns], replace=True)
+    return len(patterns)
+
+
+# Search
+def rebuild_search_index(conn=None) -> None:
+    """Re-index all case and evidence text (the triggers keep it current after that)"""
+    conn = conn or _conn()
+    conn.execute("INSERT INTO cases_fts (cases_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO evidence_fts (evidence_fts) VALUES ('rebuild')")
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text typed by an investigator
+
+    "Quoted words" stay phrases, other words must all appear, and the last
+    word matches as a prefix (search-as-you-type). FTS operators typed by
+    the user are treated as plain words.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\w+)', text):
+        words = re.findall(r"\w+", phrase) if phrase else [word]
+        if words:
+            terms.append((" ".join(words), bool(phrase)))
+    if not terms:
+        return None
+
+    parts = [f'"{term}"' for term, _ in terms]
+    last, quoted = terms[-1]
+    if not quoted:
+        parts[-1] = f'"{last}"*'
+    return " ".join(parts)
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    """HTML-escaped snippet with its matches wrapped in <mark>"""
+    text = html.escape(snippet or "")
+    return text.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+def search_cases(
+    text: str,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Cases matching the text, best BM25 match first, with a highlighted snippet
+
+    A case number (or its start, e.g. NW-2025-TIX) matches case numbers
+    instead, in order.
+    """
+    clauses, params = [], []
+    for column, value in (("c.status", status), ("c.category", category)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(_text(value))
+
+    columns = "c.id, c.case_number, c.status, c.category, c.priority, c.filed_date, c.incident_location"
+    number = text.strip().upper()
+    if CASE_NUMBER_QUERY.match(number):
+        # Prefix range over the unique index; score is None (nothing to rank)
+        rows = _conn().execute(
+            f"""SELECT {columns}, NULL AS score
+                FROM cases c WHERE c.case_number >= ? AND c.case_number < ? {''.join(' AND ' + c for c in clauses)}
+                ORDER BY c.case_number LIMIT ? OFFSET ?""",
+            [number, number + "\uffff"] + params + [limit, offset]
+        ).fetchall()
+        return [
+            {**row, "snippet": _highlight(f"{MATCH_START}{row['case_number'][:len(number)]}{MATCH_END}"
+                                          f"{row['case_number'][len(number):]}")}
+            for row in map(dict, rows)
+        ]
+
+    query = fts_query(text)
+    if query is None:
+        return []
+    rows = _conn().execute(
+        f"""SELECT {columns}, -cases_fts.rank AS score,
+                   snippet(cases_fts, -1, '{MATCH_START}', '{MATCH_END}', '…', 16) AS snippet
+            FROM cases_fts JOIN cases c ON c.rowid = cases_fts.rowid
+            WHERE cases_fts MATCH ? AND cases_fts.rank MATCH ? {''.join(' AND ' + c for c in clauses)}
+            ORDER BY cases_fts.rank LIMIT ? OFFSET ?""",
+        [query, CASE_SEARCH_RANK] + params + [limit, offset]
+    ).fetchall()
+    return [{**row, "snippet": _highlight(row["snippet"])} for row in map(dict, rows)]
+
+
+def search_evidence(
+    text: str,
+    case_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """Evidence whose name, description or extracted data match, best first"""
+    query = fts_query(text)
+    if query is None:
+        return []
+    clauses, params = ["evidence_fts MATCH ?", "evidence_fts.rank MATCH ?"], [query, EVIDENCE_SEARCH_RANK]
+    for column, value in (("e.case_id", case_id), ("c.status", status)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(_text(value))
+
+    rows = _conn().execute(
+        f"""SELECT e.id, e.case_id, c.case_number, c.status, e.file_name, e.file_type, e.uploaded_at,
+                   -evidence_fts.rank AS score,
+                   snippet(evidence_fts, -1, '{MATCH_START}', '{MATCH_END}', '…', 16) AS snippet
+            FROM evidence_fts JOIN evidence e ON e.rowid = evidence_fts.rowid
+            JOIN cases c ON c.id = e.case_id
+            WHERE {' AND '.join(clauses)}
+            ORDER BY evidence_fts.rank LIMIT ? OFFSET ?""",
+        params + [limit, offset]
+    ).fetchall()
+    return [{**row, "snippet": _highlight(row["snippet"])} for row in map(dict, rows)]
@@ -0,0 +1,24 @@
+"""
+SQLite connection helper shared by the persistent stores
+"""
+import os
+import sqlite3
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database for concurrent use by web and worker processes
+
+    WAL lets readers proceed while a writer commits; busy_timeout makes
+    competing writers wait instead of failing immediately.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
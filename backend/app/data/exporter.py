@@ -0,0 +1,315 @@
+"""
+Streaming export of cases, evidence metadata and consensus history
+For institutional and compliance reporting: CSV, NDJSON or Parquet (with
+pyarrow installed), produced batch by batch from a cursor over the store so
+memory stays flat however many rows match
+
+Datasets:
+- cases     every case column, extra case fields as a details object
+- evidence  evidence metadata (no file contents), filtered by its case's status
+- analyses  the analysis history (every consensus result), with agent votes
+
+From backend/:
+    python -m app.data.exporter cases --format parquet --since 2025-01-01 --output cases.parquet
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+from app.config import Config
+from app.data import analysis_history
+from app.data.db import connect
+
+FORMATS = ("csv", "ndjson", "parquet")
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+BATCH_ROWS = 2000  # Rows fetched and written per chunk (one Parquet row group)
+
+
+class ExportError(Exception):
+    """Bad export request or a missing optional dependency"""
+    pass
+
+
+class Dataset:
+    """An exportable table: typed columns, its query and its row conversion"""
+
+    def __init__(self, name: str, columns: List[Tuple[str, str]], query: Callable, to_record: Callable = dict,
+                 schema: Optional[str] = None):
+        self.name = name
+        self.columns = columns  # (name, "string" | "int" | "float" | "bool" | "json")
+        self.query = query
+        self.to_record = to_record
+        self.schema = schema  # Created if missing, so an empty store exports no rows
+
+
+def _case_query(since, until, status) -> Tuple[str, str, list]:
+    clauses, params = _filters("filed_date", since, until)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    sql = f"SELECT * FROM cases {_where(clauses)} ORDER BY filed_date, id"
+    return Config.CASE_DB_PATH, sql, params
+
+
+def _case_record(row) -> Dict[str, Any]:
+    record = dict(row)
+    record["is_ongoing"] = bool(record["is_ongoing"])
+    record["is_crisis"] = bool(record["is_crisis"])
+    record["details"] = json.loads(record["details"]) if record["details"] else None
+    return record
+
+
+def _evidence_query(since, until, status) -> Tuple[str, str, list]:
+    clauses, params = _filters("e.uploaded_at", since, until)
+    join = ""
+    if status:
+        join = "JOIN cases c ON c.id = e.case_id"
+        clauses.append("c.status = ?")
+        params.append(status)
+    # File contents stay out of exports; length(file_data) gives the base64 size
+    sql = f"""SELECT e.id, e.case_id, e.file_name, e.file_type, e.uploaded_by, e.uploaded_at, e.hash,
+                     e.description, length(e.file_data) * 3 / 4 AS size_bytes, e.ai_extracted_data
+              FROM evidence e {join} {_where(clauses)} ORDER BY e.uploaded_at, e.id"""
+    return Config.CASE_DB_PATH, sql, params
+
+
+def _evidence_record(row) -> Dict[str, Any]:
+    record = dict(row)
+    record["ai_extracted_data"] = json.loads(record["ai_extracted_data"]) if record["ai_extracted_data"] else None
+    return record
+
+
+def _analysis_query(since, until, status) -> Tuple[str, str, list]:
+    clauses, params = _filters("a.analyzed_at", since, until)
+    join = ""
+    if status:
+        join = "JOIN cases c ON c.id = a.case_id"
+        clauses.append("c.status = ?")
+        params.append(status)
+    sql = f"""SELECT a.id, a.case_id, a.question, a.source, a.job_id, a.case_revision, a.recorded_at, a.result
+              FROM analyses a {join} {_where(clauses)} ORDER BY a.analyzed_at, a.id"""
+    return Config.CASE_DB_PATH, sql, params
+
+
+def _analysis_record(row) -> Dict[str, Any]:
+    result = json.loads(row["result"])
+    return {
+        "analysis_id": row["id"],
+        "case_id": row["case_id"],
+        "question": row["question"],
+        "source": row["source"],
+        "job_id": row["job_id"],
+        "case_revision": row["case_revision"],
+        "strategy": result.get("strategy"),
+        "decision": result["decision"],
+        "confidence": result["confidence"],
+        "yes_votes": result["yes_votes"],
+        "no_votes": result["no_votes"],
+        "has_disagreement": result["has_disagreement"],
+        "recommendation": result["recommendation"],
+        "analyzed_at": result["analyzed_at"],
+        "recorded_at": row["recorded_at"],
+        "total_ms": (result.get("timing") or {}).get("total_ms"),
+        "agent_votes": [
+            {key: vote.get(key) for key in ("agent_name", "vote", "confidence", "error", "tier", "reasoning")}
+            for vote in result["agent_breakdown"]
+        ],
+    }
+
+
+DATASETS: Dict[str, Dataset] = {
+    "cases": Dataset("cases", [
+        ("id", "string"), ("case_number", "string"), ("complainant_id", "string"), ("respondent_id", "string"),
+        ("category", "string"), ("status", "string"), ("priority", "string"), ("filed_date", "string"),
+        ("deadline_date", "string"), ("incident_date", "string"), ("incident_location", "string"),
+        ("description", "string"), ("is_ongoing", "bool"), ("is_crisis", "bool"), ("department", "string"),
+        ("evidence_count", "int"), ("created_at", "string"), ("updated_at", "string"), ("details", "json"),
+    ], _case_query, _case_record),
+    "evidence": Dataset("evidence", [
+        ("id", "string"), ("case_id", "string"), ("file_name", "string"), ("file_type", "string"),
+        ("uploaded_by", "string"), ("uploaded_at", "string"), ("hash", "string"), ("description", "string"),
+        ("size_bytes", "int"), ("ai_extracted_data", "json"),
+    ], _evidence_query, _evidence_record),
+    "analyses": Dataset("analyses", [
+        ("analysis_id", "string"), ("case_id", "string"), ("question", "string"), ("source", "string"),
+        ("job_id", "string"), ("case_revision", "int"), ("strategy", "string"), ("decision", "string"),
+        ("confidence", "float"), ("yes_votes", "int"), ("no_votes", "int"), ("has_disagreement", "bool"),
+        ("recommendation", "string"), ("analyzed_at", "string"), ("recorded_at", "string"),
+        ("total_ms", "float"), ("agent_votes", "json"),
+    ], _analysis_query, _analysis_record, analysis_history.SCHEMA),
+}
+
+
+def _filters(column: str, since: Optional[str], until: Optional[str]) -> Tuple[List[str], list]:
+    """since inclusive, until exclusive (ISO dates compare as strings)"""
+    clauses, params = [], []
+    if since:
+        clauses.append(f"{column} >= ?")
+        params.append(since)
+    if until:
+        clauses.append(f"{column} < ?")
+        params.append(until)
+    return clauses, params
+
+
+def _where(clauses: List[str]) -> str:
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """Normalise a date / datetime filter to the stored ISO format"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ExportError(f"Invalid date '{value}' (use YYYY-MM-DD or an ISO datetime)")
+
+
+def iter_records(dataset: Dataset, since: Optional[str] = None, until: Optional[str] = None,
+                 status: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Batches of records, read through one cursor on a dedicated connection"""
+    path, sql, params = dataset.query(parse_date(since), parse_date(until), status)
+    conn = connect(path)
+    try:
+        if dataset.schema:
+            conn.executescript(dataset.schema)
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(BATCH_ROWS)
+            if not rows:
+                return
+            yield [dataset.to_record(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def _flat(value: Any, kind: str) -> Any:
+    """Nested values as JSON text for the tabular formats"""
+    if kind == "json" and value is not None:
+        return json.dumps(value)
+    return value
+
+
+def _csv_chunks(dataset: Dataset, batches) -> Iterator[bytes]:
+    names = [name for name, _ in dataset.columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in batches:
+        for record in batch:
+            writer.writerow([_flat(record.get(name), kind) for name, kind in dataset.columns])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_chunks(dataset: Dataset, batches) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(record, default=str) + "\n" for record in batch).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back as chunks (keeps tell() for Parquet offsets)"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _parquet_chunks(dataset: Dataset, batches) -> Iterator[bytes]:
+    pa, pq = _require_pyarrow()
+    types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "json": pa.string()}
+    schema = pa.schema([(name, types[kind]) for name, kind in dataset.columns])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            columns = {name: [_flat(record.get(name), kind) for record in batch] for name, kind in dataset.columns}
+            writer.write_table(pa.table(columns, schema=schema))  # One row group per batch
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ExportError("Parquet export requires pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+WRITERS = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}
+
+
+def export(dataset_name: str, fmt: str, since: Optional[str] = None, until: Optional[str] = None,
+           status: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Byte chunks of the export; bad arguments raise ExportError before any
+    chunk is produced
+    """
+    dataset = DATASETS.get(dataset_name)
+    if dataset is None:
+        raise ExportError(f"Unknown dataset '{dataset_name}' (use {', '.join(DATASETS)})")
+    if fmt not in WRITERS:
+        raise ExportError(f"Unknown format '{fmt}' (use {', '.join(FORMATS)})")
+    if fmt == "parquet":
+        _require_pyarrow()
+    parse_date(since)
+    parse_date(until)
+    return WRITERS[fmt](dataset, iter_records(dataset, since, until, status))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export cases, evidence metadata or consensus history")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--since", help="From this date (inclusive)")
+    parser.add_argument("--until", help="Before this date (exclusive)")
+    parser.add_argument("--status", help="Case status, e.g. Closed")
+    parser.add_argument("--output", "-o", default="-", help="File to write ('-' for stdout)")
+    args = parser.parse_args()
+
+    try:
+        chunks = export(args.dataset, args.format, args.since, args.until, args.status)
+    except ExportError as e:
+        parser.error(str(e))
+
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    written = 0
+    with output:
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+    if args.output != "-":
+        print(f"Wrote {written:,} bytes of {args.dataset} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
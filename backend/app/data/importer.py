@@ -0,0 +1,235 @@
+"""
+Bulk case import
+Streams NDJSON or CSV rows into the case store in batches, for migrating case
+history from another system
+
+Rows with a case_number are full case records, validated against Case (an
+id is generated when missing). Other rows are complaints, validated against
+ComplaintIntake and filed like /api/cases/intake. Invalid and duplicate rows
+are reported and skipped; each batch is one transaction, after which the
+batch's respondents get their pattern alerts recomputed. Imported cases are
+not queued for pre-analysis.
+
+From backend/:
+    python -m app.data.importer legacy_cases.csv --batch-size 5000 --errors import_errors.ndjson
+"""
+import argparse
+import codecs
+import csv
+import json
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.config import Config
+from app.data import case_store
+from app.models.schemas import Case, ComplaintIntake, ImportReport, ImportRowError
+
+FORMATS = ("ndjson", "csv")
+MAX_REPORTED_ERRORS = 1000  # Per import; the failed count covers the rest
+DATETIME_FIELDS = ("filed_date", "deadline_date", "created_at", "updated_at")
+DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def detect_format(name: Optional[str] = None, content_type: Optional[str] = None) -> str:
+    """ndjson or csv from a file name or Content-Type (NDJSON by default)"""
+    if name and name.lower().endswith(".csv"):
+        return "csv"
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "ndjson"
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Decode a byte stream into lines, without holding more than one chunk"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """(row number, raw row, parse error) for each NDJSON line / CSV record"""
+    if fmt == "csv":
+        for number, record in enumerate(csv.DictReader(lines), 1):
+            if None in record:
+                yield number, None, "More values than header columns"
+            else:
+                yield number, record, None
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+        else:
+            yield number, record, None
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+def validate_row(raw: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Case record for one raw row (raises ValidationError / ValueError)"""
+    # CSV cells are strings; empty ones mean "not given"
+    row = {key.strip(): value for key, value in raw.items() if key and value not in ("", None)}
+
+    if "case_number" not in row:
+        return case_store.case_from_intake(ComplaintIntake(**row), now)
+
+    row.setdefault("id", f"case_{uuid.uuid4().hex[:8]}")
+    for field in DATETIME_FIELDS:
+        if isinstance(row.get(field), str) and DATE_ONLY.match(row[field]):
+            row[field] += "T00:00:00"
+    # Legacy systems often only keep the filing date
+    if "filed_date" in row:
+        row.setdefault("created_at", row["filed_date"])
+        row.setdefault("updated_at", row["created_at"])
+        if "deadline_date" not in row:
+            try:
+                filed = datetime.fromisoformat(str(row["filed_date"]))
+                row["deadline_date"] = (filed + timedelta(days=Config.DEFAULT_INVESTIGATION_TIMELINE_DAYS)).isoformat()
+            except ValueError:
+                pass  # Case validation reports the bad filed_date
+
+    case = Case(**row).model_dump(mode="json")
+    # Fields Case doesn't model (department, witness_count, ...) are kept as case details
+    extras = {key: value for key, value in row.items() if key not in case}
+    case.update(extras)
+    case["is_crisis"] = _flag(row.get("is_crisis", False))
+    return case
+
+
+class BulkImporter:
+    """Validates and inserts rows one batch at a time, collecting a report"""
+
+    def __init__(self, fmt: str, batch_size: int = 1000):
+        self.fmt = fmt
+        self.batch_size = max(1, batch_size)
+        self.report = ImportReport(format=fmt, rows=0, imported=0, failed=0, batches=0,
+                                   patterns_updated=0, seconds=0.0)
+
+    def fail(self, row: int, error: str, case_id: Optional[str] = None) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(ImportRowError(row=row, error=error, case_id=case_id))
+        else:
+            self.report.errors_truncated = True
+
+    def run(self, rows: Iterable[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]) -> ImportReport:
+        started = time.perf_counter()
+        batch: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]] = []
+        for item in rows:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        self.report.errors.sort(key=lambda error: error.row)
+        self.report.seconds = round(time.perf_counter() - started, 2)
+        return self.report
+
+    def import_batch(self, batch: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]) -> None:
+        now = datetime.now()
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for number, raw, error in batch:
+            self.report.rows += 1
+            if error:
+                self.fail(number, error)
+                continue
+            try:
+                valid.append((number, validate_row(raw, now)))
+            except ValidationError as e:
+                self.fail(number, _validation_message(e), raw.get("id") or None)
+            except (TypeError, ValueError) as e:
+                self.fail(number, str(e), raw.get("id") or None)
+
+        with case_store.transaction() as conn:
+            existing_ids, existing_numbers = case_store.existing_case_keys(
+                [case["id"] for _, case in valid], [case["case_number"] for _, case in valid], conn
+            )
+            cases = []
+            for number, case in valid:
+                if case["id"] in existing_ids:
+                    self.fail(number, f"Case id {case['id']} already exists", case["id"])
+                elif case["case_number"] in existing_numbers:
+                    self.fail(number, f"Case number {case['case_number']} already exists")
+                else:
+                    # Repeats later in the same batch are duplicates too
+                    existing_ids.add(case["id"])
+                    existing_numbers.add(case["case_number"])
+                    cases.append(case)
+
+            self.report.imported += case_store.insert_cases(cases, conn)
+            respondents = {case["respondent_id"] for case in cases if case.get("respondent_id")}
+            if respondents:
+                self.report.patterns_updated += case_store.detect_patterns(respondents, conn)
+        self.report.batches += 1
+
+
+def import_stream(chunks: Iterable[bytes], fmt: str, batch_size: int = 1000) -> ImportReport:
+    """Import an NDJSON / CSV byte stream"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}' (use {' or '.join(FORMATS)})")
+    return BulkImporter(fmt, batch_size).run(read_rows(iter_lines(chunks), fmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import cases from NDJSON or CSV")
+    parser.add_argument("path", help="File to import ('-' for stdin)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument("--db", default=None, help="Case database (default: CASE_DB_PATH)")
+    parser.add_argument("--errors", metavar="PATH", help="Write rejected rows as NDJSON")
+    args = parser.parse_args()
+
+    if args.db:
+        Config.CASE_DB_PATH = args.db
+    fmt = args.format or detect_format(args.path)
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    with source:
+        report = import_stream(iter(lambda: source.read(64 * 1024), b""), fmt, args.batch_size)
+
+    print(f"Imported {report.imported:,} of {report.rows:,} rows in {report.batches} batches "
+          f"({report.seconds}s); {report.failed:,} failed, {report.patterns_updated:,} pattern alerts updated")
+    for error in report.errors[:10]:
+        print(f"  row {error.row}: {error.error}")
+    if report.errors_truncated:
+        print(f"  (only the first {MAX_REPORTED_ERRORS} errors are listed)")
+    if args.errors:
+        with open(args.errors, "w") as f:
+            for error in report.errors:
+                f.write(error.model_dump_json() + "\n")
+        print(f"Errors written to {args.errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -199,21 +199,6 @@ def get_mock_evidence():
         }
     ]
 
-# Mock AI Analyses (pre-computed for demo speed)
-def get_mock_ai_analyses():
-    """Pre-computed AI analysis results for instant demo"""
-
-    return [
-        {
-            "id": "analysis_001",
-            "case_id": "case_001",
-            "question": "Does this incident meet Title IX hostile environment standard?",
-            "consensus_decision": "YES",
-            "consensus_confidence": 0.88,
-            "created_at": (datetime.now() - timedelta(days=10)).isoformat()
-        }
-    ]
-
 # Mock Pattern Alerts
 def get_mock_patterns():
     """Mock pattern detection results"""
@@ -0,0 +1,285 @@
+"""
+Synthetic case data for scale testing
+Seeded generator of users, cases and evidence streamed into the case store in
+bulk batches, with pattern alerts detected once loading finishes
+
+Respondents and departments follow Zipf-like distributions, so a few
+respondents recur across many cases (and raise pattern alerts) while most
+appear once, as in real caseloads. The same seed always produces the same
+data (dates are relative to the day of the run).
+
+From backend/:
+    python -m app.data.synthetic --cases 1000000 --seed 7 --db data/cases-1m.db --fresh
+"""
+import argparse
+import base64
+import hashlib
+import itertools
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Tuple
+
+from app.config import Config
+from app.models.schemas import CaseCategory, CaseStatus, Priority, UserRole
+
+DEPARTMENTS = [
+    "Weinberg College of Arts & Sciences", "McCormick School of Engineering", "Kellogg School of Management",
+    "Feinberg School of Medicine", "Medill School of Journalism", "School of Communication",
+    "School of Education & Social Policy", "Bienen School of Music", "Pritzker School of Law",
+    "School of Professional Studies", "Athletics", "Residential Services", "Facilities", "Libraries",
+]
+LOCATIONS = [
+    "Residence Hall", "Off-campus Party", "Main Library", "Faculty Office", "Research Lab", "Lecture Hall",
+    "Athletics Facility", "Student Center", "Campus Shuttle", "Online - Messaging App", "Online - Course Forum",
+    "Department Retreat", "Conference Travel", "Dining Hall",
+]
+RELATIONSHIPS = [
+    "Peer - Same cohort", "Peer - Same residence hall", "Faculty-Student", "Supervisor-Employee",
+    "Teaching Assistant-Student", "Coach-Athlete", "Former partners", "Unknown - non-student",
+]
+CATEGORY_WEIGHTS = {
+    CaseCategory.TITLE_IX: 38, CaseCategory.HARASSMENT: 27, CaseCategory.DISCRIMINATION: 20,
+    CaseCategory.RETALIATION: 9, CaseCategory.OTHER: 6,
+}
+CATEGORY_CODES = {
+    CaseCategory.TITLE_IX: "TIX", CaseCategory.HARASSMENT: "HAR", CaseCategory.DISCRIMINATION: "DIS",
+    CaseCategory.RETALIATION: "RET", CaseCategory.OTHER: "OTH",
+}
+ALLEGATIONS = {
+    CaseCategory.TITLE_IX: [
+        "unwelcome sexual advances", "non-consensual touching", "sexually explicit messages",
+        "quid pro quo requests tied to grades", "sexual comments during group meetings",
+    ],
+    CaseCategory.HARASSMENT: [
+        "repeated unwanted messages", "following the complainant between classes",
+        "threatening posts about the complainant", "intimidation in shared workspaces",
+    ],
+    CaseCategory.DISCRIMINATION: [
+        "exclusion from research opportunities based on national origin", "disparate grading based on race",
+        "denial of disability accommodations", "comments about the complainant's religion",
+    ],
+    CaseCategory.RETALIATION: [
+        "a lowered evaluation after a prior complaint", "removal from a lab after reporting misconduct",
+        "threats to withdraw a recommendation letter",
+    ],
+    CaseCategory.OTHER: [
+        "hostile conduct during a student organization event", "misuse of shared accounts to post about the complainant",
+    ],
+}
+EVIDENCE_KINDS = [
+    ("screenshot_{n}.png", "image/png", "Screenshot of messages"),
+    ("statement_{n}.txt", "text/plain", "Witness statement"),
+    ("email_thread_{n}.pdf", "application/pdf", "Email correspondence"),
+    ("security_report_{n}.pdf", "application/pdf", "Campus security report"),
+    ("photo_{n}.jpg", "image/jpeg", "Photo of location"),
+]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Priya", "Wei", "Maria", "Omar", "Aisha", "Chris",
+               "Dana", "Elena", "Jamal", "Kenji", "Lucia", "Noah", "Rosa", "Tariq", "Yara"]
+LAST_NAMES = ["Chen", "Johnson", "Martinez", "Patel", "Kim", "Nguyen", "Garcia", "Okafor", "Smith", "Cohen",
+              "Rossi", "Haddad", "Silva", "Brown", "Ivanova", "Tanaka", "Walker", "Lopez", "Singh", "Moore"]
+
+
+def zipf_cum_weights(count: int, exponent: float) -> List[float]:
+    """Cumulative weights for random.choices: rank k has weight 1 / k^exponent"""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+class SyntheticCaseGenerator:
+    """Deterministic stream of users, cases and evidence for one seed"""
+
+    def __init__(self, cases: int, seed: int = 0, days: int = 730, respondent_skew: float = 0.6,
+                 department_skew: float = 0.9, now: datetime = None):
+        self.cases = cases
+        self.seed = seed
+        self.days = days
+        self.now = now or datetime.now()
+        self.random = random.Random(seed)
+
+        # Roughly one respondent per four cases and one complainant per 1.3 cases
+        self.respondent_count = max(1, cases // 4)
+        self.complainant_count = max(1, int(cases / 1.3))
+        self.investigator_count = max(1, cases // 2000)
+        self.respondent_weights = zipf_cum_weights(self.respondent_count, respondent_skew)
+        # Shuffle the department ranks so the seed decides which department is busiest
+        self.departments = self.random.sample(DEPARTMENTS, len(DEPARTMENTS))
+        self.department_weights = zipf_cum_weights(len(DEPARTMENTS), department_skew)
+        self.categories = list(CATEGORY_WEIGHTS)
+        self.category_weights = list(itertools.accumulate(CATEGORY_WEIGHTS.values()))
+
+    def users(self) -> Iterator[Dict[str, Any]]:
+        """Complainants, respondents and investigators referenced by the cases"""
+        rng = random.Random(self.seed + 1)
+        pools = [
+            (UserRole.COMPLAINANT, "syn_complainant", self.complainant_count),
+            (UserRole.RESPONDENT, "syn_respondent", self.respondent_count),
+            (UserRole.INVESTIGATOR, "syn_investigator", self.investigator_count),
+        ]
+        for role, prefix, count in pools:
+            for n in range(count):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield {
+                    "id": f"{prefix}_{n:07d}",
+                    "email": f"{first.lower()}.{last.lower()}.{n}@northwestern.edu",
+                    "name": f"{first} {last}",
+                    "role": role.value,
+                    "department": self.departments[0] if role == UserRole.INVESTIGATOR
+                    else rng.choices(self.departments, cum_weights=self.department_weights)[0],
+                }
+
+    def _status(self, age_days: float) -> CaseStatus:
+        """Older cases are further along; most past 90 days are closed"""
+        progress = age_days / 90 + self.random.uniform(-0.2, 0.2)
+        if progress >= 1:
+            return CaseStatus.CLOSED if self.random.random() < 0.95 else CaseStatus.RESOLUTION
+        stages = [CaseStatus.INTAKE, CaseStatus.REVIEW, CaseStatus.INVESTIGATION, CaseStatus.HEARING,
+                  CaseStatus.RESOLUTION]
+        return stages[int(max(0.0, progress) * len(stages))]
+
+    def case(self, n: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """The n-th case and its evidence"""
+        rng = self.random
+        category = rng.choices(self.categories, cum_weights=self.category_weights)[0]
+        age_days = rng.uniform(0, self.days)
+        filed = self.now - timedelta(days=age_days)
+        incident = filed - timedelta(days=rng.expovariate(1 / 12))
+        status = self._status(age_days)
+
+        if status == CaseStatus.CLOSED:
+            resolution_days = min(age_days, rng.lognormvariate(3.9, 0.35))  # Median ~50 days
+            updated = filed + timedelta(days=resolution_days)
+        else:
+            updated = filed + timedelta(days=rng.uniform(0, age_days))
+
+        respondent_id = None
+        if rng.random() > 0.12:  # Some respondents are unidentified
+            rank = rng.choices(range(self.respondent_count), cum_weights=self.respondent_weights)[0]
+            respondent_id = f"syn_respondent_{rank:07d}"
+        is_crisis = rng.random() < 0.04
+        is_ongoing = status != CaseStatus.CLOSED and rng.random() < 0.3
+        allegation = rng.choice(ALLEGATIONS[category])
+        location = rng.choice(LOCATIONS)
+        evidence_count = min(6, int(rng.expovariate(1 / 2.2)))
+        witness_count = min(8, int(rng.expovariate(1 / 1.5)))
+
+        case_id = f"case_syn_{n:08d}"
+        case = {
+            "id": case_id,
+            "case_number": f"SYN-{filed.year}-{CATEGORY_CODES[category]}-{n:08d}",
+            "complainant_id": f"syn_complainant_{rng.randrange(self.complainant_count):07d}",
+            "respondent_id": respondent_id,
+            "category": category.value,
+            "status": status.value,
+            "priority": (Priority.URGENT if is_crisis or rng.random() < 0.15 else Priority.STANDARD).value,
+            "filed_date": filed.isoformat(),
+            "deadline_date": (filed + timedelta(days=Config.DEFAULT_INVESTIGATION_TIMELINE_DAYS)).isoformat(),
+            "incident_date": incident.date().isoformat(),
+            "incident_location": location,
+            "description": (
+                f"Complainant reports {allegation} at {location.lower()}. "
+                f"{'The conduct is ongoing. ' if is_ongoing else ''}"
+                f"{witness_count} witness{'es' if witness_count != 1 else ''} identified; "
+                f"{evidence_count} item{'s' if evidence_count != 1 else ''} of evidence submitted."
+            ),
+            "is_ongoing": is_ongoing,
+            "is_crisis": is_crisis,
+            "department": rng.choices(self.departments, cum_weights=self.department_weights)[0],
+            "evidence_count": evidence_count,
+            "created_at": filed.isoformat(),
+            "updated_at": min(updated, self.now).isoformat(),
+            "witness_count": witness_count,
+            "relationship": rng.choice(RELATIONSHIPS),
+            "evidence_summary": "Synthetic evidence" if evidence_count else "No evidence submitted",
+        }
+
+        evidence = []
+        for i in range(evidence_count):
+            file_name, file_type, description = rng.choice(EVIDENCE_KINDS)
+            # Small placeholder payloads keep multi-million-case stores a manageable size
+            file_data = base64.b64encode(f"{case_id}:{i}:{description}".encode()).decode()
+            uploaded = filed + timedelta(days=rng.uniform(0, max(0.01, age_days)))
+            evidence.append({
+                "id": f"evd_syn_{n:08d}_{i}",
+                "case_id": case_id,
+                "file_name": file_name.format(n=i + 1),
+                "file_type": file_type,
+                "file_data": file_data,
+                "uploaded_by": "complainant" if rng.random() < 0.8 else "investigator",
+                "uploaded_at": min(uploaded, self.now).isoformat(),
+                "hash": hashlib.sha256(file_data.encode()).hexdigest(),
+                "description": description,
+                "ai_extracted_data": None,
+            })
+        return case, evidence
+
+
+def _batches(iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def populate(generator: SyntheticCaseGenerator, batch_size: int = 10000) -> Dict[str, Any]:
+    """Stream the generator's data into the case store, one transaction per batch"""
+    from app.data import case_store
+
+    started = time.perf_counter()
+    users = 0
+    for batch in _batches(generator.users(), batch_size):
+        users += case_store.insert_users(batch)
+
+    cases = evidence = 0
+    for batch in _batches(range(generator.cases), batch_size):
+        generated = [generator.case(n) for n in batch]
+        with case_store.transaction() as conn:
+            cases += case_store.insert_cases((case for case, _ in generated), conn)
+            evidence += case_store.insert_evidence((item for _, items in generated for item in items), conn)
+        elapsed = time.perf_counter() - started
+        print(f"  {batch[-1] + 1:,} / {generator.cases:,} cases ({(batch[-1] + 1) / elapsed:,.0f}/s)")
+
+    with case_store.transaction() as conn:
+        patterns = case_store.detect_patterns(conn=conn)
+
+    return {
+        "users": users,
+        "cases": cases,
+        "evidence": evidence,
+        "patterns": patterns,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic cases into the case store")
+    parser.add_argument("--cases", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=730, help="Filing dates spread over this many past days")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per insert transaction")
+    parser.add_argument("--respondent-skew", type=float, default=0.6, help="Zipf exponent of respondents")
+    parser.add_argument("--department-skew", type=float, default=0.9, help="Zipf exponent of departments")
+    parser.add_argument("--db", default=None, help="Case database (default: CASE_DB_PATH)")
+    parser.add_argument("--fresh", action="store_true", help="Delete the database first")
+    args = parser.parse_args()
+
+    if args.db:
+        Config.CASE_DB_PATH = args.db
+    if args.fresh:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(Config.CASE_DB_PATH + suffix):
+                os.remove(Config.CASE_DB_PATH + suffix)
+
+    generator = SyntheticCaseGenerator(
+        args.cases, args.seed, args.days, args.respondent_skew, args.department_skew
+    )
+    print(f"Generating {args.cases:,} cases (seed {args.seed}) into {Config.CASE_DB_PATH}")
+    summary = populate(generator, args.batch_size)
+    print(f"Inserted {summary['users']:,} users, {summary['cases']:,} cases, {summary['evidence']:,} evidence items "
+          f"and {summary['patterns']:,} pattern alerts in {summary['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Cached LLM backend probes
+A background task refreshes provider reachability, so health checks, /api/config
+and provider selection never wait on a network call
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import requests
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import Config, LLMProvider
+
+
+class ProbeState:
+    """Latest result of probing one backend"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.available: Optional[bool] = None  # None until the first probe
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None  # time.time() of the last probe
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+
+    def record(self, available: bool, latency: float, error: Optional[str] = None) -> None:
+        now = time.time()
+        self.available = available
+        self.latency_ms = round(1000 * latency, 1)
+        self.checked_at = now
+        if available:
+            self.last_success = now
+            self.last_error = None
+            self.consecutive_failures = 0
+        else:
+            self.last_error = error
+            self.consecutive_failures += 1
+
+    def is_stale(self) -> bool:
+        """No probe yet, or the background loop has stopped refreshing this one"""
+        return self.checked_at is None or time.time() - self.checked_at > 2 * Config.HEALTH_PROBE_INTERVAL_SECONDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        def timestamp(value):
+            return datetime.fromtimestamp(value).isoformat() if value else None
+
+        return {
+            "available": self.available,
+            "latency_ms": self.latency_ms,
+            "last_checked": timestamp(self.checked_at),
+            "last_success": timestamp(self.last_success),
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+local_llm = ProbeState(LLMProvider.LOCAL.value)
+_probe_lock = threading.Lock()
+
+
+def probe_local_llm(only_if_stale: bool = False) -> ProbeState:
+    """GET {LOCAL_LLM_URL}/models with a short timeout (blocking)"""
+    with _probe_lock:
+        # Callers that queued behind another thread's probe reuse its result
+        if only_if_stale and not local_llm.is_stale():
+            return local_llm
+
+        started = time.monotonic()
+        try:
+            response = requests.get(f"{Config.LOCAL_LLM_URL}/models", timeout=Config.HEALTH_PROBE_TIMEOUT_SECONDS)
+            error = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            local_llm.record(response.status_code == 200, time.monotonic() - started, error)
+        except Exception as e:
+            local_llm.record(False, time.monotonic() - started, str(e))
+    return local_llm
+
+
+def is_local_llm_available() -> bool:
+    """
+    Cached local LLM reachability
+
+    In the web process the probe loop keeps this fresh. Processes without the
+    loop (job workers, CLIs) probe on first use and again once the result is stale.
+    """
+    if local_llm.is_stale():
+        probe_local_llm(only_if_stale=True)
+    return bool(local_llm.available)
+
+
+def is_anthropic_available() -> bool:
+    """Anthropic is a hosted API - configured means available"""
+    return Config.is_anthropic_available()
+
+
+def provider_status() -> Dict[str, Any]:
+    """Provider availability from cached state only (never blocks)"""
+    return {
+        "llm_provider": Config.get_llm_provider(),
+        "anthropic_available": is_anthropic_available(),
+        "local_llm_available": bool(local_llm.available),
+    }
+
+
+def probes() -> Dict[str, Any]:
+    return {local_llm.name: local_llm.to_dict()}
+
+
+async def run_probe_loop() -> None:
+    """Refresh the probes every Config.HEALTH_PROBE_INTERVAL_SECONDS"""
+    while True:
+        await run_in_threadpool(probe_local_llm)
+        await asyncio.sleep(Config.HEALTH_PROBE_INTERVAL_SECONDS)
@@ -0,0 +1,297 @@
+"""
+Persistent analysis job queue (SQLite)
+Shared by the API, which enqueues jobs, and the worker processes that run them
+"""
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from app.config import Config
+from app.data.db import connect
+from app.models.schemas import AnalysisPriority, JobStatus
+from app.scheduler import PRIORITY_ORDER
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    case_id TEXT NOT NULL,
+    question TEXT NOT NULL,
+    strategy TEXT,
+    priority TEXT NOT NULL,
+    priority_rank INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    case_data TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    callback_url TEXT,
+    case_revision INTEGER NOT NULL DEFAULT 0,
+    speculative INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    enqueued_at REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, priority_rank, enqueued_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_case ON jobs (case_id, created_at);
+CREATE TABLE IF NOT EXISTS case_revisions (
+    case_id TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release, for job databases created before them
+MIGRATIONS = {
+    "case_revision": "ALTER TABLE jobs ADD COLUMN case_revision INTEGER NOT NULL DEFAULT 0",
+    "speculative": "ALTER TABLE jobs ADD COLUMN speculative INTEGER NOT NULL DEFAULT 0",
+}
+
+_local = threading.local()
+
+
+def _conn():
+    """Per-thread connection to the job database"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = connect(Config.JOB_DB_PATH)
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        _local.conn = conn
+    return conn
+
+
+def _migrate(conn) -> None:
+    """Add columns missing from an older job database"""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column, statement in MIGRATIONS.items():
+        if column not in columns:
+            conn.execute(statement)
+
+
+def _row_to_job(row) -> Dict[str, Any]:
+    job = dict(row)
+    job["speculative"] = bool(job["speculative"])
+    job["case_data"] = json.loads(job["case_data"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def enqueue_job(
+    case_data: Dict[str, Any],
+    question: str,
+    priority: AnalysisPriority,
+    strategy: Optional[str] = None,
+    callback_url: Optional[str] = None,
+    speculative: bool = False
+) -> Dict[str, Any]:
+    """
+    Persist a queued analysis job and return it
+
+    The job is tagged with the case's current revision. Speculative jobs are
+    pre-analyses nobody has asked for yet; they are cancelled when the case
+    changes (see bump_case_revision).
+    """
+    priority = AnalysisPriority(priority)
+    job_id = f"job_{uuid.uuid4().hex[:12]}"
+
+    _conn().execute(
+        """INSERT INTO jobs (id, case_id, question, strategy, priority, priority_rank, status,
+                             case_data, callback_url, case_revision, speculative, enqueued_at, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            job_id, case_data["id"], question, strategy, priority.value,
+            PRIORITY_ORDER.index(priority), JobStatus.QUEUED.value,
+            json.dumps(case_data, default=str), callback_url, get_case_revision(case_data["id"]),
+            int(speculative), time.time(), datetime.now().isoformat()
+        )
+    )
+    return get_job(job_id)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a job by id"""
+    row = _conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def claim_next_job(worker_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Atomically lease the most deserving queued job to a worker
+
+    Jobs are ordered by priority class, aged by Config.SCHEDULER_AGING_SECONDS
+    so low-priority jobs are not starved, then by arrival.
+    """
+    conn = _conn()
+    now = time.time()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            """SELECT id FROM jobs WHERE status = ?
+               ORDER BY priority_rank - (? - enqueued_at) / ?, enqueued_at
+               LIMIT 1""",
+            (JobStatus.QUEUED.value, now, Config.SCHEDULER_AGING_SECONDS)
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+
+        conn.execute(
+            """UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1,
+                               lease_expires_at = ?, started_at = ?
+               WHERE id = ?""",
+            (JobStatus.RUNNING.value, worker_id, now + Config.JOB_LEASE_SECONDS,
+             datetime.now().isoformat(), row["id"])
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    return get_job(row["id"])
+
+
+def extend_lease(job_id: str, worker_id: str) -> None:
+    """Heartbeat from a worker still running the job"""
+    _conn().execute(
+        "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+        (time.time() + Config.JOB_LEASE_SECONDS, job_id, worker_id, JobStatus.RUNNING.value)
+    )
+
+
+def get_job_status(job_id: str) -> Optional[str]:
+    """Current status of a job, without loading its case data or result"""
+    row = _conn().execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return row["status"] if row else None
+
+
+def complete_job(job_id: str, result: Dict[str, Any]) -> None:
+    """Store a finished job's ConsensusResult (unless it was cancelled meanwhile)"""
+    _conn().execute(
+        """UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, lease_expires_at = NULL
+           WHERE id = ? AND status = ?""",
+        (JobStatus.COMPLETED.value, json.dumps(result, default=str), datetime.now().isoformat(),
+         job_id, JobStatus.RUNNING.value)
+    )
+
+
+def fail_job(job_id: str, error: str) -> None:
+    """Requeue a failed job, or mark it failed once it has used all its attempts"""
+    conn = _conn()
+    job = get_job(job_id)
+    if job is None or job["status"] != JobStatus.RUNNING:
+        return
+
+    if job["attempts"] < Config.JOB_MAX_ATTEMPTS:
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL WHERE id = ?",
+            (JobStatus.QUEUED.value, error, job_id)
+        )
+    else:
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+            (JobStatus.FAILED.value, error, datetime.now().isoformat(), job_id)
+        )
+
+
+def cancel_job(job_id: str) -> bool:
+    """
+    Cancel a queued or running job
+
+    A running job's worker notices the status change and aborts its agent calls.
+    """
+    cursor = _conn().execute(
+        "UPDATE jobs SET status = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ? AND status IN (?, ?)",
+        (JobStatus.CANCELLED.value, datetime.now().isoformat(), job_id,
+         JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+    )
+    return cursor.rowcount > 0
+
+
+def requeue_expired_leases() -> int:
+    """Return jobs whose worker died (lease expired) to the queue"""
+    cursor = _conn().execute(
+        "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL WHERE status = ? AND lease_expires_at < ?",
+        (JobStatus.QUEUED.value, JobStatus.RUNNING.value, time.time())
+    )
+    return cursor.rowcount
+
+
+def get_case_revision(case_id: str) -> int:
+    """Current revision of a case (0 until it first changes)"""
+    row = _conn().execute("SELECT revision FROM case_revisions WHERE case_id = ?", (case_id,)).fetchone()
+    return row["revision"] if row else 0
+
+
+def bump_case_revision(case_id: str) -> int:
+    """
+    Record that a case changed (e.g. new evidence) and return its new revision
+
+    Speculative jobs for earlier revisions are cancelled; their results would
+    be stale before anyone read them.
+    """
+    conn = _conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            """INSERT INTO case_revisions (case_id, revision, updated_at) VALUES (?, 1, ?)
+               ON CONFLICT (case_id) DO UPDATE SET revision = revision + 1, updated_at = excluded.updated_at""",
+            (case_id, datetime.now().isoformat())
+        )
+        revision = conn.execute("SELECT revision FROM case_revisions WHERE case_id = ?", (case_id,)).fetchone()["revision"]
+        conn.execute(
+            """UPDATE jobs SET status = ?, finished_at = ?, lease_expires_at = NULL
+               WHERE case_id = ? AND speculative = 1 AND case_revision < ? AND status IN (?, ?)""",
+            (JobStatus.CANCELLED.value, datetime.now().isoformat(), case_id, revision,
+             JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return revision
+
+
+def find_current_job(case_id: str, question: str, strategy: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Most recent job for the case's current revision that answers `question`:
+    a completed one if there is one, otherwise a queued or running one
+    """
+    row = _conn().execute(
+        """SELECT * FROM jobs
+           WHERE case_id = ? AND question = ? AND strategy IS ? AND status IN (?, ?, ?)
+             AND case_revision = (SELECT COALESCE(MAX(revision), 0) FROM case_revisions WHERE case_id = ?)
+           ORDER BY status = ? DESC, created_at DESC
+           LIMIT 1""",
+        (case_id, question, strategy, JobStatus.COMPLETED.value, JobStatus.QUEUED.value,
+         JobStatus.RUNNING.value, case_id, JobStatus.COMPLETED.value)
+    ).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def latest_case_snapshot(case_id: str) -> Optional[Dict[str, Any]]:
+    """Case data stored with the case's most recent job"""
+    row = _conn().execute(
+        "SELECT case_data FROM jobs WHERE case_id = ? ORDER BY created_at DESC LIMIT 1", (case_id,)
+    ).fetchone()
+    return json.loads(row["case_data"]) if row else None
+
+
+def count_jobs_by_status() -> Dict[str, int]:
+    """Number of jobs in each status"""
+    rows = _conn().execute("SELECT status, COUNT(*) AS jobs FROM jobs GROUP BY status").fetchall()
+    return {row["status"]: row["jobs"] for row in rows}
+
+
+def list_case_jobs(case_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Most recent jobs for a case"""
+    rows = _conn().execute(
+        "SELECT * FROM jobs WHERE case_id = ? ORDER BY created_at DESC LIMIT ?", (case_id, limit)
+    ).fetchall()
+    return [_row_to_job(row) for row in rows]
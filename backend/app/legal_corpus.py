@@ -0,0 +1,331 @@
+"""
+Legal reference corpus
+A local corpus of statute, regulation, case-law and guidance passages (JSONL,
+bundled as app/data/legal_corpus.jsonl) with a BM25 index, so Lex is given
+the relevant authorities in its prompt instead of recalling them, and the
+citations it returns can be checked - all without network access
+
+The index is built once per corpus version into LEGAL_INDEX_DIR (postings,
+document lengths and passage offsets as .npy files) and memory-mapped, as is
+the corpus itself; processes sharing the directory share the pages.
+
+From backend/:
+    python -m app.legal_corpus "retaliation after a complaint"
+    python -m app.legal_corpus --verify "Davis v. Monroe County Bd. of Educ., 526 U.S. 629 (1999)"
+"""
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import Config
+
+BUNDLED_CORPUS = os.path.join(os.path.dirname(__file__), "data", "legal_corpus.jsonl")
+K1, B = 1.2, 0.75
+PROMPT_PASSAGE_CHARS = 400
+
+TOKEN = re.compile(r"\d+(?:\.\d+)+|[a-z0-9]+")
+STOPWORDS = set("""
+a about above after again against all also an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+out over own same she should so some such than that the their them then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your may must
+""".split())
+
+# Citation forms that identify one authority
+CODE_CITE = re.compile(
+    r"(\d+)\s*(U\.?\s?S\.?\s?C\.?\s?A?\.?|C\.?\s?F\.?\s?R\.?)\s*(?:§{1,2}|sec(?:tion)?s?\.?|pt\.?|part)?\s*"
+    r"(\d+[a-z]?(?:[.\-]\d+[a-z]?)*)", re.IGNORECASE
+)
+BARE_SECTION = re.compile(r"(?:§{1,2}|\bsection)\s*(\d+\.\d+)", re.IGNORECASE)
+FED_REG_CITE = re.compile(r"(\d+)\s*(?:Fed\.?\s?Reg\.?|F\.?\s?R\.?)\s*(\d+)", re.IGNORECASE)
+REPORTER_CITE = re.compile(
+    r"(\d+)\s+(U\.\s?S\.|S\.\s?Ct\.|L\.\s?Ed\.(?:\s?2d)?|F\.\s?(?:2d|3d|4th)|F\.\s?Supp\.(?:\s?[23]d)?)\s+(\d+)"
+)
+CASE_NAME = re.compile(r"([A-Z][\w.'&-]*),?\s+v\.?\s+([A-Z][\w'&-]*)")
+
+
+# Longest first; enough to match harassed / harassing / harassment and retaliated / retaliation
+SUFFIXES = ("ations", "ation", "ments", "ment", "ated", "ates", "ings", "ing", "ies", "ed", "es", "ly", "s")
+# Words every case narrative uses; ignored in queries, where they only add noise
+NARRATIVE_WORDS = {"complainant", "respondent", "alleg", "report", "incident", "case", "involv"}
+
+
+def _stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and not token.endswith("ss") and len(token) - len(suffix) >= 4:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def citation_keys(citation: str) -> List[Tuple[str, str]]:
+    """(kind, key) for each code section, Federal Register page, reporter cite and case name in the text"""
+    keys = []
+    rest = citation
+    for title, code, section in CODE_CITE.findall(citation):
+        code = "usc" if code.lower().startswith("u") else "cfr"
+        keys.append(("code", f"{title} {code} {section.lower()}"))
+    rest = CODE_CITE.sub(" ", rest)
+    keys.extend(("code", f"section {section}") for section in BARE_SECTION.findall(rest))
+    keys.extend(("code", f"{volume} fr {page}") for volume, page in FED_REG_CITE.findall(rest))
+    for volume, reporter, page in REPORTER_CITE.findall(citation):
+        keys.append(("reporter", f"{volume} {_normalize(reporter).replace(' ', '')} {page}"))
+    for left, right in CASE_NAME.findall(citation):
+        keys.append(("name", f"{_normalize(left)} v {_normalize(right)}"))
+    return keys
+
+
+class LegalIndex:
+    """BM25 over the corpus passages, with the citation keys and aliases of each passage"""
+
+    def __init__(self, corpus_path: str, index_dir: str):
+        self.corpus_path = corpus_path
+        with open(corpus_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        self.directory = os.path.join(index_dir, digest)
+
+        if not os.path.exists(os.path.join(self.directory, "meta.json")):
+            try:
+                self._build()
+            except OSError as e:
+                print(f"Legal index not written to {self.directory} ({e}); building it in memory")
+                self.directory = None
+
+        self._corpus_file = open(corpus_path, "rb")
+        self._corpus = mmap.mmap(self._corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.directory is None:
+            self._load_arrays(self._index_arrays())
+        else:
+            self._load_arrays({
+                name: np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r")
+                for name in ("postings_start", "postings_doc", "postings_tf", "doc_length", "doc_offset")
+            })
+            with open(os.path.join(self.directory, "meta.json")) as f:
+                meta = json.load(f)
+            self.vocabulary = meta["vocabulary"]
+            self.keys = {key: set(docs) for key, docs in meta["keys"].items()}
+            self.aliases = [(alias, doc) for alias, doc in meta["aliases"]]
+
+    # Building
+    def _read_corpus(self) -> List[Tuple[int, int, Dict[str, Any]]]:
+        passages = []
+        offset = 0
+        with open(self.corpus_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    passages.append((offset, offset + len(line), json.loads(line)))
+                offset += len(line)
+        return passages
+
+    def _index_arrays(self) -> Dict[str, Any]:
+        passages = self._read_corpus()
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        self.keys: Dict[str, Set[int]] = {}
+        self.aliases: List[Tuple[str, int]] = []
+        for doc, (_, _, passage) in enumerate(passages):
+            names = [passage["citation"]] + passage.get("aliases", [])
+            tokens = tokenize(" ".join(names + [passage.get("title", ""), passage["text"]]))
+            lengths.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((doc, count))
+
+            for name in names:
+                keys = citation_keys(name)
+                for _, key in keys:
+                    self.keys.setdefault(key, set()).add(doc)
+                    # A section also vouches for its part (34 C.F.R. Part 106) and a bare "§ 106.44"
+                    match = re.match(r"(\d+) cfr (\d+)\.(\S+)", key)
+                    if match:
+                        self.keys.setdefault(f"{match[1]} cfr {match[2]}", set()).add(doc)
+                        self.keys.setdefault(f"section {match[2]}.{match[3]}", set()).add(doc)
+                if not keys:
+                    self.aliases.append((_normalize(name), doc))
+
+        self.vocabulary = {token: i for i, token in enumerate(sorted(postings))}
+        starts, docs, frequencies = [0], [], []
+        for token in sorted(postings):
+            for doc, count in postings[token]:
+                docs.append(doc)
+                frequencies.append(count)
+            starts.append(len(docs))
+        return {
+            "postings_start": np.array(starts, dtype=np.int64),
+            "postings_doc": np.array(docs, dtype=np.int32),
+            "postings_tf": np.array(frequencies, dtype=np.float32),
+            "doc_length": np.array(lengths, dtype=np.float32),
+            "doc_offset": np.array([(start, end) for start, end, _ in passages], dtype=np.int64).reshape(-1, 2),
+        }
+
+    def _build(self) -> None:
+        """Write the index to a scratch directory, then rename it into place (concurrent builders are fine)"""
+        arrays = self._index_arrays()
+        scratch = f"{self.directory}.tmp-{os.getpid()}"
+        os.makedirs(scratch, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(scratch, f"{name}.npy"), array)
+        with open(os.path.join(scratch, "meta.json"), "w") as f:
+            json.dump({
+                "corpus": self.corpus_path,
+                "vocabulary": self.vocabulary,
+                "keys": {key: sorted(docs) for key, docs in self.keys.items()},
+                "aliases": self.aliases,
+            }, f)
+        try:
+            os.rename(scratch, self.directory)
+        except OSError:
+            # Another process built it first
+            for name in os.listdir(scratch):
+                os.remove(os.path.join(scratch, name))
+            os.rmdir(scratch)
+        print(f"Built legal index of {len(arrays['doc_length'])} passages in {self.directory}")
+
+    def _load_arrays(self, arrays: Dict[str, Any]) -> None:
+        self.postings_start = arrays["postings_start"]
+        self.postings_doc = arrays["postings_doc"]
+        self.postings_tf = arrays["postings_tf"]
+        self.doc_length = arrays["doc_length"]
+        self.doc_offset = arrays["doc_offset"]
+        self.documents = len(self.doc_length)
+        self.average_length = float(np.mean(self.doc_length)) if self.documents else 0.0
+
+    # Queries
+    def passage(self, doc: int) -> Dict[str, Any]:
+        start, end = self.doc_offset[doc]
+        return json.loads(self._corpus[int(start):int(end)])
+
+    def search(self, text: str, k: int = 4) -> List[Dict[str, Any]]:
+        """Top-k passages by BM25, best first"""
+        scores = np.zeros(self.documents, dtype=np.float32)
+        for token in set(tokenize(text)) - NARRATIVE_WORDS:
+            term = self.vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = self.postings_start[term], self.postings_start[term + 1]
+            docs, frequencies = self.postings_doc[start:end], self.postings_tf[start:end]
+            idf = math.log(1 + (self.documents - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * self.doc_length[docs] / self.average_length)
+            scores[docs] += idf * frequencies * (K1 + 1) / (frequencies + norm)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{**self.passage(int(doc)), "score": round(float(scores[doc]), 3)} for doc in top]
+
+    def verify(self, citation: str) -> bool:
+        """
+        Whether a citation names an authority in the corpus
+
+        Section, Federal Register, reporter and case-name cites must all be
+        known, and a case name and reporter cite in one citation must belong
+        to the same case. Otherwise a known short name (Title IX, Clery Act)
+        is enough.
+        """
+        keys = citation_keys(citation)
+        if not keys:
+            normalized = f" {_normalize(citation)} "
+            return any(f" {alias} " in normalized for alias, _ in self.aliases)
+
+        matches = {"code": [], "reporter": [], "name": []}
+        for kind, key in keys:
+            docs = self.keys.get(key)
+            if not docs:
+                return False
+            matches[kind].append(docs)
+        if matches["name"] and matches["reporter"]:
+            named = set().union(*matches["name"])
+            return all(docs & named for docs in matches["reporter"])
+        return True
+
+
+_index: Optional[LegalIndex] = None
+_index_lock = threading.Lock()
+_index_failed = False
+
+
+def get_index() -> Optional[LegalIndex]:
+    """The shared index, loaded (or built) on first use; None when disabled or unavailable"""
+    global _index, _index_failed
+    if not Config.LEGAL_CORPUS_ENABLED or _index_failed:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None and not _index_failed:
+                try:
+                    _index = LegalIndex(Config.LEGAL_CORPUS_PATH or BUNDLED_CORPUS, Config.LEGAL_INDEX_DIR)
+                except Exception as e:
+                    print(f"Legal corpus unavailable: {e}")
+                    _index_failed = True
+    return _index
+
+
+def retrieve(text: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+    index = get_index()
+    if index is None:
+        return []
+    return index.search(text, Config.LEGAL_TOP_K if k is None else k)
+
+
+def unverified_citations(citations: List[str]) -> Optional[List[str]]:
+    """Citations not found in the corpus (None when the corpus is unavailable)"""
+    index = get_index()
+    if index is None:
+        return None
+    return [citation for citation in citations if not index.verify(citation)]
+
+
+def prompt_references(case_data: Dict[str, Any], question: str) -> str:
+    """Passages relevant to the case, numbered for the prompt"""
+    passages = retrieve(f"{question} {case_data.get('category') or ''} {case_data.get('description') or ''}")
+    if not passages:
+        return "None available"
+    lines = []
+    for number, passage in enumerate(passages, 1):
+        text = passage["text"]
+        if len(text) > PROMPT_PASSAGE_CHARS:
+            text = text[:PROMPT_PASSAGE_CHARS].rsplit(" ", 1)[0] + " ..."
+        lines.append(f"[{number}] {passage['citation']} - {passage['title']}: {text}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the legal reference corpus or verify citations")
+    parser.add_argument("text", nargs="+", help="Search text, or citations with --verify")
+    parser.add_argument("--verify", action="store_true", help="Check each argument as a citation")
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    if get_index() is None:
+        parser.error("The legal corpus is disabled or could not be loaded")
+    if args.verify:
+        for citation in args.text:
+            verified = not unverified_citations([citation])
+            print(f"{'verified  ' if verified else 'UNVERIFIED'}  {citation}")
+        return
+    for passage in retrieve(" ".join(args.text), args.k):
+        print(f"{passage['score']:7.3f}  {passage['citation']} - {passage['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Record / replay LLM providers
+Capture real completions to a cassette file, then serve them back offline, so
+parsing, consensus and concurrency work can be benchmarked reproducibly on
+realistic responses without a live model
+
+LLM_PROVIDER=record  calls LLM_RECORD_PROVIDER and appends each completion
+LLM_PROVIDER=replay  answers from the cassette (LLM_REPLAY_LATENCY x the recorded timing)
+
+The cassette (LLM_CASSETTE_PATH) is gzip-compressed JSON lines: prompts,
+response text, backend, model, token usage and timings per completion.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from app.config import Config
+from app.llm_provider import BaseLLMProvider, Completion, get_llm_provider
+from app.rate_limiter import LimiterSlot, estimate_tokens
+
+
+class CassetteMiss(Exception):
+    """No recording for these prompts"""
+    pass
+
+
+def cassette_key(system_prompt: str, user_prompt: str) -> str:
+    return hashlib.sha256(f"{system_prompt}\0{user_prompt}".encode()).hexdigest()
+
+
+class Cassette:
+    """Append-only gzip JSON-lines file of recorded completions"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._recordings: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._served: Dict[str, int] = {}
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(record) + "\n").encode()
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Appending starts a new gzip member; readers concatenate members
+                self._file = gzip.open(self.path, "ab")
+                atexit.register(self.close)
+            self._file.write(line)
+            self._file.flush()  # Sync flush: every record survives a crash
+
+    def close(self) -> None:
+        """Finish the gzip member (a recorder killed before this keeps its flushed records)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        recordings: Dict[str, List[Dict[str, Any]]] = {}
+        count = 0
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    recordings.setdefault(record["key"], []).append(record)
+                    count += 1
+        except FileNotFoundError:
+            print(f"LLM cassette {self.path} not found. Nothing to replay.")
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+            # A recorder that was killed leaves an unterminated last member
+            print(f"LLM cassette {self.path} is truncated. Using the {count} complete recordings.")
+        print(f"Loaded {count} recorded completions for {len(recordings)} prompts from {self.path}")
+        return recordings
+
+    def next_recording(self, key: str) -> Dict[str, Any]:
+        """The recording for a prompt; repeated recordings are served in turn"""
+        with self._lock:
+            if self._recordings is None:
+                self._recordings = self._load()
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise CassetteMiss(f"No recording for this prompt (key {key[:12]}) in {self.path}")
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return recordings[served % len(recordings)]
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: Optional[str] = None) -> Cassette:
+    """Shared Cassette per path (one writer / one loaded copy per process)"""
+    path = path or Config.LLM_CASSETTE_PATH
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+class RecordingProvider(BaseLLMProvider):
+    """Calls LLM_RECORD_PROVIDER and records every successful completion"""
+
+    name = "record"
+
+    def __init__(self, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None):
+        if Config.LLM_RECORD_PROVIDER in ("record", "replay"):
+            raise ValueError("LLM_RECORD_PROVIDER must be a live provider (local, anthropic or mock)")
+        self.inner = get_llm_provider(
+            Config.LLM_RECORD_PROVIDER, model=model, temperature=temperature, max_tokens=max_tokens
+        )
+        self.model = self.inner.model
+        self.label = f"Recording {self.inner.label}"
+        self.cassette = get_cassette()
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens=None, json_schema=None, cancel=None) -> Completion:
+        """Inner provider's completion; failures raise (and fall back) without being recorded"""
+        completion = self.inner.complete(system_prompt, user_prompt, max_tokens, json_schema, cancel)
+        self.cassette.append({
+            "key": cassette_key(system_prompt, user_prompt),
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "max_tokens": max_tokens,
+            "structured": json_schema is not None,
+            "text": completion.text,
+            "backend": completion.backend,
+            "model": completion.model,
+            "prompt_tokens": completion.prompt_tokens,
+            "completion_tokens": completion.completion_tokens,
+            "time_to_first_token": completion.time_to_first_token,
+            "generation_time": completion.generation_time,
+            "recorded_at": datetime.now().isoformat(),
+        })
+        return completion
+
+
+class ReplayProvider(BaseLLMProvider):
+    """Serves recorded completions for identical prompts"""
+
+    name = "replay"
+    label = "Replay"
+
+    def __init__(self, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None):
+        # Routing settings are ignored: the prompts alone select the recording
+        self.max_tokens = max_tokens or 1000
+        self.latency_scale = max(0.0, Config.LLM_REPLAY_LATENCY)
+        self.cassette = get_cassette()
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens=None, json_schema=None, cancel=None) -> Completion:
+        """
+        Recorded completion; with LLM_REPLAY_LATENCY > 0 it also waits out the
+        (scaled) recorded timing inside the recorded backend's limiter, so
+        queueing and concurrency behave as they did against the live model
+        """
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        record = self.cassette.next_recording(cassette_key(system_prompt, user_prompt))
+
+        def replay(slot: Optional[LimiterSlot]) -> Completion:
+            started = time.perf_counter()
+            first_token_at = None
+            ttft = record.get("time_to_first_token")
+            generation_time = record.get("generation_time") or 0.0
+            if self.latency_scale:
+                self._sleep(self.latency_scale * (ttft or 0.0), cancel)
+                first_token_at = time.perf_counter() if ttft is not None else None
+                self._sleep(self.latency_scale * max(0.0, generation_time - (ttft or 0.0)), cancel)
+            if slot is not None:
+                slot.report(200, record.get("prompt_tokens"), record.get("completion_tokens"))
+
+            return Completion(
+                record["text"],
+                self.name,
+                model=record.get("model"),
+                prompt_tokens=record.get("prompt_tokens"),
+                completion_tokens=record.get("completion_tokens"),
+                time_to_first_token=first_token_at - started if first_token_at else None,
+                generation_time=time.perf_counter() - started
+            )
+
+        if not self.latency_scale:
+            return replay(None)
+
+        estimated = estimate_tokens(system_prompt, user_prompt, max_tokens or self.max_tokens)
+        return self.call_with_limits(record.get("backend") or self.name, estimated, replay, cancel)
+
+    @staticmethod
+    def _sleep(seconds: float, cancel) -> None:
+        if seconds <= 0:
+            return
+        if cancel is not None:
+            cancel.sleep(seconds)
+        else:
+            time.sleep(seconds)
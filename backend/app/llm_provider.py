@@ -2,28 +2,187 @@
 LLM Provider abstraction - supports local LLM, Anthropic API, and mock responses
 """
 import json
+import time
 import requests
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Tuple
 from abc import ABC, abstractmethod
 
+from app import health, metrics, tracing
+from app.cancellation import AnalysisCancelled, CancellationToken
 from app.config import Config, LLMProvider
+from app.ai_agents.single_call import split_persona_sections
+from app.rate_limiter import LimiterSlot, ProviderOverloaded, estimate_tokens, get_limiter
+from app.scheduler import current_priority_key
+
+
+@dataclass
+class Completion:
+    """A finished completion and what it cost"""
+    text: str
+    backend: str  # Provider that produced the text ("local", "anthropic", "mock")
+    model: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    fallback: bool = False  # Mock response standing in for a failed call
+    # Seconds: waiting for the provider limiter (incl. 429 backoff), request sent
+    # to first token (streaming backends), and request sent to last token
+    limiter_wait: float = 0.0
+    time_to_first_token: Optional[float] = None
+    generation_time: Optional[float] = None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Completion tokens over the decode time (after the first token, when known)"""
+        if not self.completion_tokens or self.generation_time is None:
+            return None
+        decode_time = self.generation_time - (self.time_to_first_token or 0.0)
+        return self.completion_tokens / decode_time if decode_time > 0 else None
 
 
 class BaseLLMProvider(ABC):
     """Base class for LLM providers"""
 
+    name = "base"
+    model: Optional[str] = None
+    # Shown in logs when a call fails and falls back to mock responses
+    label = "LLM"
+
+    def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        cancel: Optional[CancellationToken] = None
+    ) -> str:
+        """
+        Generate text from prompts
+
+        max_tokens overrides the provider's default output budget. json_schema asks
+        backends that support structured output to constrain the response to it.
+        Cancelling `cancel` (or passing its deadline) aborts the call with
+        AnalysisCancelled; any other failure falls back to mock responses.
+        """
+        return self.generate_completion(system_prompt, user_prompt, max_tokens, json_schema, cancel).text
+
+    def generate_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        cancel: Optional[CancellationToken] = None
+    ) -> Completion:
+        """generate(), returning the Completion with its backend and token usage"""
+        model = self.model or "default"
+        with tracing.span("generate", **{"llm.provider": self.name, "llm.model": model}) as current:
+            completion = self._generate_completion(system_prompt, user_prompt, max_tokens, json_schema, cancel, model)
+            current.set_attribute("llm.backend", completion.backend)
+            current.set_attribute("llm.fallback", completion.fallback)
+            current.set_attribute("llm.prompt_tokens", completion.prompt_tokens)
+            current.set_attribute("llm.completion_tokens", completion.completion_tokens)
+            current.set_attribute("llm.limiter_wait_ms", round(1000 * completion.limiter_wait, 1))
+            if completion.time_to_first_token is not None:
+                current.set_attribute("llm.time_to_first_token_ms", round(1000 * completion.time_to_first_token, 1))
+            return completion
+
+    def _generate_completion(self, system_prompt, user_prompt, max_tokens, json_schema, cancel, model) -> Completion:
+        started = time.perf_counter()
+        try:
+            completion = self.complete(system_prompt, user_prompt, max_tokens, json_schema, cancel)
+        except AnalysisCancelled:
+            metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - started, self.name, model, "cancelled")
+            raise
+        except Exception as e:
+            metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - started, self.name, model, "error")
+            metrics.LLM_FALLBACKS.inc(self.name)
+            print(f"{self.label} error: {e}. Falling back to mock.")
+            completion = MockLLMProvider().generate_completion(system_prompt, user_prompt, cancel=cancel)
+            completion.fallback = True
+            return completion
+
+        metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - started, self.name, model, "ok")
+        if completion.prompt_tokens is not None:
+            metrics.LLM_TOKENS.inc(self.name, model, "prompt", amount=completion.prompt_tokens)
+        if completion.completion_tokens is not None:
+            metrics.LLM_TOKENS.inc(self.name, model, "completion", amount=completion.completion_tokens)
+        return completion
+
     @abstractmethod
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Generate text from prompts"""
+    def complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        cancel: Optional[CancellationToken] = None
+    ) -> Completion:
+        """Call the backend without the mock fallback; raises on failure"""
         pass
 
+    def call_with_limits(
+        self,
+        provider_name: str,
+        estimated_tokens: int,
+        send: Callable[[LimiterSlot], Completion],
+        cancel: Optional[CancellationToken] = None
+    ) -> Completion:
+        """
+        Run send() inside the provider's capacity limiter
+
+        send() reports the outcome on its slot and raises ProviderOverloaded on
+        429/5xx; those calls re-queue (in their priority place) after a backoff.
+        """
+        limiter = get_limiter(provider_name)
+        priority = current_priority_key()
+        waited = 0.0
+
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            try:
+                with limiter.acquire(estimated_tokens, cancel, priority) as slot:
+                    waited += slot.queue_wait
+                    completion = send(slot)
+                    completion.limiter_wait = waited
+                    return completion
+            except ProviderOverloaded as e:
+                if attempt == Config.LLM_MAX_RETRIES:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else 2 ** attempt
+                print(f"{provider_name} overloaded ({e}). Retrying in {delay:.1f}s...")
+                backoff_started = time.perf_counter()
+                if cancel is not None:
+                    cancel.sleep(delay)
+                else:
+                    time.sleep(delay)
+                waited += time.perf_counter() - backoff_started
+
 
 class MockLLMProvider(BaseLLMProvider):
     """Mock LLM for testing - returns realistic hardcoded responses"""
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
+    name = LLMProvider.MOCK.value
+    label = "Mock LLM"
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens=None, json_schema=None, cancel=None) -> Completion:
+        """Mock completion (no token usage)"""
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        started = time.perf_counter()
+        text = self.respond(system_prompt, user_prompt)
+        return Completion(text, self.name, generation_time=time.perf_counter() - started)
+
+    def respond(self, system_prompt: str, user_prompt: str) -> str:
         """Return mock response based on agent type and case context"""
 
+        # Single-call council prompt: answer as every member in one JSON object
+        council_sections = split_persona_sections(system_prompt)
+        if council_sections:
+            return json.dumps({
+                name: json.loads(self.respond(persona, user_prompt))
+                for name, persona in council_sections
+            })
+
         # Check if this is the weak case (NW-2025-TIX-0147 / case_001) with inconsistencies
         is_weak_case = "inconsistencies" in user_prompt or "alibi" in user_prompt or "case_001" in user_prompt or "0147" in user_prompt
 
@@ -129,94 +288,262 @@ class MockLLMProvider(BaseLLMProvider):
 class LocalLLMProvider(BaseLLMProvider):
     """Local LLM provider (LM Studio, Ollama, etc.)"""
 
-    def __init__(self):
-        self.base_url = Config.LOCAL_LLM_URL
-        self.model = Config.LOCAL_LLM_MODEL
+    name = LLMProvider.LOCAL.value
+    label = "Local LLM"
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Call local LLM API (OpenAI-compatible)"""
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                },
-                timeout=30
+    def __init__(self, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None):
+        self.base_url = Config.LOCAL_LLM_URL
+        self.model = model or Config.LOCAL_LLM_MODEL
+        self.temperature = temperature if temperature is not None else 0.7
+        self.max_tokens = max_tokens or 1000
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens=None, json_schema=None, cancel=None) -> Completion:
+        """
+        Call local LLM API (OpenAI-compatible)
+
+        The completion is streamed so a cancelled analysis can close the
+        connection, which stops generation on the server.
+        """
+        max_tokens = max_tokens or self.max_tokens
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        if json_schema:
+            # Structured output (LM Studio / Ollama OpenAI-compatible API)
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": json_schema}
+            }
+
+        def send(slot: LimiterSlot) -> Completion:
+            sent = time.perf_counter()
+            try:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    stream=True,
+                    timeout=(5, _read_timeout(30, cancel))
+                )
+            except requests.Timeout:
+                _raise_if_cancelled(cancel)
+                slot.report(504)  # An unresponsive server counts as overload
+                raise
+
+            with response:
+                if cancel is not None:
+                    cancel.on_cancel(response.close)
+
+                slot.report(response.status_code)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise ProviderOverloaded(f"HTTP {response.status_code}", _retry_after(response.headers))
+                response.raise_for_status()
+
+                try:
+                    content, usage, first_token_at = _read_chat_stream(response, cancel)
+                except AnalysisCancelled:
+                    raise
+                except Exception:
+                    # Closing the stream from another thread surfaces as a read error
+                    _raise_if_cancelled(cancel)
+                    raise
+
+            slot.report(response.status_code, usage.get("prompt_tokens"), usage.get("completion_tokens"))
+            return Completion(
+                content, self.name, self.model, usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                time_to_first_token=first_token_at - sent if first_token_at else None,
+                generation_time=time.perf_counter() - sent
             )
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
 
-        except Exception as e:
-            print(f"Local LLM error: {e}. Falling back to mock.")
-            # Fallback to mock on error
-            mock_provider = MockLLMProvider()
-            return mock_provider.generate(system_prompt, user_prompt)
+        return self.call_with_limits(
+            LLMProvider.LOCAL.value, estimate_tokens(system_prompt, user_prompt, max_tokens), send, cancel
+        )
 
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude API provider"""
 
-    def __init__(self):
+    name = LLMProvider.ANTHROPIC.value
+    label = "Anthropic API"
+
+    def __init__(self, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None):
         self.api_key = Config.ANTHROPIC_API_KEY
-        self.model = Config.ANTHROPIC_MODEL
+        self.model = model or Config.ANTHROPIC_MODEL
+        self.temperature = temperature if temperature is not None else 1.0
+        self.max_tokens = max_tokens or 1024
 
         if not self.api_key:
             raise ValueError("Anthropic API key not configured")
 
-    def generate(self, system_prompt: str, user_prompt: str) -> str:
-        """Call Anthropic API"""
-        try:
-            import anthropic
-
-            client = anthropic.Anthropic(api_key=self.api_key)
-
-            message = client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens=None, json_schema=None, cancel=None) -> Completion:
+        """Call Anthropic API (JSON structure is enforced by the prompt), streaming so it can be aborted"""
+        import anthropic
+
+        max_tokens = max_tokens or self.max_tokens
+
+        # Retries go through our limiter instead of the SDK's own backoff
+        client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+
+        def send(slot: LimiterSlot) -> Completion:
+            sent = time.perf_counter()
+            first_token_at = None
+            try:
+                with client.messages.stream(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                    system=system_prompt,
+                    messages=[
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    timeout=_read_timeout(600, cancel)
+                ) as stream:
+                    if cancel is not None:
+                        cancel.on_cancel(stream.close)
+                    for _ in stream.text_stream:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        _raise_if_cancelled(cancel)
+                    _raise_if_cancelled(cancel)
+                    message = stream.get_final_message()
+            except anthropic.APIStatusError as e:
+                slot.report(e.status_code)
+                if e.status_code == 429 or e.status_code >= 500:
+                    raise ProviderOverloaded(f"HTTP {e.status_code}", _retry_after(e.response.headers))
+                raise
+            except anthropic.APITimeoutError:
+                _raise_if_cancelled(cancel)
+                slot.report(504)
+                raise
+            except AnalysisCancelled:
+                raise
+            except Exception:
+                _raise_if_cancelled(cancel)
+                raise
+
+            slot.report(200, message.usage.input_tokens, message.usage.output_tokens)
+            return Completion(
+                message.content[0].text, self.name, self.model,
+                message.usage.input_tokens, message.usage.output_tokens,
+                time_to_first_token=first_token_at - sent if first_token_at else None,
+                generation_time=time.perf_counter() - sent
             )
 
-            return message.content[0].text
-
-        except Exception as e:
-            print(f"Anthropic API error: {e}. Falling back to mock.")
-            # Fallback to mock on error
-            mock_provider = MockLLMProvider()
-            return mock_provider.generate(system_prompt, user_prompt)
-
-
-def get_llm_provider() -> BaseLLMProvider:
-    """Factory function to get the appropriate LLM provider"""
-
-    provider_type = Config.get_llm_provider()
+        return self.call_with_limits(
+            LLMProvider.ANTHROPIC.value, estimate_tokens(system_prompt, user_prompt, max_tokens), send, cancel
+        )
+
+
+def _read_chat_stream(
+    response: requests.Response,
+    cancel: Optional[CancellationToken]
+) -> Tuple[str, Dict[str, Any], Optional[float]]:
+    """
+    Collect an OpenAI-compatible SSE completion stream into (content, usage,
+    perf_counter time of the first content chunk)
+
+    Servers that don't report usage in the stream get one completion token per
+    content chunk, which is close enough for the limiter.
+    """
+    parts = []
+    usage: Dict[str, Any] = {}
+    first_token_at = None
+
+    for line in response.iter_lines(decode_unicode=True):
+        _raise_if_cancelled(cancel)
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+
+        chunk = json.loads(data)
+        if chunk.get("usage"):
+            usage = chunk["usage"]
+        for choice in chunk.get("choices") or []:
+            text = (choice.get("delta") or {}).get("content")
+            if text:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(text)
+
+    # A stream closed by cancellation ends early without an error
+    _raise_if_cancelled(cancel)
+
+    if "completion_tokens" not in usage:
+        usage = {**usage, "completion_tokens": len(parts)}
+    return "".join(parts), usage, first_token_at
+
+
+def _read_timeout(default: float, cancel: Optional[CancellationToken]) -> float:
+    """Socket read timeout, shortened so a blocked read can't outlive the deadline"""
+    remaining = cancel.remaining() if cancel is not None else None
+    if remaining is None:
+        return default
+    return max(0.1, min(default, remaining))
+
+
+def _raise_if_cancelled(cancel: Optional[CancellationToken]) -> None:
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds from a Retry-After header, if the backend sent one"""
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_llm_provider(
+    provider_type: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
+) -> BaseLLMProvider:
+    """
+    Factory function to get the appropriate LLM provider
+
+    Defaults to Config.LLM_PROVIDER; agents routed elsewhere pass their own provider,
+    model, temperature and max_tokens.
+    """
+
+    provider_type = provider_type or Config.get_llm_provider()
+    settings = {"model": model, "temperature": temperature, "max_tokens": max_tokens}
 
     if provider_type == LLMProvider.MOCK:
         return MockLLMProvider()
 
     elif provider_type == LLMProvider.ANTHROPIC:
         if Config.is_anthropic_available():
-            return AnthropicProvider()
+            return AnthropicProvider(**settings)
         else:
             print("Anthropic API key not set. Using mock provider.")
             return MockLLMProvider()
 
     elif provider_type == LLMProvider.LOCAL:
-        if Config.is_local_llm_available():
-            return LocalLLMProvider()
+        if health.is_local_llm_available():
+            return LocalLLMProvider(**settings)
         else:
             print("Local LLM not available. Using mock provider.")
             return MockLLMProvider()
 
+    elif provider_type == LLMProvider.RECORD:
+        from app.llm_cassette import RecordingProvider
+        return RecordingProvider(**settings)
+
+    elif provider_type == LLMProvider.REPLAY:
+        from app.llm_cassette import ReplayProvider
+        return ReplayProvider(**settings)
+
     else:
         print(f"Unknown provider: {provider_type}. Using mock.")
         return MockLLMProvider()
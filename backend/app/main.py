@@ -2,20 +2,40 @@
 SafeSpace AI Council - FastAPI Backend
 Main application entry point
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+import asyncio
 import os
 
-from app.config import Config
-from app.routes import auth, cases, evidence, ai_analysis
+from app import health, metrics, profiling, tracing, warmup
+from app.config import Config, LLMProvider
+from app.routes import auth, cases, evidence, ai_analysis, jobs, history, profiles, export, search
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the background health probes and model warm-up; serving starts
+    immediately but readiness waits for both
+    """
+    tasks = [
+        asyncio.create_task(health.run_probe_loop()),
+        asyncio.create_task(warmup.run_warmup_loop()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="SafeSpace AI Council API",
     description="Multi-Agent AI system for trauma-informed Title IX case management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -27,31 +47,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Root trace span per request (TRACING_EXPORTER)
+app.add_middleware(tracing.TracingMiddleware)
+
+# Sampling profiles of slow / X-Debug-Profile requests
+app.add_middleware(profiling.ProfilingMiddleware)
+
 # Register API routes
 app.include_router(auth.router)
 app.include_router(cases.router)
 app.include_router(evidence.router)
 app.include_router(ai_analysis.router)
+app.include_router(jobs.router)
+app.include_router(history.router)
+app.include_router(profiles.router)
+app.include_router(export.router)
+app.include_router(search.router)
 
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "llm_provider": Config.get_llm_provider(),
-        "anthropic_available": Config.is_anthropic_available(),
-        "local_llm_available": Config.is_local_llm_available()
+    """
+    Liveness endpoint (Docker HEALTHCHECK) - the process is serving requests
+
+    Provider availability comes from the cached background probes; this
+    handler never waits on the network.
+    """
+    return {"status": "healthy", **health.provider_status(), "probes": health.probes()}
+
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """
+    Readiness endpoint - 503 until the first probe has finished and a model
+    warm-up pass has succeeded, so traffic is not routed to an instance whose
+    models are still cold or unreachable
+
+    A local LLM that becomes unreachable after warm-up reports "degraded" but
+    stays ready: analyses fall back to mock responses rather than failing.
+    """
+    ready = warmup.state.completed and health.local_llm.checked_at is not None
+    providers = health.provider_status()
+    degraded = providers["llm_provider"] == LLMProvider.LOCAL and not providers["local_llm_available"]
+
+    body = {
+        "ready": ready,
+        "status": "starting" if not ready else "degraded" if degraded else "ready",
+        **providers,
+        "probes": health.probes(),
+        "warmup": warmup.state.to_dict()
     }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics (text exposition format)"""
+    # Scrape-time gauges read the job queue (SQLite); keep that off the event loop
+    body = await profiling.run_in_threadpool(metrics.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/config")
 async def get_config():
     """Get public configuration"""
     return {
-        "llm_provider": Config.get_llm_provider(),
-        "anthropic_available": Config.is_anthropic_available(),
-        "local_llm_available": Config.is_local_llm_available(),
+        **health.provider_status(),
         "can_toggle_provider": True
     }
 
@@ -0,0 +1,274 @@
+"""
+Prometheus metrics for the council pipeline
+Served in the text exposition format at /metrics
+
+Counters and histograms are sharded per thread: recording a value only touches
+the calling thread's own dict, so the hot path takes no lock and allocates only
+the first time a thread sees a label set. Scrapes sum the shards.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Seconds - from fast mock calls up to slow CPU-bound local generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        _registry.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"] + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _Sharded(_Metric):
+    """Per-thread storage, merged at scrape time"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:  # Once per thread
+                self._shards.append(shard)
+        return shard
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+
+class Counter(_Sharded):
+    """Monotonic count, e.g. calls or tokens"""
+    type = "counter"
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0.0) + amount
+
+    def collect(self) -> Dict[tuple, float]:
+        totals: Dict[tuple, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram(_Sharded):
+    """Distribution of observations (cumulative buckets, sum and count)"""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values) -> None:
+        shard = self._shard()
+        state = shard.get(label_values)
+        if state is None:
+            # Per-bucket counts, then +Inf, sum
+            state = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def collect(self) -> Dict[tuple, list]:
+        totals: Dict[tuple, list] = {}
+        for shard in self._snapshots():
+            for key, state in shard.items():
+                total = totals.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+                for i, value in enumerate(list(state)):
+                    total[i] += value
+        return totals
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, state in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class GaugeCallback(_Metric):
+    """Point-in-time values read from live state (queues, limiters) at scrape time"""
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], read: Callable[[], Dict[tuple, float]],
+                 metric_type: str = "gauge"):
+        super().__init__(name, documentation, labels)
+        self.read = read
+        self.type = metric_type
+
+    def samples(self) -> List[str]:
+        try:
+            values = self.read()
+        except Exception as e:
+            print(f"Metric {self.name} unavailable: {e}")
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "safespace_http_request_duration_seconds", "API request latency by route", ("method", "route", "status")
+)
+
+# Council
+AGENT_DURATION = Histogram(
+    "safespace_agent_duration_seconds", "Time to obtain one agent's vote (prompt, generation, parsing)", ("agent",)
+)
+AGENT_VOTES = Counter("safespace_agent_votes_total", "Votes cast per agent", ("agent", "vote"))
+AGENT_PARSE_FAILURES = Counter(
+    "safespace_agent_parse_failures_total", "Agent responses that could not be parsed", ("agent",)
+)
+AGENT_DEADLINE_EXCEEDED = Counter(
+    "safespace_agent_deadline_exceeded_total", "Agents that abstained after AGENT_DEADLINE_SECONDS", ("agent",)
+)
+AGENT_UNVERIFIED_CITATIONS = Counter(
+    "safespace_agent_unverified_citations_total", "Agent citations not found in the legal reference corpus", ("agent",)
+)
+CONSENSUS_DURATION = Histogram(
+    "safespace_consensus_duration_seconds", "Whole council deliberation latency", ("strategy",)
+)
+
+# LLM providers
+LLM_REQUEST_DURATION = Histogram(
+    "safespace_llm_request_duration_seconds", "LLM completion latency per provider and model",
+    ("provider", "model", "outcome")
+)
+LLM_TOKENS = Counter("safespace_llm_tokens_total", "Tokens processed per provider", ("provider", "model", "type"))
+LLM_FALLBACKS = Counter(
+    "safespace_llm_fallbacks_total", "Failed LLM calls answered by the mock provider instead", ("provider",)
+)
+
+# Pre-analysis cache
+PRECOMPUTE_LOOKUPS = Counter(
+    "safespace_precompute_lookups_total", "Title IX analyses served from a pre-analysis (hit) or run live (miss)",
+    ("result",)
+)
+
+
+# Queue depths - read from the live scheduler, limiters and job queue at scrape time
+def _scheduler_queue_depths() -> Dict[tuple, float]:
+    from app.scheduler import scheduler
+    return {(priority,): stats["queued"] for priority, stats in scheduler.stats().items()}
+
+
+def _scheduler_in_flight() -> Dict[tuple, float]:
+    from app.scheduler import scheduler
+    return {(priority,): stats["in_flight"] for priority, stats in scheduler.stats().items()}
+
+
+def _limiter_stat(key: str) -> Callable[[], Dict[tuple, float]]:
+    def read() -> Dict[tuple, float]:
+        from app.rate_limiter import all_limiter_stats
+        return {(stats["provider"],): stats[key] for stats in all_limiter_stats()}
+    return read
+
+
+def _jobs_by_status() -> Dict[tuple, float]:
+    from app import job_queue
+    return {(status,): count for status, count in job_queue.count_jobs_by_status().items()}
+
+
+GaugeCallback("safespace_scheduler_queued", "Agent calls waiting in the LLM scheduler", ("priority",),
+              _scheduler_queue_depths)
+GaugeCallback("safespace_scheduler_in_flight", "Agent calls running in the LLM scheduler", ("priority",),
+              _scheduler_in_flight)
+GaugeCallback("safespace_limiter_queued", "Calls waiting for a provider limiter slot", ("provider",),
+              _limiter_stat("queued"))
+GaugeCallback("safespace_limiter_in_flight", "Calls holding a provider limiter slot", ("provider",),
+              _limiter_stat("in_flight"))
+GaugeCallback("safespace_limiter_concurrency_limit", "Adaptive (AIMD) concurrency limit per provider", ("provider",),
+              _limiter_stat("concurrency_limit"))
+GaugeCallback("safespace_limiter_overloaded_total", "429/5xx responses seen by each provider limiter", ("provider",),
+              _limiter_stat("overloaded"), metric_type="counter")
+GaugeCallback("safespace_jobs", "Analysis jobs in the persistent queue by status", ("status",), _jobs_by_status)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Route templates keep the label set small (/api/cases/{case_id}, not every id)
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status)
+            )
@@ -6,6 +6,8 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
 
+from app.config import ConsensusStrategy
+
 # Enums
 class CaseCategory(str, Enum):
     TITLE_IX = "Title IX"
@@ -26,6 +28,21 @@ class Priority(str, Enum):
     URGENT = "Urgent"
     STANDARD = "Standard"
 
+class AnalysisPriority(str, Enum):
+    """Scheduling class for LLM work, most to least urgent"""
+    CRISIS = "crisis"
+    URGENT = "urgent"
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    BACKGROUND = "background"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
 class UserRole(str, Enum):
     COMPLAINANT = "complainant"
     RESPONDENT = "respondent"
@@ -85,6 +102,32 @@ class Case(BaseModel):
     evidence_count: int = 0
 
 # AI Agent Models
+class AgentTiming(BaseModel):
+    """Where one agent's time went (milliseconds)"""
+    backend: Optional[str] = None  # Provider that served the agent ("mock" after a fallback)
+    model: Optional[str] = None
+    fallback: bool = False
+    scheduler_wait_ms: Optional[float] = None  # Waiting for a scheduler worker
+    limiter_wait_ms: Optional[float] = None  # Waiting for provider capacity, incl. 429 backoff
+    queue_wait_ms: Optional[float] = None  # Both waits
+    time_to_first_token_ms: Optional[float] = None  # Streaming backends only
+    generation_ms: Optional[float] = None  # Request sent to last token
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    tokens_per_second: Optional[float] = None  # Completion tokens over the decode time
+    parse_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+
+class ConsensusTiming(BaseModel):
+    """Where a deliberation's time went (milliseconds)"""
+    total_ms: float
+    llm_calls: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    slowest_agent: Optional[str] = None
+    slowest_agent_ms: Optional[float] = None
+    max_queue_wait_ms: Optional[float] = None
+
 class AgentVote(BaseModel):
     """Individual agent's vote and reasoning"""
     agent_name: str
@@ -93,7 +136,22 @@ class AgentVote(BaseModel):
     confidence: float  # 0.0 to 1.0
     reasoning: str
     citations: Optional[List[str]] = None
+    unverified_citations: Optional[List[str]] = None  # Citations not found in the legal reference corpus
     recommendations: Optional[List[str]] = None
+    error: Optional[str] = None  # e.g. "Parse failure" when the response was unusable
+    tier: Optional[str] = None  # "fast" or "strong" (cascade strategy only)
+    timing: Optional[AgentTiming] = None
+
+class AgentInfo(BaseModel):
+    """Registered agent and its model routing"""
+    name: str
+    role: str
+    module: str
+    provider: str
+    model: Optional[str] = None  # None = provider's configured model
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    enabled: bool
 
 class ConsensusResult(BaseModel):
     """Result of multi-agent consensus"""
@@ -107,12 +165,104 @@ class ConsensusResult(BaseModel):
     agent_breakdown: List[AgentVote]
     recommendation: str
     analyzed_at: datetime
+    strategy: Optional[str] = None  # "fan_out", "single_call" or "cascade"
+    timing: Optional[ConsensusTiming] = None
+
+class AnalysisRecord(BaseModel):
+    """A stored analysis from the case's history"""
+    id: str
+    case_id: str
+    question: str
+    source: str  # "api" (live request), "job" or "precompute" (queued analyses)
+    job_id: Optional[str] = None
+    case_revision: Optional[int] = None
+    recorded_at: datetime
+    result: ConsensusResult
+
+class WhatIfRules(BaseModel):
+    """Alternative consensus rules to re-score the analysis history with"""
+    agent_weights: Dict[str, float] = {}  # Agent name -> vote weight (default 1.0; 0 leaves the agent out)
+    disagreement_spread: float = Field(0.3, ge=0)  # Confidence spread that flags disagreement
+    split_vote_disagreement: bool = True  # Any YES and NO votes together flag disagreement
+    min_confidence: float = Field(0.0, ge=0, le=1)  # Votes below this count as abstentions
+    uncertain_margin: float = Field(0.0, ge=0, le=1)  # Weighted margin of victory below this is UNCERTAIN
+    question: Optional[str] = None  # Only analyses of this question
+    strategy: Optional[str] = None
+    since: Optional[str] = None  # analyzed_at range (ISO, since inclusive, until exclusive)
+    until: Optional[str] = None
+
+class WhatIfReport(BaseModel):
+    """How the analysis history would come out under WhatIfRules"""
+    analyses: int
+    flipped: int  # Decisions that would change
+    flip_rate: float
+    transitions: Dict[str, int]  # e.g. {"NO->YES": 12}
+    decisions_before: Dict[str, int]
+    decisions_after: Dict[str, int]
+    disagreement_before: int
+    disagreement_after: int
+    mean_confidence_before: float
+    mean_confidence_after: float
+    flipped_analysis_ids: List[str]  # A sample, for inspecting individual cases
+    agents: List[str]
+    unknown_agents: List[str]  # Weighted agents that never voted in the history
+    seconds: float
 
 class AIAnalysisRequest(BaseModel):
     """Request for AI analysis"""
     case_id: str
     question: str
     evidence_ids: Optional[List[str]] = None
+    strategy: Optional[ConsensusStrategy] = None  # Defaults to Config.CONSENSUS_STRATEGY
+    priority: Optional[AnalysisPriority] = None  # Defaults to the case's urgency
+
+class AnalysisJobRequest(AIAnalysisRequest):
+    """Request to run an AI analysis asynchronously"""
+    callback_url: Optional[str] = None  # Receives the finished job as a JSON POST
+
+class AnalysisJob(BaseModel):
+    """Queued or finished asynchronous analysis"""
+    id: str
+    case_id: str
+    question: str
+    strategy: Optional[str] = None
+    priority: AnalysisPriority
+    status: JobStatus
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    case_revision: int = 0
+    speculative: bool = False  # Pre-analysis queued on intake / evidence upload
+    result: Optional[ConsensusResult] = None
+
+# Timeline Models
+class TimelineEvent(BaseModel):
+    """A dated fact about a case: the incident, or a date found in an evidence item"""
+    source: str  # "incident" or an evidence id
+    label: str  # "Incident" or the evidence file name
+    field: str  # incident_date, date, date_range or timeline_position
+    start: datetime
+    end: datetime  # Inclusive; the end of the day for date-only values
+    precision: str  # "day" or "time"
+
+class TimelineFlag(BaseModel):
+    """Overlap or contradiction between timeline events (indexes into events)"""
+    kind: str
+    events: List[int]
+    detail: str
+
+class CaseTimeline(BaseModel):
+    """A case's events in start order, with overlaps and contradictions found in code"""
+    case_id: str
+    revision: Optional[int] = None  # Case revision it was built from (None when unknown)
+    events: List[TimelineEvent] = []
+    overlaps: List[TimelineFlag] = []
+    contradictions: List[TimelineFlag] = []
+    unparsed: List[str] = []  # Date values that could not be read
+    built_at: datetime
 
 # Pattern Detection Models
 class PatternAlert(BaseModel):
@@ -151,6 +301,62 @@ class DashboardStats(BaseModel):
     approaching_deadline: int
     average_resolution_days: float
 
+# Search Models
+class CaseSearchHit(BaseModel):
+    """A case matching a full-text search"""
+    id: str
+    case_number: str
+    status: str
+    category: str
+    priority: str
+    filed_date: str
+    incident_location: Optional[str] = None
+    score: Optional[float] = None  # BM25 relevance, higher is better (None for case number matches)
+    snippet: str  # Matched text, HTML-escaped, terms wrapped in <mark>
+
+class EvidenceSearchHit(BaseModel):
+    """An evidence item matching a full-text search"""
+    id: str
+    case_id: str
+    case_number: str
+    status: str
+    file_name: str
+    file_type: str
+    uploaded_at: str
+    score: float
+    snippet: str
+
+class SearchResults(BaseModel):
+    """Ranked full-text search results"""
+    query: str
+    cases: List[CaseSearchHit] = []
+    evidence: List[EvidenceSearchHit] = []
+    took_ms: float
+
+# Bulk Import Models
+class ImportRowError(BaseModel):
+    """A row the bulk import rejected"""
+    row: int  # 1-based data row (CSV header not counted)
+    error: str
+    case_id: Optional[str] = None
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk case import"""
+    format: str
+    rows: int
+    imported: int
+    failed: int
+    batches: int
+    patterns_updated: int
+    seconds: float
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False  # More rows failed than are listed
+
+# Profiling Models
+class ProfilerSettings(BaseModel):
+    """Runtime profiler settings (admin only)"""
+    slow_request_ms: float = Field(ge=0)  # Profile requests slower than this; 0 = only X-Debug-Profile
+
 # API Response Models
 class SuccessResponse(BaseModel):
     """Generic success response"""
@@ -0,0 +1,69 @@
+"""
+Speculative pre-analysis
+Queues a low-priority Title IX analysis when a case is filed or gains evidence,
+so the investigator's first analysis is usually already computed
+"""
+from typing import Dict, Any, Optional
+
+from app import job_queue, timeline
+from app.ai_agents.consensus import TITLE_IX_QUESTION
+from app.config import Config
+from app.data import case_store
+from app.models.schemas import ConsensusResult, JobStatus
+
+
+def precompute_title_ix(case_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Queue a background Title IX analysis for the case's current revision
+
+    Returns the job, or None when pre-analysis is disabled or could not be
+    queued - intake and uploads never fail because of it.
+    """
+    if not Config.PRECOMPUTE_ANALYSES:
+        return None
+
+    try:
+        existing = job_queue.find_current_job(case_data["id"], TITLE_IX_QUESTION)
+        if existing:
+            return existing
+
+        job = job_queue.enqueue_job(
+            case_data, TITLE_IX_QUESTION, Config.PRECOMPUTE_PRIORITY, speculative=True
+        )
+        print(f"Queued Title IX pre-analysis {job['id']} for case {case_data['id']}")
+        return job
+    except Exception as e:
+        print(f"Pre-analysis for case {case_data.get('id')} not queued: {e}")
+        return None
+
+
+def on_evidence_added(case_id: str) -> Optional[Dict[str, Any]]:
+    """Invalidate the case's stale pre-analyses and queue a fresh one"""
+    try:
+        revision = job_queue.bump_case_revision(case_id)
+        print(f"Case {case_id} is now at revision {revision}")
+    except Exception as e:
+        print(f"Could not record new revision of case {case_id}: {e}")
+        return None
+
+    case_data = case_store.get_case(case_id) or job_queue.latest_case_snapshot(case_id)
+    if not case_data:
+        return None
+    try:
+        timeline.case_timeline(case_data)  # Warm the cache for live analyses of the new revision
+    except Exception as e:
+        print(f"Timeline of case {case_id} not built: {e}")
+    return precompute_title_ix(case_data)
+
+
+def get_precomputed_title_ix(case_id: str, strategy: Optional[str] = None) -> Optional[ConsensusResult]:
+    """Completed Title IX analysis for the case's current revision, if there is one"""
+    try:
+        job = job_queue.find_current_job(case_id, TITLE_IX_QUESTION, strategy)
+    except Exception as e:
+        print(f"Pre-analysis lookup for case {case_id} failed: {e}")
+        return None
+
+    if job and job["status"] == JobStatus.COMPLETED and job["result"]:
+        return ConsensusResult(**job["result"])
+    return None
@@ -0,0 +1,304 @@
+"""
+On-demand sampling profiler
+Captures CPU profiles of slow requests, or of any request an administrator
+marks with the X-Debug-Profile header, without redeploying
+
+While profiled requests are in flight, one background thread samples the
+Python stacks (sys._current_frames) of the threads working on them each
+PROFILE_SAMPLE_INTERVAL_MS: the event loop while the request's own task is
+running on it, plus the threadpool and scheduler threads that attached to the
+request (run_in_threadpool below, and the LLM scheduler's workers). Other
+requests' stacks are not mixed in. Threads blocked waiting (locks, select,
+socket reads) are skipped, so the samples show where CPU goes - serialization,
+prompt building, JSON parsing. A finished request's samples become a profile
+in a bounded ring buffer, downloadable as folded stacks for flamegraph.pl or
+speedscope.
+"""
+import asyncio
+import contextvars
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+from fastapi.concurrency import run_in_threadpool as _run_in_threadpool
+
+from app.config import Config
+from app.routes.auth import is_administrator
+
+PROFILE_HEADER = "x-debug-profile"
+
+# Leaf frames of threads that are waiting rather than running
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("socket.py", "readinto"),
+    ("ssl.py", "read"),
+    ("ssl.py", "recv_into"),
+}
+
+# Samples kept per request (~5 minutes of one busy thread at 100Hz)
+MAX_SAMPLES = 30000
+
+
+class Profile:
+    """Folded stacks sampled while one request was in flight"""
+
+    def __init__(self, profile_id: str, request: Dict[str, Any], stacks: Counter, interval: float):
+        self.id = profile_id
+        self.request = request
+        self.stacks = stacks
+        self.interval = interval
+        self.captured_at = datetime.now()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "captured_at": self.captured_at.isoformat(),
+            "samples": sum(self.stacks.values()),
+            "sample_interval_ms": round(1000 * self.interval, 1),
+            **self.request,
+        }
+
+    def folded(self) -> str:
+        """Brendan Gregg's folded format: "thread;outer;...;leaf count" per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class SampledRequest:
+    """A profiled request in flight: its task on the event loop and the threads working for it"""
+
+    def __init__(self, profiler: "SamplingProfiler"):
+        self.profiler = profiler
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        self.threads: Dict[int, int] = {}  # thread ident -> attach depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def owns(self, ident: int) -> bool:
+        """Whether the thread is working for this request right now (called from the sampler)"""
+        if ident in self.threads:
+            return True
+        return ident == self.loop_thread and asyncio.current_task(self.loop) is self.task
+
+
+_current_request: contextvars.ContextVar[Optional[SampledRequest]] = contextvars.ContextVar(
+    "profiled_request", default=None
+)
+
+
+@contextmanager
+def attach_thread() -> Iterator[None]:
+    """Attribute this thread's samples to the profiled request of the current context, if any"""
+    request = _current_request.get()
+    if request is None:
+        yield
+        return
+
+    ident = threading.get_ident()
+    with request.profiler.lock:
+        request.threads[ident] = request.threads.get(ident, 0) + 1
+    try:
+        yield
+    finally:
+        with request.profiler.lock:
+            request.threads[ident] -= 1
+            if not request.threads[ident]:
+                del request.threads[ident]
+
+
+async def run_in_threadpool(fn: Callable, *args, **kwargs) -> Any:
+    """fastapi.concurrency.run_in_threadpool, with the worker thread attached to the profiled request"""
+    def attached():
+        with attach_thread():
+            return fn(*args, **kwargs)
+    return await _run_in_threadpool(attached)
+
+
+class SamplingProfiler:
+    """Background stack sampler, running only while profiled requests are in flight"""
+
+    def __init__(self, interval: float):
+        self.interval = max(0.001, interval)
+        self.lock = threading.Lock()
+        self._requests: List[SampledRequest] = []
+        self._wake = threading.Condition(self.lock)
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[Any, str] = {}  # code object -> frame label
+
+    def begin(self) -> SampledRequest:
+        """Start sampling for the request running in the current task"""
+        request = SampledRequest(self)
+        with self.lock:
+            self._requests.append(request)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+            self._wake.notify()
+        return request
+
+    def end(self, request: SampledRequest) -> Counter:
+        """Stop sampling for the request and return its folded stacks"""
+        with self.lock:
+            self._requests.remove(request)
+        return request.stacks
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _fold(self, frame) -> Optional[str]:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+            return None
+
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                while not self._requests:
+                    self._wake.wait()
+                requests = list(self._requests)
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            with self.lock:
+                owners = {ident: [request for request in requests if request.owns(ident)] for ident in frames}
+            stacks = {}
+            for ident, frame in frames.items():
+                if owners[ident]:
+                    stack = self._fold(frame)
+                    if stack:
+                        stacks[ident] = f"{names.get(ident, ident)};{stack}"
+            frames = frame = None
+
+            with self.lock:
+                for ident, stack in stacks.items():
+                    for request in owners[ident]:
+                        # A request that ended meanwhile has already handed its stacks over
+                        if request in self._requests and request.samples < MAX_SAMPLES:
+                            request.stacks[stack] += 1
+                            request.samples += 1
+
+            time.sleep(self.interval)
+
+
+def _short_path(filename: str) -> str:
+    """Path from the package root (app/..., fastapi/...) for readable frames"""
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("app", "site-packages"):
+        if marker in parts:
+            index = len(parts) - 1 - parts[::-1].index(marker)
+            return "/".join(parts[index + (marker == "site-packages"):])
+    return "/".join(parts[-2:])
+
+
+profiler = SamplingProfiler(Config.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+profiles = deque(maxlen=max(1, Config.PROFILE_BUFFER_SIZE))
+_ids = itertools.count(1)
+
+# Adjustable at runtime through PUT /api/admin/profiles/settings
+settings = {"slow_request_ms": Config.PROFILE_SLOW_REQUEST_MS}
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Newest first"""
+    return [profile.summary() for profile in reversed(profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[Profile]:
+    for profile in list(profiles):
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+def clear_profiles() -> int:
+    count = len(profiles)
+    profiles.clear()
+    return count
+
+
+def _record(profile_id: str, scope, status: int, trigger: str, stacks: Counter, started: float, finished: float) -> None:
+    route = getattr(scope.get("route"), "path", None)
+    request = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": route,
+        "status": status,
+        "duration_ms": round(1000 * (finished - started), 1),
+        "trigger": trigger,
+    }
+    profiles.append(Profile(profile_id, request, stacks, profiler.interval))
+    print(f"Captured profile {profile_id} ({trigger}) for {scope['method']} {scope['path']}")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware deciding which requests to profile
+
+    With a slow-request threshold set every request is sampled, and kept only
+    if it ran longer than the threshold. Otherwise only requests with
+    X-Debug-Profile and an administrator token are sampled; their response
+    carries X-Profile-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(("/api/admin/profiles", "/metrics")):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        requested = bool(headers.get(PROFILE_HEADER.encode())) and is_administrator(
+            headers.get(b"authorization", b"").decode("latin-1")
+        )
+        threshold = settings["slow_request_ms"]
+        if not requested and not threshold:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"prof_{next(_ids)}"
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if requested:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", profile_id.encode())
+                    ]
+            await send(message)
+
+        started = time.monotonic()
+        request = profiler.begin()
+        token = _current_request.set(request)  # Threads attach through run_in_threadpool / the scheduler
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            finished = time.monotonic()
+            _current_request.reset(token)
+            stacks = profiler.end(request)
+            if requested:
+                _record(profile_id, scope, status, "header", stacks, started, finished)
+            elif 1000 * (finished - started) >= threshold:
+                _record(profile_id, scope, status, "slow", stacks, started, finished)
@@ -0,0 +1,257 @@
+"""
+Per-provider capacity limits
+Requests/minute and tokens/minute buckets plus AIMD adaptive concurrency
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from app.cancellation import CancellationToken
+from app.config import Config
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding one minute's allowance"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # units per second
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (a request larger than the bucket waits for a full one)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self.available = min(self.capacity, self.available + amount)
+
+
+class ProviderOverloaded(Exception):
+    """Backend signalled overload (429/5xx); the call may be retried after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LimiterSlot:
+    """
+    One admitted call. Use as a context manager and report() the outcome;
+    leaving the block releases the slot and feeds the AIMD controller.
+    """
+
+    def __init__(self, limiter: "ProviderLimiter", estimated_tokens: int, queue_wait: float):
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self.queue_wait = queue_wait
+        self.started = time.monotonic()
+        self.status: Optional[int] = None
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+
+    def report(self, status: int, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+        """Record the HTTP status and token usage of the call"""
+        self.status = status
+        if prompt_tokens is not None:
+            self.prompt_tokens = prompt_tokens
+        if completion_tokens is not None:
+            self.completion_tokens = completion_tokens
+
+    def __enter__(self) -> "LimiterSlot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.limiter.release(self, time.monotonic() - self.started)
+        return False
+
+
+class ProviderLimiter:
+    """
+    Capacity limiter for one LLM backend
+
+    Callers queue by priority key (lowest first, then arrival); the head of the
+    queue is admitted once a concurrency slot is free and both the request and token buckets can cover it. The
+    concurrency limit follows AIMD: +1/limit per healthy completion, halved on
+    429/5xx or when per-token latency spikes above its moving average.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency_limit = float(min(2, self.max_concurrency))
+
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._waiters = []  # Heap of (priority key, arrival, ticket)
+        self._arrivals = itertools.count()
+        self._latency_ewma: Optional[float] = None  # seconds per completion token
+        self._latency_samples = 0
+        self._rtt_ewma = 1.0  # seconds per call
+        self._last_decrease = 0.0
+
+        # Counters for stats()
+        self.completed = 0
+        self.overloaded = 0
+        self.total_queue_wait = 0.0
+
+    def acquire(
+        self,
+        estimated_tokens: int,
+        cancel: Optional[CancellationToken] = None,
+        priority: float = 0.0
+    ) -> LimiterSlot:
+        """
+        Block until this call may run; waiting callers are admitted lowest
+        priority key first (the scheduler's aged priority), then in arrival order
+
+        A cancelled (or expired) token leaves the queue with AnalysisCancelled.
+        """
+        ticket = (priority, next(self._arrivals), object())
+        enqueued = time.monotonic()
+
+        if cancel is not None:
+            cancel.on_cancel(self._wake)
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    if cancel is not None:
+                        cancel.raise_if_cancelled()
+                    timeout = cancel.remaining() if cancel is not None else None
+
+                    if self._waiters[0] is ticket and self.in_flight < int(self.concurrency_limit):
+                        now = time.monotonic()
+                        delay = max(
+                            self.requests.wait_time(1, now) if self.requests else 0.0,
+                            self.tokens.wait_time(estimated_tokens, now) if self.tokens else 0.0,
+                        )
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay if timeout is None else min(delay, timeout))
+                    else:
+                        self._cond.wait(timeout)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(estimated_tokens)
+            self.in_flight += 1
+
+            queue_wait = time.monotonic() - enqueued
+            self.total_queue_wait += queue_wait
+
+        return LimiterSlot(self, estimated_tokens, queue_wait)
+
+    def _wake(self) -> None:
+        """Wake waiters so a cancelled one can leave the queue"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def release(self, slot: LimiterSlot, latency: float) -> None:
+        """Free the slot, settle the token estimate and adjust the concurrency limit"""
+        with self._cond:
+            self.in_flight -= 1
+            self.completed += 1
+
+            self._rtt_ewma = 0.8 * self._rtt_ewma + 0.2 * latency
+
+            if self.tokens and slot.prompt_tokens is not None and slot.completion_tokens is not None:
+                actual = slot.prompt_tokens + slot.completion_tokens
+                if actual < slot.estimated_tokens:
+                    self.tokens.give_back(slot.estimated_tokens - actual)
+                else:
+                    self.tokens.take(actual - slot.estimated_tokens)
+
+            if slot.status is not None and (slot.status == 429 or slot.status >= 500):
+                self.overloaded += 1
+                self._decrease()
+            elif slot.status is not None and slot.status < 400 and slot.completion_tokens:
+                self._observe_latency(latency / slot.completion_tokens)
+
+            self._cond.notify_all()
+
+    def _observe_latency(self, per_token: float) -> None:
+        """Additive increase, unless per-token latency spikes above its moving average"""
+        if self._latency_ewma is not None and self._latency_samples >= 5 \
+                and per_token > self._latency_ewma * Config.LIMITER_LATENCY_SPIKE:
+            self._decrease()
+        else:
+            self.concurrency_limit = min(
+                float(self.max_concurrency), self.concurrency_limit + 1.0 / self.concurrency_limit
+            )
+
+        if self._latency_ewma is None:
+            self._latency_ewma = per_token
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * per_token
+        self._latency_samples += 1
+
+    def _decrease(self) -> None:
+        """Multiplicative decrease, at most once per round trip so one burst of errors halves once"""
+        now = time.monotonic()
+        if now - self._last_decrease < self._rtt_ewma:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(1.0, self.concurrency_limit * 0.5)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot for the capacity endpoint"""
+        with self._cond:
+            return {
+                "provider": self.name,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "completed": self.completed,
+                "overloaded": self.overloaded,
+                "avg_queue_wait_ms": round(1000 * self.total_queue_wait / max(1, self.completed + self.in_flight), 1),
+                "requests_available": round(self.requests.available, 1) if self.requests else None,
+                "tokens_available": round(self.tokens.available) if self.tokens else None,
+            }
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider_name: str) -> ProviderLimiter:
+    """Shared limiter for a provider, configured from Config.get_provider_limits()"""
+    with _limiters_lock:
+        if provider_name not in _limiters:
+            rpm, tpm, max_concurrency = Config.get_provider_limits(provider_name)
+            _limiters[provider_name] = ProviderLimiter(provider_name, rpm, tpm, max_concurrency)
+        return _limiters[provider_name]
+
+
+def all_limiter_stats() -> list:
+    """Stats for every limiter created so far"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def estimate_tokens(system_prompt: str, user_prompt: str, max_tokens: int) -> int:
+    """Rough token reservation: ~4 characters per prompt token plus the full output budget"""
+    return (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
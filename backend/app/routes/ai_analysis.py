@@ -1,18 +1,60 @@
 """
 AI Analysis routes - Multi-agent consensus system
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
-
-from app.models.schemas import AIAnalysisRequest, ConsensusResult, PatternAlert
+import asyncio
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Any, Callable, List, Optional
+
+from app import metrics
+from app.profiling import run_in_threadpool
+from app.cancellation import AnalysisCancelled, CancellationToken, DeadlineExceeded
+from app.config import Config, ConsensusStrategy
+from app.models.schemas import AIAnalysisRequest, AgentInfo, AnalysisPriority, ConsensusResult, PatternAlert
 from app.ai_agents.consensus import run_consensus, analyze_title_ix_jurisdiction
-from app.data.mock_data import get_mock_cases, get_mock_patterns
+from app.ai_agents.registry import get_agents
+from app.rate_limiter import all_limiter_stats
+from app.scheduler import scheduler
+from app.data import analysis_history, case_store
+from app.precompute import get_precomputed_title_ix
 
 router = APIRouter(prefix="/api/ai", tags=["AI Analysis"])
 
+# How often a running analysis checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def run_analysis(http_request: Request, analysis: Callable[..., ConsensusResult], *args: Any) -> ConsensusResult:
+    """
+    Run a blocking consensus analysis in the threadpool, cancelling it if the
+    client disconnects or Config.ANALYSIS_DEADLINE_SECONDS passes
+
+    Cancellation aborts in-flight agent calls, so an abandoned analysis stops
+    using the LLM backend instead of generating results nobody will read.
+    """
+    cancel = CancellationToken(Config.ANALYSIS_DEADLINE_SECONDS)
+    task = asyncio.ensure_future(run_in_threadpool(analysis, *args, cancel=cancel))
+
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if not task.done() and not cancel.cancelled and await http_request.is_disconnected():
+                print("Client disconnected. Cancelling analysis...")
+                cancel.cancel("client disconnected")
+        return task.result()
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="AI analysis exceeded its deadline")
+    except AnalysisCancelled:
+        # Nobody is listening any more; 499 (client closed request) is for the logs
+        raise HTTPException(status_code=499, detail="AI analysis cancelled")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
+    finally:
+        if not task.done():
+            cancel.cancel("request aborted")
+
 
 @router.post("/analyze", response_model=ConsensusResult)
-async def analyze_case(request: AIAnalysisRequest):
+async def analyze_case(request: AIAnalysisRequest, http_request: Request):
     """
     Run multi-agent consensus analysis on a case
 
@@ -20,50 +62,79 @@ async def analyze_case(request: AIAnalysisRequest):
     """
 
     # Get case data
-    cases = get_mock_cases()
-    case_data = None
-
-    for case in cases:
-        if case["id"] == request.case_id or case["case_number"] == request.case_id:
-            case_data = case
-            break
+    case_data = await run_in_threadpool(case_store.get_case, request.case_id)
 
     if not case_data:
         raise HTTPException(status_code=404, detail="Case not found")
 
     # Run multi-agent consensus
-    try:
-        result = run_consensus(request.question, case_data)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
+    result = await run_analysis(
+        http_request, run_consensus, request.question, case_data, request.strategy, request.priority
+    )
+    await run_in_threadpool(analysis_history.try_record_analysis, case_data["id"], result, "api")
+    return result
 
 
 @router.get("/analyze/title-ix/{case_id}", response_model=ConsensusResult)
-async def analyze_title_ix(case_id: str):
+async def analyze_title_ix(
+    case_id: str,
+    http_request: Request,
+    response: Response,
+    strategy: Optional[ConsensusStrategy] = None,
+    priority: Optional[AnalysisPriority] = None
+):
     """
     Shortcut: Analyze if case meets Title IX jurisdiction
     Most common analysis question
-    """
 
-    # Get case data
-    cases = get_mock_cases()
-    case_data = None
+    Served from the case's pre-analysis (queued on intake / evidence upload)
+    when one has completed for the current evidence; X-Analysis-Source says which.
+    """
 
-    for case in cases:
-        if case["id"] == case_id or case["case_number"] == case_id:
-            case_data = case
-            break
+    # Get case data (case_id may be a case number; pre-analyses are keyed by id)
+    case_data = await run_in_threadpool(case_store.get_case, case_id)
 
     if not case_data:
         raise HTTPException(status_code=404, detail="Case not found")
 
+    precomputed = await run_in_threadpool(get_precomputed_title_ix, case_data["id"], strategy.value if strategy else None)
+    if precomputed:
+        metrics.PRECOMPUTE_LOOKUPS.inc("hit")
+        response.headers["X-Analysis-Source"] = "precomputed"
+        return precomputed
+    metrics.PRECOMPUTE_LOOKUPS.inc("miss")
+    response.headers["X-Analysis-Source"] = "live"
+
     # Run Title IX analysis
-    try:
-        result = analyze_title_ix_jurisdiction(case_data)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
+    result = await run_analysis(http_request, analyze_title_ix_jurisdiction, case_data, strategy, priority)
+    await run_in_threadpool(analysis_history.try_record_analysis, case_data["id"], result, "api")
+    return result
+
+
+@router.get("/agents", response_model=List[AgentInfo])
+async def list_agents():
+    """
+    List registered council agents with their model routing
+    Disabled agents are included with enabled=false
+    """
+    return [AgentInfo(**agent.to_dict()) for agent in get_agents(include_disabled=True)]
+
+
+@router.get("/capacity")
+async def get_provider_capacity():
+    """
+    Per-provider limiter state: adaptive concurrency limit, in-flight and
+    queued calls, and remaining request/token budget
+    """
+    return {"providers": all_limiter_stats()}
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """
+    LLM scheduler queue depth and wait times per priority class
+    """
+    return {"workers": scheduler.workers, "classes": scheduler.stats()}
 
 
 @router.get("/patterns/respondent/{respondent_id}", response_model=List[PatternAlert])
@@ -71,24 +142,15 @@ async def get_pattern_alerts(respondent_id: str):
     """
     Get pattern detection alerts for a respondent
     """
-    patterns = get_mock_patterns()
-
-    # Filter by respondent
-    respondent_patterns = [
-        PatternAlert(**pattern) for pattern in patterns
-        if pattern["respondent_id"] == respondent_id
-    ]
-
-    return respondent_patterns
+    return [PatternAlert(**pattern) for pattern in await run_in_threadpool(case_store.list_patterns, respondent_id)]
 
 
 @router.get("/patterns/", response_model=List[PatternAlert])
-async def get_all_patterns():
+async def get_all_patterns(limit: int = 100):
     """
-    Get all pattern detection alerts
+    Get pattern detection alerts, highest risk first
     """
-    patterns = get_mock_patterns()
-    return [PatternAlert(**pattern) for pattern in patterns]
+    return [PatternAlert(**pattern) for pattern in await run_in_threadpool(case_store.list_patterns, limit=limit)]
 
 
 @router.post("/bias-check")
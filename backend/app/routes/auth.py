@@ -1,7 +1,9 @@
 """
 Authentication routes (demo only - hardcoded users)
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
+from app.config import Config
 from app.models.schemas import LoginRequest, LoginResponse, User
 from app.data.mock_data import MOCK_USERS
 import secrets
@@ -9,6 +11,29 @@ import secrets
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+def is_administrator(authorization: Optional[str]) -> bool:
+    """
+    True for an "Authorization: Bearer <ADMIN_API_TOKEN>" header
+
+    Demo login tokens are never accepted, and nothing is while no
+    ADMIN_API_TOKEN is configured.
+    """
+    if not Config.ADMIN_API_TOKEN:
+        return False
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and secrets.compare_digest(
+        token.strip().encode(), Config.ADMIN_API_TOKEN.encode()
+    )
+
+
+def require_administrator(authorization: Optional[str] = Header(None)) -> None:
+    """Dependency for admin-only routes (export, bulk import, profiles)"""
+    if not Config.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled (set ADMIN_API_TOKEN to enable it)")
+    if not is_administrator(authorization):
+        raise HTTPException(status_code=403, detail="Admin API token required")
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
     """
@@ -32,7 +57,7 @@ async def login(request: LoginRequest):
     user = User(**user_data)
 
     # Generate dummy token
-    token = f"demo_token_{request.role}_{secrets.token_hex(8)}"
+    token = f"demo_token_{request.role.value}_{secrets.token_hex(8)}"
 
     return LoginResponse(user=user, token=token)
 
@@ -1,38 +1,47 @@
 """
 Case management routes
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
-from datetime import datetime, timedelta
-import uuid
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from typing import List, Optional
 
+from app import timeline
+from app.profiling import run_in_threadpool
+from app.config import Config
 from app.models.schemas import (
-    Case, ComplaintIntake, SuccessResponse, DashboardStats
+    Case, CaseStatus, CaseTimeline, ComplaintIntake, ImportReport, SuccessResponse, DashboardStats
 )
-from app.data.mock_data import get_mock_cases, get_dashboard_stats
+from app.data import case_store, importer
+from app.routes.auth import require_administrator
+from app.precompute import precompute_title_ix
 
 router = APIRouter(prefix="/api/cases", tags=["Cases"])
 
 
 @router.get("", response_model=List[Case])
 @router.get("/", response_model=List[Case])
-async def get_cases(status: str = None, category: str = None):
+async def get_cases(
+    response: Response,
+    status: str = None,
+    category: str = None,
+    respondent_id: str = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
     """
-    Get all cases with optional filtering
-    """
-    cases_data = get_mock_cases()
-
-    # Convert to Case objects
-    cases = [Case(**case_data) for case_data in cases_data]
-
-    # Apply filters
-    if status:
-        cases = [c for c in cases if c.status == status]
+    Get cases with optional filtering, newest first
 
-    if category:
-        cases = [c for c in cases if c.category == category]
+    Paginated: pass the X-Next-Cursor response header back as cursor for the
+    next page (no header on the last page).
+    """
+    limit = max(1, min(limit or Config.CASE_PAGE_SIZE, 1000))
+    cases_data, next_cursor = await run_in_threadpool(
+        case_store.list_cases, status, category, respondent_id, limit, cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
-    return cases
+    return [Case(**case_data) for case_data in cases_data]
 
 
 @router.get("/stats", response_model=DashboardStats)
@@ -40,7 +49,7 @@ async def get_case_stats():
     """
     Get dashboard statistics
     """
-    stats = get_dashboard_stats()
+    stats = await run_in_threadpool(case_store.dashboard_stats)
     return DashboardStats(**stats)
 
 
@@ -49,13 +58,26 @@ async def get_case(case_id: str):
     """
     Get a specific case by ID
     """
-    cases_data = get_mock_cases()
+    case_data = await run_in_threadpool(case_store.get_case, case_id)
+
+    if not case_data:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    return Case(**case_data)
+
+
+@router.get("/{case_id}/timeline", response_model=CaseTimeline)
+async def get_case_timeline(case_id: str):
+    """
+    The case's incident and evidence dates as sorted intervals, with overlaps
+    and contradictions flagged (cached per case revision)
+    """
+    case_data = await run_in_threadpool(case_store.get_case, case_id)
 
-    for case_data in cases_data:
-        if case_data["id"] == case_id or case_data["case_number"] == case_id:
-            return Case(**case_data)
+    if not case_data:
+        raise HTTPException(status_code=404, detail="Case not found")
 
-    raise HTTPException(status_code=404, detail="Case not found")
+    return await run_in_threadpool(timeline.case_timeline, case_data)
 
 
 @router.post("/intake", response_model=SuccessResponse)
@@ -64,32 +86,62 @@ async def submit_complaint(complaint: ComplaintIntake):
     Submit a new complaint
     """
 
-    # Generate case ID and number
-    case_id = f"case_{uuid.uuid4().hex[:8]}"
-    case_number = f"NW-2025-TIX-{uuid.uuid4().hex[:4].upper()}"
+    case_data = case_store.case_from_intake(complaint)
+    await run_in_threadpool(case_store.insert_case, case_data)
 
-    # In real app, would save to database
-    # For demo, just return success
+    # Pre-compute the Title IX analysis before an investigator opens the case
+    await run_in_threadpool(precompute_title_ix, case_data)
 
     return SuccessResponse(
         success=True,
         message="Complaint submitted successfully",
         data={
-            "case_id": case_id,
-            "case_number": case_number,
-            "filed_date": datetime.now().isoformat()
+            "case_id": case_data["id"],
+            "case_number": case_data["case_number"],
+            "filed_date": case_data["filed_date"]
         }
     )
 
 
+@router.post("/import", response_model=ImportReport, dependencies=[Depends(require_administrator)])
+async def import_cases(request: Request, format: Optional[str] = None, batch_size: int = 1000):
+    """
+    Bulk import cases from an NDJSON or CSV request body (admin only)
+
+    The body is streamed: rows are validated and inserted batch_size at a
+    time, and rejected rows are listed in the report instead of failing the
+    import. Format comes from ?format= or the Content-Type (text/csv).
+    """
+    fmt = format or importer.detect_format(content_type=request.headers.get("content-type"))
+    if fmt not in importer.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported import format '{fmt}'")
+
+    body = request.stream().__aiter__()
+
+    async def next_chunk() -> Optional[bytes]:
+        try:
+            return await body.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def chunks():
+        # Runs in the import thread, pulling the body from the event loop as rows are needed
+        while (chunk := from_thread.run(next_chunk)) is not None:
+            yield chunk
+
+    return await run_in_threadpool(importer.import_stream, chunks(), fmt, max(1, min(batch_size, 50000)))
+
+
 @router.patch("/{case_id}/status")
-async def update_case_status(case_id: str, status: str):
+async def update_case_status(case_id: str, status: CaseStatus):
     """
     Update case status
     """
-    # In real app, would update database
+    if not await run_in_threadpool(case_store.update_case_status, case_id, status.value):
+        raise HTTPException(status_code=404, detail="Case not found")
+
     return SuccessResponse(
         success=True,
-        message=f"Case {case_id} status updated to {status}",
-        data={"case_id": case_id, "new_status": status}
+        message=f"Case {case_id} status updated to {status.value}",
+        data={"case_id": case_id, "new_status": status.value}
     )
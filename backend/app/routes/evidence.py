@@ -9,7 +9,9 @@ from datetime import datetime
 import base64
 
 from app.models.schemas import Evidence, EvidenceUpload, SuccessResponse
-from app.data.mock_data import get_mock_evidence
+from app.profiling import run_in_threadpool
+from app.data import case_store
+from app.precompute import on_evidence_added
 
 router = APIRouter(prefix="/api/evidence", tags=["Evidence"])
 
@@ -19,15 +21,7 @@ async def get_case_evidence(case_id: str):
     """
     Get all evidence for a specific case
     """
-    evidence_data = get_mock_evidence()
-
-    # Filter by case
-    case_evidence = [
-        Evidence(**evd) for evd in evidence_data
-        if evd["case_id"] == case_id
-    ]
-
-    return case_evidence
+    return [Evidence(**evd) for evd in await run_in_threadpool(case_store.list_evidence, case_id)]
 
 
 @router.get("/{evidence_id}", response_model=Evidence)
@@ -35,13 +29,12 @@ async def get_evidence(evidence_id: str):
     """
     Get specific evidence item
     """
-    evidence_data = get_mock_evidence()
+    evd = await run_in_threadpool(case_store.get_evidence, evidence_id)
 
-    for evd in evidence_data:
-        if evd["id"] == evidence_id:
-            return Evidence(**evd)
+    if not evd:
+        raise HTTPException(status_code=404, detail="Evidence not found")
 
-    raise HTTPException(status_code=404, detail="Evidence not found")
+    return Evidence(**evd)
 
 
 @router.post("/upload", response_model=SuccessResponse)
@@ -50,27 +43,44 @@ async def upload_evidence(case_id: str, upload: EvidenceUpload):
     Upload new evidence (base64 encoded)
     """
 
+    case = await run_in_threadpool(case_store.get_case, case_id)
+    if not case:
+        raise HTTPException(status_code=404, detail="Case not found")
+
     # Generate evidence ID
     evidence_id = f"evd_{uuid.uuid4().hex[:8]}"
 
     # Calculate hash of file data
     file_hash = hashlib.sha256(upload.file_data.encode()).hexdigest()
 
-    # In real app, would save to storage and database
-    # For demo, just return success
+    now = datetime.now()
+    await run_in_threadpool(case_store.add_evidence, {
+        "id": evidence_id,
+        "case_id": case["id"],
+        "file_name": upload.file_name,
+        "file_type": upload.file_type,
+        "file_data": upload.file_data,
+        "uploaded_by": "complainant",
+        "uploaded_at": now,
+        "hash": file_hash,
+        "description": upload.description
+    })
 
     evidence = Evidence(
         id=evidence_id,
-        case_id=case_id,
+        case_id=case["id"],
         file_name=upload.file_name,
         file_type=upload.file_type,
         file_data=upload.file_data[:100] + "...",  # Truncate for response
         uploaded_by="complainant",
-        uploaded_at=datetime.now(),
+        uploaded_at=now,
         hash=file_hash,
         description=upload.description
     )
 
+    # New evidence makes earlier pre-analyses stale; queue a fresh one
+    await run_in_threadpool(on_evidence_added, case["id"])
+
     return SuccessResponse(
         success=True,
         message="Evidence uploaded successfully",
@@ -0,0 +1,41 @@
+"""
+Export routes (administrators only)
+Stream cases, evidence metadata and consensus history as CSV, NDJSON or Parquet
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from app.data import exporter
+from app.models.schemas import CaseStatus
+from app.routes.auth import require_administrator
+
+router = APIRouter(prefix="/api/export", tags=["Export"], dependencies=[Depends(require_administrator)])
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = "csv",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    status: Optional[CaseStatus] = None
+):
+    """
+    Stream a dataset (cases, evidence or analyses) as a download
+
+    since (inclusive) and until (exclusive) filter on the filing, upload or
+    analysis date; status filters on the case's status.
+    """
+    try:
+        chunks = exporter.export(dataset, format, since, until, status.value if status else None)
+    except exporter.ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    file_name = f"{dataset}-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
@@ -0,0 +1,44 @@
+"""
+Analysis history routes
+Prior council deliberations for a case, served from the history store
+"""
+from fastapi import APIRouter
+from typing import List, Optional
+
+from app import analytics
+from app.profiling import run_in_threadpool
+from app.data import analysis_history
+from app.models.schemas import AnalysisRecord, WhatIfReport, WhatIfRules
+
+router = APIRouter(prefix="/api/ai/history", tags=["AI Analysis History"])
+
+
+@router.post("/what-if", response_model=WhatIfReport)
+async def what_if(rules: WhatIfRules):
+    """
+    Re-score every stored analysis under alternative weights and thresholds
+
+    No LLM calls: the recorded agent votes are re-counted, and the report
+    shows how many decisions would flip.
+    """
+    return await run_in_threadpool(analytics.what_if, rules)
+
+
+@router.get("/{case_id}", response_model=List[AnalysisRecord])
+async def get_case_history(case_id: str, question: Optional[str] = None, limit: int = 50, before: Optional[str] = None):
+    """
+    A case's analyses, newest first
+
+    Page back by passing the last result's analyzed_at as before.
+    """
+    records = await run_in_threadpool(analysis_history.case_history, case_id, question, max(1, min(limit, 500)), before)
+    return [AnalysisRecord(**record) for record in records]
+
+
+@router.get("/{case_id}/latest", response_model=List[AnalysisRecord])
+async def get_latest_analyses(case_id: str):
+    """
+    The most recent analysis of each question asked about a case
+    """
+    records = await run_in_threadpool(analysis_history.latest_per_question, case_id)
+    return [AnalysisRecord(**record) for record in records]
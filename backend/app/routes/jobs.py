@@ -0,0 +1,69 @@
+"""
+Asynchronous analysis job routes
+Enqueue a consensus analysis, then poll for it or receive a callback
+"""
+from fastapi import APIRouter, HTTPException
+from typing import List
+
+from app import job_queue
+from app.data import case_store
+from app.models.schemas import AnalysisJob, AnalysisJobRequest
+from app.profiling import run_in_threadpool
+from app.scheduler import priority_for_case
+
+router = APIRouter(prefix="/api/ai/jobs", tags=["AI Analysis Jobs"])
+
+
+@router.post("", response_model=AnalysisJob, status_code=202)
+async def create_analysis_job(request: AnalysisJobRequest):
+    """
+    Queue a multi-agent consensus analysis
+
+    Returns immediately with the job id; a worker process (python -m app.worker)
+    runs the analysis. Poll GET /api/ai/jobs/{job_id} or pass callback_url.
+    """
+    case_data = await run_in_threadpool(case_store.get_case, request.case_id)
+    if not case_data:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    job = await run_in_threadpool(
+        job_queue.enqueue_job,
+        case_data,
+        request.question,
+        request.priority or priority_for_case(case_data),
+        strategy=request.strategy.value if request.strategy else None,
+        callback_url=request.callback_url
+    )
+    return AnalysisJob(**job)
+
+
+@router.get("/case/{case_id}", response_model=List[AnalysisJob])
+async def list_case_jobs(case_id: str, limit: int = 20):
+    """
+    Most recent analysis jobs for a case
+    """
+    return [AnalysisJob(**job) for job in await run_in_threadpool(job_queue.list_case_jobs, case_id, limit)]
+
+
+@router.get("/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(job_id: str):
+    """
+    Job status, with the ConsensusResult once completed
+    """
+    job = await run_in_threadpool(job_queue.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return AnalysisJob(**job)
+
+
+@router.delete("/{job_id}", response_model=AnalysisJob)
+async def cancel_analysis_job(job_id: str):
+    """
+    Cancel a queued job, or stop a running one (its in-flight agent calls are aborted)
+    """
+    if not await run_in_threadpool(job_queue.cancel_job, job_id):
+        job = await run_in_threadpool(job_queue.get_job, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail=f"Job is already {job['status']}")
+    return AnalysisJob(**await run_in_threadpool(job_queue.get_job, job_id))
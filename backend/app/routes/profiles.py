@@ -0,0 +1,58 @@
+"""
+Profiler routes (administrators only)
+List and download profiles of slow or X-Debug-Profile requests
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import List, Dict, Any
+
+from app import profiling
+from app.models.schemas import ProfilerSettings, SuccessResponse
+from app.routes.auth import require_administrator
+
+router = APIRouter(
+    prefix="/api/admin/profiles", tags=["Profiling"], dependencies=[Depends(require_administrator)]
+)
+
+
+@router.get("", response_model=List[Dict[str, Any]])
+async def list_profiles():
+    """Captured profiles in the ring buffer, newest first"""
+    return profiling.list_profiles()
+
+
+@router.get("/settings", response_model=ProfilerSettings)
+async def get_profiler_settings():
+    """Current slow-request threshold"""
+    return ProfilerSettings(**profiling.settings)
+
+
+@router.put("/settings", response_model=ProfilerSettings)
+async def update_profiler_settings(settings: ProfilerSettings):
+    """Change the slow-request threshold without a restart (this process only)"""
+    profiling.settings["slow_request_ms"] = settings.slow_request_ms
+    return settings
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(profile_id: str):
+    """
+    Folded stacks ("frame;frame;frame count" per line)
+
+    Render with flamegraph.pl, or drop the file into https://www.speedscope.app
+    """
+    profile = profiling.get_profile(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have been evicted)")
+
+    return PlainTextResponse(
+        profile.folded(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
+
+
+@router.delete("", response_model=SuccessResponse)
+async def clear_profiles():
+    """Empty the ring buffer"""
+    count = profiling.clear_profiles()
+    return SuccessResponse(success=True, message=f"Deleted {count} profiles")
@@ -0,0 +1,51 @@
+"""
+Full-text search routes
+Ranked search over case and evidence text, served from the case store's FTS5 indexes
+"""
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.data import case_store
+from app.profiling import run_in_threadpool
+from app.models.schemas import CaseSearchHit, EvidenceSearchHit, SearchResults
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+SEARCH_TYPES = ("all", "cases", "evidence")
+
+
+@router.get("", response_model=SearchResults)
+@router.get("/", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1),
+    type: str = "all",
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    case_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """
+    Search case descriptions, locations and case numbers, and evidence names,
+    descriptions and extracted data
+
+    Best matches first (BM25). All words must match, the last one as a prefix;
+    "quoted words" match as a phrase. status and category filter cases;
+    status and case_id filter evidence.
+    """
+    if type not in SEARCH_TYPES:
+        raise HTTPException(status_code=400, detail=f"type must be one of {', '.join(SEARCH_TYPES)}")
+    started = time.perf_counter()
+    limit, offset = max(1, min(limit, 100)), max(0, offset)
+
+    results = SearchResults(query=q, took_ms=0.0)
+    if type in ("all", "cases"):
+        hits = await run_in_threadpool(case_store.search_cases, q, status, category, limit, offset)
+        results.cases = [CaseSearchHit(**hit) for hit in hits]
+    if type in ("all", "evidence"):
+        hits = await run_in_threadpool(case_store.search_evidence, q, case_id, status, limit, offset)
+        results.evidence = [EvidenceSearchHit(**hit) for hit in hits]
+    results.took_ms = round((time.perf_counter() - started) * 1000, 2)
+    return results
@@ -0,0 +1,229 @@
+"""
+Priority scheduler for LLM work
+Orders agent calls from all concurrent analyses by case urgency
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, Future, wait
+from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, List, Optional
+
+from app import profiling
+from app.cancellation import CancellationToken
+from app.config import Config
+from app.models.schemas import AnalysisPriority, CaseStatus, Priority
+
+# Priority key of the agent call a scheduler worker is running (see priority_key)
+_current_priority_key: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "llm_priority_key", default=None
+)
+
+# Most to least urgent
+PRIORITY_ORDER = [
+    AnalysisPriority.CRISIS,
+    AnalysisPriority.URGENT,
+    AnalysisPriority.INTERACTIVE,
+    AnalysisPriority.BATCH,
+    AnalysisPriority.BACKGROUND,
+]
+
+
+class _WorkItem:
+    __slots__ = ("fn", "args", "future", "priority", "enqueued", "context")
+
+    def __init__(self, fn: Callable, args: tuple, priority: AnalysisPriority):
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        # Runs in the submitter's context, so its trace span is the parent and
+        # its samples go to the submitter's profiled request
+        self.context = contextvars.copy_context()
+
+
+class _ClassStats:
+    __slots__ = ("submitted", "started", "completed", "in_flight", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class LLMScheduler:
+    """
+    Shared worker pool that runs LLM calls in priority order
+
+    Each priority class has its own FIFO queue. Workers take the head whose
+    class rank, minus one rank per `aging_seconds` already waited, is lowest -
+    so urgent work jumps ahead of batch work, but batch work that has waited
+    long enough is eventually served even under a steady urgent load.
+    """
+
+    def __init__(self, workers: int, aging_seconds: float):
+        self.workers = max(1, workers)
+        self.aging_seconds = max(0.001, aging_seconds)
+        self._queues = {priority: deque() for priority in PRIORITY_ORDER}
+        self._stats = {priority: _ClassStats() for priority in PRIORITY_ORDER}
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def submit(self, fn: Callable, *args, priority: AnalysisPriority = AnalysisPriority.INTERACTIVE) -> Future:
+        """Queue fn(*args) and return a Future for its result"""
+        priority = AnalysisPriority(priority)
+        item = _WorkItem(fn, args, priority)
+
+        with self._cond:
+            self._ensure_workers()
+            self._queues[priority].append(item)
+            self._stats[priority].submitted += 1
+            self._cond.notify()
+
+        return item.future
+
+    def _ensure_workers(self) -> None:
+        """Start worker threads on first use (caller holds the lock)"""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f"llm-scheduler-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        """Pop the most deserving queue head (caller holds the lock)"""
+        now = time.monotonic()
+        best_priority = None
+        best_score = None
+
+        for rank, priority in enumerate(PRIORITY_ORDER):
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            score = rank - (now - queue[0].enqueued) / self.aging_seconds
+            if best_score is None or score < best_score:
+                best_priority, best_score = priority, score
+
+        if best_priority is None:
+            return None
+        return self._queues[best_priority].popleft()
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                item = self._next_item()
+                while item is None:
+                    self._cond.wait()
+                    item = self._next_item()
+
+                stats = self._stats[item.priority]
+                wait = time.monotonic() - item.enqueued
+                stats.started += 1
+                stats.in_flight += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+
+            try:
+                if item.future.set_running_or_notify_cancel():
+                    try:
+                        item.context.run(_current_priority_key.set, self.priority_key(item.priority, item.enqueued))
+                        item.future.set_result(item.context.run(_run_attached, item.fn, item.args))
+                    except BaseException as e:
+                        item.future.set_exception(e)
+            finally:
+                with self._cond:
+                    stats.in_flight -= 1
+                    stats.completed += 1
+
+    def priority_key(self, priority: AnalysisPriority, enqueued: float) -> float:
+        """
+        Static sort key equivalent to the aged score used by _next_item: lower
+        runs first. The provider limiters order their waiters by it, so a call
+        the scheduler has dispatched keeps its place ahead of less urgent calls
+        already waiting for a backend slot.
+        """
+        return PRIORITY_ORDER.index(priority) + enqueued / self.aging_seconds
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait times per priority class"""
+        with self._cond:
+            return {
+                priority.value: {
+                    "queued": len(self._queues[priority]),
+                    "in_flight": stats.in_flight,
+                    "submitted": stats.submitted,
+                    "completed": stats.completed,
+                    "avg_wait_ms": round(1000 * stats.total_wait / stats.started, 1) if stats.started else 0.0,
+                    "max_wait_ms": round(1000 * stats.max_wait, 1),
+                }
+                for priority, stats in self._stats.items()
+            }
+
+
+def _run_attached(fn: Callable, args: tuple) -> Any:
+    """Run a work item with its samples attributed to the profiled request that submitted it"""
+    with profiling.attach_thread():
+        return fn(*args)
+
+
+scheduler = LLMScheduler(Config.SCHEDULER_WORKERS, Config.SCHEDULER_AGING_SECONDS)
+
+
+def current_priority_key() -> float:
+    """Priority key of the running agent call; calls made outside the scheduler count as interactive, from now"""
+    key = _current_priority_key.get()
+    if key is None:
+        key = scheduler.priority_key(AnalysisPriority.INTERACTIVE, time.monotonic())
+    return key
+
+
+def wait_for_all(futures: List[Future], cancel: CancellationToken) -> List[Any]:
+    """
+    Results of futures in order, stopping early if the analysis is cancelled
+
+    On cancellation or the first failure, work that has not started yet is
+    withdrawn from the queue; running calls stop through their own token.
+    """
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = cancel.remaining()
+            done, pending = wait(
+                pending, timeout=0.25 if remaining is None else min(0.25, remaining), return_when=FIRST_EXCEPTION
+            )
+            cancel.raise_if_cancelled()
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return [future.result() for future in futures]
+
+
+def priority_for_case(case_data: Dict[str, Any]) -> AnalysisPriority:
+    """Default scheduling priority from the case's crisis flag, priority and deadline"""
+    if case_data.get("is_crisis"):
+        return AnalysisPriority.CRISIS
+
+    if case_data.get("priority") == Priority.URGENT:
+        return AnalysisPriority.URGENT
+
+    deadline = case_data.get("deadline_date")
+    if deadline and case_data.get("status") != CaseStatus.CLOSED:
+        if isinstance(deadline, str):
+            try:
+                deadline = datetime.fromisoformat(deadline)
+            except ValueError:
+                deadline = None
+        if deadline and deadline.replace(tzinfo=None) - datetime.now() <= timedelta(days=Config.DEADLINE_URGENT_DAYS):
+            return AnalysisPriority.URGENT
+
+    return AnalysisPriority.INTERACTIVE
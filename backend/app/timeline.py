@@ -0,0 +1,341 @@
+"""
+Case timelines
+Merges the case's incident date and the dates extracted from its evidence
+(ai_extracted_data: date, date_range, timeline_position) into one sorted list
+of intervals, and flags overlaps and contradictions in code, so Holmes gets
+the timeline as facts instead of re-deriving it from free text
+
+Timelines are cached per case revision (evidence uploads bump the revision),
+so a case is only re-read when it has changed.
+"""
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from itertools import combinations
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+from app import job_queue
+from app.config import Config
+from app.data import case_store
+from app.models.schemas import CaseTimeline, TimelineEvent, TimelineFlag
+
+EVIDENCE_DATE_FIELDS = ("date", "date_range", "timeline_position")
+DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+RANGE_SEPARATOR = re.compile(r"\s+(?:to|until|through|-)\s+|\s*[–—]\s*", re.IGNORECASE)
+TEXT_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%m/%d/%Y")
+MAX_OVERLAPS = 200  # Flagged per timeline; evidence piling up on one day isn't worth listing pairwise
+MAX_PROMPT_EVENTS = 15
+MAX_PROMPT_OVERLAPS = 5
+# Dates written in free text (evidence summaries); a sentence is left to the timeline only when it has all of them
+MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+DATE_MENTION = re.compile(
+    r"\b(?P<iso>\d{4}-\d{2}-\d{2})\b|\b(?P<numeric>\d{1,2}/\d{1,2}/\d{2,4})\b"
+    r"|\b(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?\b"
+    r"(?:,?\s+(?P<year>\d{4})\b)?",
+    re.IGNORECASE
+)
+SENTENCE_END = re.compile(r"(?<=[.;!?])\s+|\n+")
+
+
+# Parsing
+def _parse(value: Any) -> Optional[Tuple[datetime, datetime, str]]:
+    """(start, end, precision) of one date or timestamp; a bare date spans its whole day"""
+    if isinstance(value, datetime):
+        moment = value.replace(tzinfo=None)
+        return moment, moment, "time"
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    text = value.strip()
+    day = None
+    if DATE_ONLY.match(text):
+        day = datetime.fromisoformat(text)
+    else:
+        try:
+            moment = datetime.fromisoformat(text.replace("Z", "+00:00")).replace(tzinfo=None)
+            if moment.time() == time(0) and "T00:00:00" in text:
+                day = moment  # Date-only values stored as midnight
+            else:
+                return moment, moment, "time"
+        except ValueError:
+            for fmt in TEXT_DATE_FORMATS:
+                try:
+                    day = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+    if day is None:
+        return None
+    return day, day + timedelta(days=1) - timedelta(microseconds=1), "day"
+
+
+def _interval(value: Any) -> Optional[Tuple[datetime, datetime, str, bool]]:
+    """(start, end, precision, reversed) of a date or a date range ("A to B", [A, B], {start, end})"""
+    if isinstance(value, dict):
+        value = [value.get("start"), value.get("end")]
+    elif isinstance(value, str):
+        parts = RANGE_SEPARATOR.split(value.strip(), maxsplit=1)
+        if len(parts) == 2:
+            value = parts
+
+    if isinstance(value, (list, tuple)):
+        if len(value) != 2:
+            return None
+        first, last = _parse(value[0]), _parse(value[1])
+        if first is None or last is None:
+            return None
+        reversed_range = last[1] < first[0]
+        if reversed_range:
+            first, last = last, first
+        precision = "time" if first[2] == last[2] == "time" else "day"
+        return first[0], last[1], precision, reversed_range
+
+    parsed = _parse(value)
+    return (*parsed, False) if parsed else None
+
+
+def _mentioned_day(match: re.Match) -> Optional[Tuple[Optional[int], int, int]]:
+    """(year or None, month, day) of a DATE_MENTION match, None when it isn't a real date"""
+    try:
+        if match.group("iso"):
+            day = datetime.strptime(match.group("iso"), "%Y-%m-%d")
+            return day.year, day.month, day.day
+        if match.group("numeric"):
+            month, day, year = (int(part) for part in match.group("numeric").split("/"))
+            year += 2000 if year < 100 else 0
+        else:
+            month = MONTHS.index(match.group("month")[:3].lower()) + 1
+            day = int(match.group("day"))
+            year = int(match.group("year")) if match.group("year") else None
+        datetime(year or 2000, month, day)  # 2000 is a leap year, so Feb 29 passes without a year
+        return year, month, day
+    except ValueError:
+        return None
+
+
+def _on_timeline(sentence: str, events: List[TimelineEvent]) -> bool:
+    """Whether the sentence states dates and every one of them falls on a timeline event"""
+    mentions = [_mentioned_day(match) for match in DATE_MENTION.finditer(sentence)]
+    if not mentions or None in mentions:
+        return False
+
+    def covered(year: Optional[int], month: int, day: int) -> bool:
+        for event in events:
+            for candidate in ([year] if year else range(event.start.year, event.end.year + 1)):
+                try:
+                    date = datetime(candidate, month, day).date()
+                except ValueError:
+                    continue
+                if event.start.date() <= date <= event.end.date():
+                    return True
+        return False
+
+    return all(covered(*mention) for mention in mentions)
+
+
+def _overlap(a: TimelineEvent, b: TimelineEvent) -> bool:
+    return a.start <= b.end and b.start <= a.end
+
+
+def _when(event: TimelineEvent) -> str:
+    fmt = "%Y-%m-%d %H:%M" if event.precision == "time" else "%Y-%m-%d"
+    start, end = event.start.strftime(fmt), event.end.strftime(fmt)
+    return start if start == end else f"{start} to {end}"
+
+
+# Building
+def build_timeline(
+    case: Dict[str, Any],
+    evidence: List[Dict[str, Any]],
+    revision: Optional[int] = None
+) -> CaseTimeline:
+    """Timeline of a case and its evidence items (as stored: ai_extracted_data dicts)"""
+    events: List[TimelineEvent] = []
+    reversed_ranges = set()
+    uploaded: Dict[str, Optional[datetime]] = {}
+    unparsed: List[str] = []
+
+    incident = _parse(case.get("incident_date"))
+    if incident:
+        events.append(TimelineEvent(source="incident", label="Incident", field="incident_date",
+                                    start=incident[0], end=incident[1], precision=incident[2]))
+    elif case.get("incident_date"):
+        unparsed.append(f"incident_date: {case['incident_date']}")
+
+    for item in evidence:
+        data = item.get("ai_extracted_data")
+        if not isinstance(data, dict):
+            continue
+        upload = _parse(item.get("uploaded_at"))
+        uploaded[item["id"]] = upload[1] if upload else None
+        for field in EVIDENCE_DATE_FIELDS:
+            value = data.get(field)
+            if value in (None, ""):
+                continue
+            parsed = _interval(value)
+            if parsed is None:
+                unparsed.append(f"{item['id']}.{field}: {value}")
+                continue
+            start, end, precision, reversed_range = parsed
+            events.append(TimelineEvent(source=item["id"], label=item.get("file_name") or item["id"], field=field,
+                                        start=start, end=end, precision=precision))
+            if reversed_range:
+                reversed_ranges.add((item["id"], field))
+
+    events.sort(key=lambda event: (event.start, event.end))
+    timeline = CaseTimeline(case_id=case.get("id") or "", revision=revision, events=events,
+                            unparsed=unparsed, built_at=datetime.now())
+    timeline.overlaps = _overlaps(events)
+    timeline.contradictions = _contradictions(case, events, reversed_ranges, uploaded)
+    return timeline
+
+
+def _overlaps(events: List[TimelineEvent]) -> List[TimelineFlag]:
+    """Events from different sources whose intervals intersect (sweep over the start-sorted events)"""
+    flags: List[TimelineFlag] = []
+    active: List[int] = []
+    for i, event in enumerate(events):
+        active = [j for j in active if events[j].end >= event.start]
+        for j in active:
+            if events[j].source != event.source:
+                flags.append(TimelineFlag(
+                    kind="overlap", events=[j, i],
+                    detail=f"{events[j].label} ({events[j].field}) and {event.label} ({event.field})"
+                ))
+                if len(flags) >= MAX_OVERLAPS:
+                    return flags
+        active.append(i)
+    return flags
+
+
+def _contradictions(
+    case: Dict[str, Any],
+    events: List[TimelineEvent],
+    reversed_ranges: set,
+    uploaded: Dict[str, Optional[datetime]]
+) -> List[TimelineFlag]:
+    flags: List[TimelineFlag] = []
+    by_source: Dict[str, List[int]] = {}
+    for i, event in enumerate(events):
+        by_source.setdefault(event.source, []).append(i)
+
+    for i, event in enumerate(events):
+        if (event.source, event.field) in reversed_ranges:
+            flags.append(TimelineFlag(kind="reversed_range", events=[i],
+                                      detail=f"{event.label}: {event.field} ends before it starts"))
+        upload = uploaded.get(event.source)
+        if upload and event.start > upload:
+            flags.append(TimelineFlag(kind="after_upload", events=[i],
+                                      detail=f"{event.label}: {event.field} {_when(event)} is after its upload"))
+
+    # Dates one evidence item gives for itself must agree
+    for source, indexes in by_source.items():
+        if source == "incident":
+            continue
+        for a, b in combinations(indexes, 2):
+            if not _overlap(events[a], events[b]):
+                flags.append(TimelineFlag(
+                    kind="inconsistent_dates", events=[a, b],
+                    detail=f"{events[a].label}: {events[a].field} {_when(events[a])} vs "
+                           f"{events[b].field} {_when(events[b])}"
+                ))
+
+    filed = _parse(case.get("filed_date"))
+    for i in by_source.get("incident", []):
+        if filed and events[i].start > filed[1]:
+            flags.append(TimelineFlag(kind="incident_after_filing", events=[i],
+                                      detail=f"Incident {_when(events[i])} is after the case was filed"))
+    return flags
+
+
+# Cache
+_cache: "OrderedDict[Tuple[str, int], CaseTimeline]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _revision(case_id: str) -> Optional[int]:
+    try:
+        return job_queue.get_case_revision(case_id)
+    except Exception as e:
+        print(f"Could not read the revision of case {case_id}: {e}")
+        return None
+
+
+def case_timeline(case: Dict[str, Any]) -> CaseTimeline:
+    """The case's timeline at its current revision, built on first use"""
+    case_id = case["id"]
+    revision = _revision(case_id)
+    key = (case_id, revision)
+    if revision is not None:
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+
+    timeline = build_timeline(case, case_store.list_evidence_metadata(case_id), revision)
+    if revision is not None:
+        with _cache_lock:
+            _cache[key] = timeline
+            while len(_cache) > Config.TIMELINE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return timeline
+
+
+class PromptTimeline(NamedTuple):
+    """Timeline and evidence text for an agent prompt"""
+    timeline: str
+    evidence: str
+    incident_on_timeline: bool  # The Incident Date line would only repeat the timeline
+
+
+def prompt_sections(case_data: Dict[str, Any]) -> PromptTimeline:
+    """
+    The compact timeline, and the evidence summary without the sentences
+    whose dates are all on the timeline - the agent reads those dates once,
+    already placed and checked. Sentences with any date the timeline lacks
+    are kept whole.
+    """
+    summary = case_data.get("evidence_summary") or "No evidence details provided"
+    try:
+        if case_data.get("id"):
+            timeline = case_timeline(case_data)
+        else:
+            timeline = build_timeline(case_data, [])
+    except Exception as e:
+        print(f"Timeline of case {case_data.get('id')} unavailable: {e}")
+        return PromptTimeline("Not available", summary, False)
+    if not timeline.events:
+        return PromptTimeline("No dated events", summary, False)
+
+    sentences = [sentence for sentence in SENTENCE_END.split(summary.strip()) if sentence]
+    kept = [sentence for sentence in sentences if not _on_timeline(sentence, timeline.events)]
+    if len(kept) < len(sentences):
+        summary = " ".join(kept) or "Dated details are listed on the timeline"
+    incident = any(event.source == "incident" for event in timeline.events)
+    return PromptTimeline(_render(timeline), summary, incident)
+
+
+def _render(timeline: CaseTimeline) -> str:
+    """Compact timeline: events in order, then what overlaps or conflicts"""
+    # An item's whole-day date adds nothing next to its own timestamp within that day
+    events = [
+        event for event in timeline.events
+        if not (event.precision == "day" and any(
+            other is not event and other.source == event.source and other.precision == "time"
+            and event.start <= other.start and other.end <= event.end
+            for other in timeline.events
+        ))
+    ]
+    lines = [f"- {_when(event)}: {event.label} ({event.field})" for event in events[:MAX_PROMPT_EVENTS]]
+    if len(events) > MAX_PROMPT_EVENTS:
+        lines.append(f"- ... {len(events) - MAX_PROMPT_EVENTS} later events")
+    if timeline.overlaps:
+        shown = "; ".join(flag.detail for flag in timeline.overlaps[:MAX_PROMPT_OVERLAPS])
+        more = len(timeline.overlaps) - MAX_PROMPT_OVERLAPS
+        lines.append(f"Overlapping: {shown}" + (f" (+{more} more)" if more > 0 else ""))
+    for flag in timeline.contradictions:
+        lines.append(f"CONTRADICTION ({flag.kind}): {flag.detail}")
+    if timeline.unparsed:
+        lines.append(f"Unreadable dates: {'; '.join(timeline.unparsed)}")
+    return "\n".join(lines)
@@ -0,0 +1,219 @@
+"""
+Request and deliberation tracing
+Spans for API requests, run_consensus and each agent's prompt, generation and
+parsing, so a deliberation can be viewed as a waterfall
+
+TRACING_EXPORTER selects where spans go:
+- "none" (default): spans cost one context-variable lookup
+- "file": one JSON object per finished span, appended to TRACING_FILE_PATH
+- "otlp": OpenTelemetry SDK exporting to a collector at TRACING_OTLP_ENDPOINT
+  (requires opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http)
+
+Span context lives in context variables, which the LLM scheduler copies into
+its worker threads, so agent spans nest under the request that started them.
+"""
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, Optional
+
+from app.config import Config
+
+# Attributes children inherit from their ancestors (an agent's generate span
+# carries the case id and agent name set further up)
+INHERITED_ATTRIBUTES = ("case.id", "agent.name")
+
+
+class Span:
+    """A span recorded by the file exporter (OpenTelemetry field names)"""
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.start_time = time.time_ns()
+        self.end_time: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "service": Config.TRACING_SERVICE_NAME,
+            "start_time_unix_nano": self.start_time,
+            "end_time_unix_nano": self.end_time,
+            "duration_ms": round((self.end_time - self.start_time) / 1e6, 3),
+            "status": "ERROR" if self.error else "OK",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_inherited: ContextVar[Dict[str, Any]] = ContextVar("inherited_span_attributes", default={})
+
+
+class _FileExporter:
+    """Appends finished spans as JSON lines"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        current = Span(name, attributes, _current_span.get())
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            current.end_time = time.time_ns()
+            line = json.dumps(current.to_dict(), default=str)
+            with self._lock:
+                self._file.write(line + "\n")
+
+
+class _OpenTelemetryExporter:
+    """Delegates to the OpenTelemetry SDK (batched OTLP/HTTP export)"""
+
+    def __init__(self, endpoint: str):
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        provider = TracerProvider(resource=Resource.create({"service.name": Config.TRACING_SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        trace.set_tracer_provider(provider)
+        self._tracer = trace.get_tracer("safespace")
+
+    def span(self, name: str, attributes: Dict[str, Any]):
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+_configured = False
+
+
+def _get_exporter():
+    """Exporter for Config.TRACING_EXPORTER, created on first use (None = disabled)"""
+    global _exporter, _configured
+    if _configured:
+        return _exporter
+
+    with _exporter_lock:
+        if not _configured:
+            exporter_name = Config.TRACING_EXPORTER.lower()
+            try:
+                if exporter_name == "file":
+                    _exporter = _FileExporter(Config.TRACING_FILE_PATH)
+                elif exporter_name == "otlp":
+                    _exporter = _OpenTelemetryExporter(Config.TRACING_OTLP_ENDPOINT)
+                elif exporter_name not in ("", "none"):
+                    print(f"Unknown TRACING_EXPORTER '{Config.TRACING_EXPORTER}'. Tracing disabled.")
+            except ImportError as e:
+                print(f"OpenTelemetry not installed ({e}). Tracing disabled.")
+            except Exception as e:
+                print(f"Could not start tracing: {e}. Tracing disabled.")
+            _configured = True
+    return _exporter
+
+
+def is_enabled() -> bool:
+    return _get_exporter() is not None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Record the enclosed block as a span, a child of the current one
+
+    Keyword arguments become attributes (None values are dropped); case_id and
+    agent are recorded as case.id and agent.name and inherited by child spans.
+    Yields an object with set_attribute() and update_name().
+    """
+    exporter = _get_exporter()
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+
+    attributes = {
+        {"case_id": "case.id", "agent": "agent.name"}.get(key, key): value
+        for key, value in attributes.items() if value is not None
+    }
+    inherited = _inherited.get()
+    inherited_token = None
+    if any(key in attributes for key in INHERITED_ATTRIBUTES):
+        inherited_token = _inherited.set({
+            **inherited, **{key: attributes[key] for key in INHERITED_ATTRIBUTES if key in attributes}
+        })
+
+    try:
+        with exporter.span(name, {**inherited, **attributes}) as current:
+            yield current
+    finally:
+        if inherited_token is not None:
+            _inherited.reset(inherited_token)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per HTTP request, named by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                current.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        with span(f"{scope['method']} {scope['path']}", **{
+            "http.method": scope["method"], "http.target": scope["path"]
+        }) as current:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router fills in the matched route and path parameters
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    current.update_name(f"{scope['method']} {route}")
+                    current.set_attribute("http.route", route)
+                current.set_attribute("case.id", scope.get("path_params", {}).get("case_id"))
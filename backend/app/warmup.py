@@ -0,0 +1,167 @@
+"""
+Model warm-up and prompt priming
+Loads the configured models and primes each agent's system prompt, at startup
+and periodically, so analyses never hit a cold model
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import requests
+from fastapi.concurrency import run_in_threadpool
+
+from app.ai_agents.consensus import get_agent_provider
+from app.ai_agents.registry import get_agents
+from app.cancellation import CancellationToken
+from app.config import Config
+from app.llm_provider import LocalLLMProvider
+
+# Tiny completion that makes the server process (and cache) the system prompt
+PRIMING_PROMPT = "Reply with OK."
+
+
+class WarmupState:
+    """Outcome of the most recent warm-up pass"""
+
+    def __init__(self):
+        self.completed = False  # A pass primed every agent - the app may report ready
+        self.last_error: Optional[str] = None  # Why the most recent pass failed (None after a success)
+        self.running = False
+        self.runs = 0
+        self.last_started: Optional[datetime] = None
+        self.last_finished: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+        self.models: List[Dict[str, Any]] = []
+        self.agents: List[Dict[str, Any]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "running": self.running,
+            "runs": self.runs,
+            "last_error": self.last_error,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "last_finished": self.last_finished.isoformat() if self.last_finished else None,
+            "last_duration_ms": self.last_duration_ms,
+            "models": self.models,
+            "agents": self.agents,
+        }
+
+
+state = WarmupState()
+
+
+def check_local_model(llm_provider: LocalLLMProvider) -> Dict[str, Any]:
+    """Ask the local server which models it has and whether ours is among them"""
+    result = {"provider": "local", "model": llm_provider.model, "listed": False, "error": None}
+    try:
+        response = requests.get(f"{llm_provider.base_url}/models", timeout=5)
+        response.raise_for_status()
+        models = [model.get("id") for model in response.json().get("data", [])]
+        # "default" means whatever model the server has loaded
+        result["listed"] = llm_provider.model in models or (llm_provider.model == "default" and bool(models))
+        if not result["listed"]:
+            result["error"] = f"Model not listed by server ({', '.join(models) or 'none'})"
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def prime_agent(agent, llm_provider) -> Dict[str, Any]:
+    """One max_tokens=1 completion with the agent's system prompt"""
+    result = {
+        "agent": agent.name,
+        "provider": agent.provider or Config.get_llm_provider(),
+        "model": getattr(llm_provider, "model", None),
+        "status": "skipped",
+        "error": None
+    }
+
+    # Mock responses are instant, and hosted APIs have nothing to load
+    if not isinstance(llm_provider, LocalLLMProvider):
+        return result
+
+    started = time.monotonic()
+    try:
+        llm_provider.complete(
+            agent.module.SYSTEM_PROMPT,
+            PRIMING_PROMPT,
+            max_tokens=1,
+            cancel=CancellationToken(Config.WARMUP_TIMEOUT_SECONDS)
+        )
+        result["status"] = "primed"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["duration_ms"] = round(1000 * (time.monotonic() - started), 1)
+    return result
+
+
+def warm_up() -> WarmupState:
+    """
+    Run one warm-up pass (blocking)
+
+    Checks each local model is known to the server, then primes every enabled
+    agent's system prompt; the first priming call also makes LM Studio (re)load
+    a model it has unloaded. Only a pass where every model is listed and every
+    agent primed marks the state completed.
+    """
+    state.running = True
+    state.last_started = datetime.now()
+    started = time.monotonic()
+    print("Warming up LLM providers...")
+
+    error = None
+    try:
+        providers = {}
+        agent_providers = [(agent, get_agent_provider(agent, providers)) for agent in get_agents()]
+
+        models = {}
+        for llm_provider in providers.values():
+            if isinstance(llm_provider, LocalLLMProvider) and llm_provider.model not in models:
+                models[llm_provider.model] = check_local_model(llm_provider)
+
+        agents = [prime_agent(agent, llm_provider) for agent, llm_provider in agent_providers]
+
+        state.models = list(models.values())
+        state.agents = agents
+        unlisted = [f"{m['model']}: {m['error']}" for m in models.values() if not m["listed"]]
+        failed = [f"{a['agent']}: {a['error']}" for a in agents if a["status"] == "failed"]
+        if unlisted or failed:
+            error = "; ".join(unlisted + failed)
+    except Exception as e:
+        error = str(e)
+    finally:
+        state.running = False
+        state.runs += 1
+        state.last_error = error
+        state.last_finished = datetime.now()
+        state.last_duration_ms = round(1000 * (time.monotonic() - started), 1)
+
+    if error:
+        print(f"Warm-up failed after {state.last_duration_ms:.0f}ms: {error}")
+    else:
+        state.completed = True
+        print(f"Warm-up finished in {state.last_duration_ms:.0f}ms")
+    return state
+
+
+async def run_warmup_loop() -> None:
+    """
+    Warm up at startup, then every Config.WARMUP_INTERVAL_SECONDS (0 = only at
+    startup) so a model the server unloaded while idle is loaded again. Until
+    a pass succeeds it is retried every Config.WARMUP_RETRY_SECONDS.
+    """
+    if not Config.WARMUP_ENABLED:
+        state.completed = True
+        return
+
+    while True:
+        await run_in_threadpool(warm_up)
+        if state.last_error:
+            await asyncio.sleep(Config.WARMUP_RETRY_SECONDS)
+            continue
+        if Config.WARMUP_INTERVAL_SECONDS <= 0:
+            return
+        await asyncio.sleep(Config.WARMUP_INTERVAL_SECONDS)
@@ -0,0 +1,135 @@
+"""
+Analysis job worker
+Runs queued consensus jobs in a pool of worker processes, outside the web server
+
+Usage:
+    python -m app.worker                # Config.JOB_WORKER_PROCESSES processes
+    python -m app.worker --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Dict, Any
+
+import requests
+
+from app import job_queue
+from app.data import analysis_history
+from app.ai_agents.consensus import run_consensus
+from app.cancellation import AnalysisCancelled, CancellationToken
+from app.config import Config
+from app.models.schemas import AnalysisJob, ConsensusResult, JobStatus
+
+_stopping = threading.Event()
+
+
+def _heartbeat(job_id: str, worker_id: str, done: threading.Event, cancel: CancellationToken) -> None:
+    """Keep the job's lease alive while the analysis runs, and stop it if the job is cancelled"""
+    last_extended = time.monotonic()
+
+    while not done.wait(Config.JOB_POLL_INTERVAL):
+        if job_queue.get_job_status(job_id) == JobStatus.CANCELLED:
+            cancel.cancel("job cancelled")
+            return
+
+        if time.monotonic() - last_extended >= Config.JOB_LEASE_SECONDS / 3:
+            job_queue.extend_lease(job_id, worker_id)
+            last_extended = time.monotonic()
+
+
+def _send_callback(job: Dict[str, Any]) -> None:
+    """POST the finished job to its callback URL (best effort)"""
+    try:
+        requests.post(
+            job["callback_url"],
+            json=AnalysisJob(**job).model_dump(mode="json"),
+            timeout=Config.JOB_CALLBACK_TIMEOUT
+        )
+    except Exception as e:
+        print(f"Callback for {job['id']} to {job['callback_url']} failed: {e}")
+
+
+def run_job(job: Dict[str, Any], worker_id: str) -> None:
+    """Run one claimed job and record its outcome"""
+    print(f"[{worker_id}] Running {job['id']} ({job['priority']}) for case {job['case_id']}...")
+
+    done = threading.Event()
+    cancel = CancellationToken(Config.ANALYSIS_DEADLINE_SECONDS)
+    heartbeat = threading.Thread(target=_heartbeat, args=(job["id"], worker_id, done, cancel), daemon=True)
+    heartbeat.start()
+
+    try:
+        result = run_consensus(job["question"], job["case_data"], job["strategy"], job["priority"], cancel)
+        job_queue.complete_job(job["id"], result.model_dump(mode="json"))
+    except AnalysisCancelled as e:
+        print(f"[{worker_id}] {job['id']} stopped: {e}")
+        job_queue.fail_job(job["id"], f"Analysis cancelled: {e}")
+    except Exception as e:
+        print(f"[{worker_id}] {job['id']} failed: {e}")
+        job_queue.fail_job(job["id"], str(e))
+    finally:
+        done.set()
+
+    finished = job_queue.get_job(job["id"])
+    if finished["status"] == JobStatus.COMPLETED:
+        analysis_history.try_record_analysis(
+            job["case_id"], ConsensusResult(**finished["result"]), "precompute" if job["speculative"] else "job",
+            job_id=job["id"], case_revision=job["case_revision"]
+        )
+    if finished["callback_url"] and finished["status"] != JobStatus.QUEUED:
+        _send_callback(finished)
+
+
+def worker_loop(worker_id: str) -> None:
+    """Claim and run jobs until asked to stop"""
+    signal.signal(signal.SIGTERM, lambda *_: _stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: _stopping.set())
+    print(f"[{worker_id}] Worker started")
+
+    while not _stopping.is_set():
+        requeued = job_queue.requeue_expired_leases()
+        if requeued:
+            print(f"[{worker_id}] Requeued {requeued} job(s) with expired leases")
+
+        job = job_queue.claim_next_job(worker_id)
+        if job is None:
+            _stopping.wait(Config.JOB_POLL_INTERVAL)
+            continue
+
+        run_job(job, worker_id)
+
+    print(f"[{worker_id}] Worker stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run SafeSpace analysis job workers")
+    parser.add_argument("--processes", type=int, default=Config.JOB_WORKER_PROCESSES)
+    args = parser.parse_args()
+
+    host = socket.gethostname()
+    processes = [
+        multiprocessing.Process(target=worker_loop, args=(f"{host}-{os.getpid()}-{i}",), name=f"worker-{i}")
+        for i in range(max(1, args.processes))
+    ]
+    for process in processes:
+        process.start()
+
+    # Forward shutdown to the children; they finish their current job first
+    def stop(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Offline council evaluation
+Runs run_consensus over a labeled case corpus with a worker pool and compares
+configurations (provider, model, strategy) side by side on quality and speed
+
+Corpus: a directory of .jsonl files (or one file), one labeled case per line:
+    {"id": "...", "label": "YES" | "NO", "question": "... (optional)", "case": {case fields}}
+
+Configs are comma-separated key=value pairs: strategy, provider and model, or
+any Config attribute by name (e.g. LLM_REPLAY_LATENCY=1). From backend/:
+    python -m benchmarks.eval_council benchmarks/corpus \\
+        --config "name=fan-out,strategy=fan_out" --config "name=single,strategy=single_call" --workers 4
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.ai_agents.consensus import TITLE_IX_QUESTION, run_consensus
+from app.config import Config, ConsensusStrategy, LLMProvider
+from app.models.schemas import AnalysisPriority, ConsensusResult
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """Labeled cases from a .jsonl file or every .jsonl file in a directory"""
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".jsonl"))
+    else:
+        files = [path]
+
+    cases = []
+    for file_path in files:
+        with open(file_path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if item.get("label") not in ("YES", "NO") or not isinstance(item.get("case"), dict):
+                    raise ValueError(f"{file_path}:{line_number}: needs a YES/NO label and a case object")
+                item.setdefault("id", item["case"].get("id") or f"{os.path.basename(file_path)}:{line_number}")
+                cases.append(item)
+    return cases
+
+
+def parse_config(spec: str) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    """(name, strategy, Config overrides) from "name=x,strategy=y,provider=z,model=m,SETTING=v" """
+    settings = dict(part.split("=", 1) for part in spec.split(",") if part.strip())
+    settings = {key.strip(): value.strip() for key, value in settings.items()}
+    name = settings.pop("name", spec)
+    strategy = settings.pop("strategy", None)
+
+    overrides: Dict[str, Any] = {}
+    provider = settings.pop("provider", None)
+    if provider:
+        overrides["LLM_PROVIDER"] = provider
+    model = settings.pop("model", None)
+    if model:
+        # The model setting of whichever provider serves the run
+        provider = provider or Config.LLM_PROVIDER
+        overrides["ANTHROPIC_MODEL" if provider == LLMProvider.ANTHROPIC else "LOCAL_LLM_MODEL"] = model
+
+    for key, value in settings.items():
+        if not hasattr(Config, key):
+            raise ValueError(f"Unknown setting '{key}' in config '{spec}'")
+        current = getattr(Config, key)
+        if isinstance(current, bool):
+            overrides[key] = value.lower() == "true"
+        elif isinstance(current, (int, float)):
+            overrides[key] = type(current)(value)
+        else:
+            overrides[key] = value
+    return name, strategy, overrides
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+def evaluate(name: str, strategy: Optional[str], overrides: Dict[str, Any], corpus: List[Dict[str, Any]],
+             workers: int) -> Dict[str, Any]:
+    """Run the whole corpus under one config (Config is patched for the duration)"""
+    strategy = ConsensusStrategy(strategy or Config.CONSENSUS_STRATEGY).value
+    saved = {key: getattr(Config, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+
+    def analyze(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[ConsensusResult], Optional[str]]:
+        try:
+            result = run_consensus(
+                item.get("question") or TITLE_IX_QUESTION, item["case"], strategy, AnalysisPriority.BATCH
+            )
+            return item, result, None
+        except Exception as e:
+            return item, None, f"{type(e).__name__}: {e}"
+
+    print(f"[{name}] {len(corpus)} cases, {workers} workers, strategy={strategy}, "
+          f"provider={Config.LLM_PROVIDER}")
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(analyze, corpus))
+        elapsed = time.perf_counter() - started
+    finally:
+        for key, value in saved.items():
+            setattr(Config, key, value)
+
+    return summarize(name, strategy, overrides, outcomes, elapsed)
+
+
+def summarize(name, strategy, overrides, outcomes, elapsed: float) -> Dict[str, Any]:
+    results = [(item, result) for item, result, error in outcomes if result is not None]
+    errors = [{"id": item["id"], "error": error} for item, result, error in outcomes if error]
+    votes = [vote for _, result in results for vote in result.agent_breakdown]
+
+    agent_latencies: Dict[str, List[float]] = {}
+    for vote in votes:
+        if vote.timing and vote.timing.total_ms is not None:
+            agent_latencies.setdefault(vote.agent_name, []).append(vote.timing.total_ms)
+
+    def rate(count: int, total: int) -> Optional[float]:
+        return round(count / total, 3) if total else None
+
+    correct = sum(1 for item, result in results if result.decision == item["label"])
+    return {
+        "name": name,
+        "strategy": strategy,
+        "overrides": overrides,
+        "cases": len(outcomes),
+        "failed": len(errors),
+        "accuracy": rate(correct, len(results)),
+        "uncertain_rate": rate(sum(1 for _, r in results if r.decision == "UNCERTAIN"), len(results)),
+        "disagreement_rate": rate(sum(1 for _, r in results if r.has_disagreement), len(results)),
+        "parse_failure_rate": rate(sum(1 for v in votes if v.error == "Parse failure"), len(votes)),
+        "deadline_abstain_rate": rate(sum(1 for v in votes if v.error == "Deadline exceeded"), len(votes)),
+        "fallback_rate": rate(sum(1 for v in votes if v.timing and v.timing.fallback), len(votes)),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_cases_per_second": round(len(outcomes) / elapsed, 3) if elapsed else None,
+        "case_p50_ms": percentile([r.timing.total_ms for _, r in results if r.timing], 50),
+        "case_p95_ms": percentile([r.timing.total_ms for _, r in results if r.timing], 95),
+        "completion_tokens": sum(r.timing.completion_tokens for _, r in results if r.timing),
+        "agents": {
+            agent: {"p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95)}
+            for agent, latencies in sorted(agent_latencies.items())
+        },
+        "misclassified": [item["id"] for item, result in results if result.decision != item["label"]],
+        "errors": errors,
+    }
+
+
+def print_comparison(reports: List[Dict[str, Any]]) -> None:
+    rows = [
+        "cases", "failed", "accuracy", "uncertain_rate", "disagreement_rate", "parse_failure_rate",
+        "deadline_abstain_rate", "fallback_rate", "elapsed_seconds", "throughput_cases_per_second",
+        "case_p50_ms", "case_p95_ms", "completion_tokens",
+    ]
+    width = max(18, *(len(report["name"]) + 2 for report in reports))
+
+    def line(label, values):
+        print(f"{label:<30}" + "".join(f"{'-' if value is None else value:>{width}}" for value in values))
+
+    print()
+    line("", [report["name"] for report in reports])
+    line("strategy", [report["strategy"] for report in reports])
+    for row in rows:
+        line(row, [report[row] for report in reports])
+
+    agents = sorted({agent for report in reports for agent in report["agents"]})
+    for agent in agents:
+        for stat in ("p50_ms", "p95_ms"):
+            line(f"{agent} {stat}", [report["agents"].get(agent, {}).get(stat) for report in reports])
+
+    for report in reports:
+        if report["misclassified"]:
+            print(f"\n[{report['name']}] misclassified: {', '.join(report['misclassified'])}")
+        for error in report["errors"]:
+            print(f"[{report['name']}] {error['id']} failed: {error['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate council configurations on a labeled case corpus")
+    parser.add_argument("corpus", help="Directory of .jsonl case files, or a single .jsonl file")
+    parser.add_argument("--config", action="append", default=[], metavar="SPEC",
+                        help='e.g. "name=local-fan-out,provider=local,model=gemma-3-4b-it,strategy=fan_out" '
+                             "(repeat to compare; default: the current environment)")
+    parser.add_argument("--workers", type=int, default=4, help="Cases analysed in parallel")
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N cases")
+    parser.add_argument("--json", metavar="PATH", help="Also write the reports as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)[:args.limit]
+    if not corpus:
+        parser.error(f"No labeled cases found in {args.corpus}")
+
+    reports = [
+        evaluate(*parse_config(spec), corpus, args.workers)
+        for spec in (args.config or ["name=current"])
+    ]
+    print_comparison(reports)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReports written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Fake OpenAI-compatible LLM server for benchmarks
+Stands in for LM Studio / Ollama with controllable latency, throughput and errors
+
+Answers POST /v1/chat/completions (streaming and non-streaming) with the mock
+agent responses from MockLLMProvider, so the council parses them exactly as it
+would real output, and GET /v1/models.
+
+Usage (from backend/):
+    python -m benchmarks.fake_llm_server --port 1235 --latency-ms 300 --tokens-per-second 40
+    LOCAL_LLM_URL=http://localhost:1235/v1 uvicorn app.main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.llm_provider import MockLLMProvider
+
+CHARS_PER_TOKEN = 4  # Same estimate as the rate limiter
+
+
+class FakeLLMSettings:
+    """Behaviour of the fake server, from the command line"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.model = args.model
+        self.latency = args.latency_ms / 1000
+        self.latency_distribution = args.latency_distribution
+        self.jitter = args.jitter
+        self.tokens_per_second = args.tokens_per_second
+        self.error_rate = args.error_rate
+        self.error_statuses = args.error_status
+        self.hang_rate = args.hang_rate
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()  # random.Random is not thread-safe
+        self.stats = {"requests": 0, "errors": 0, "hangs": 0, "streamed": 0, "completed": 0, "aborted": 0}
+
+    def first_token_delay(self) -> float:
+        """Time to first token, drawn from the configured distribution"""
+        with self.lock:
+            if self.latency_distribution == "exponential":
+                return self.random.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+            if self.latency_distribution == "lognormal":
+                # Median at --latency-ms, a long right tail as on a busy GPU
+                return self.latency * self.random.lognormvariate(0, max(self.jitter, 0.01))
+            return max(0.0, self.latency * (1 + self.random.uniform(-self.jitter, self.jitter)))
+
+    def token_delay(self) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        with self.lock:
+            return max(0.0, (1 + self.random.uniform(-self.jitter, self.jitter)) / self.tokens_per_second)
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+    def error_status(self) -> int:
+        with self.lock:
+            return self.random.choice(self.error_statuses)
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+
+def split_tokens(text: str):
+    """Pseudo-tokens of ~CHARS_PER_TOKEN characters"""
+    return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+def mock_content(messages) -> str:
+    system_prompt = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user_prompt = "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+    return MockLLMProvider().respond(system_prompt, user_prompt)
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    settings: FakeLLMSettings = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body, headers=None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self.send_json(200, {"object": "list", "data": [{"id": self.settings.model, "object": "model"}]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            self.send_json(200, self.settings.stats)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        settings = self.settings
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        settings.count("requests")
+        delay = settings.first_token_delay()
+
+        if settings.roll(settings.error_rate):
+            settings.count("errors")
+            time.sleep(delay)
+            status = settings.error_status()
+            headers = {"Retry-After": "1"} if status == 429 else None
+            self.send_json(status, {"error": {"message": f"Injected error ({status})"}}, headers)
+            return
+
+        if settings.roll(settings.hang_rate):
+            # Never answers - exercises client read timeouts and deadlines
+            settings.count("hangs")
+            time.sleep(3600)
+            return
+
+        messages = body.get("messages", [])
+        content = mock_content(messages)
+        tokens = split_tokens(content)
+        max_tokens = body.get("max_tokens")
+        if max_tokens:
+            tokens = tokens[:max_tokens]
+        usage = {
+            "prompt_tokens": sum(len(m.get("content", "")) for m in messages) // CHARS_PER_TOKEN,
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        time.sleep(delay)
+        try:
+            if body.get("stream"):
+                self.stream(body, tokens, usage)
+            else:
+                for _ in tokens:
+                    time.sleep(settings.token_delay())
+                self.send_json(200, self.completion(body, "".join(tokens), usage))
+            settings.count("completed")
+        except (BrokenPipeError, ConnectionResetError):
+            settings.count("aborted")  # Client cancelled mid-generation
+
+    def completion(self, body, text: str, usage):
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or self.settings.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    def stream(self, body, tokens, usage) -> None:
+        self.settings.count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model") or self.settings.model
+
+        def event(choices, extra=None):
+            payload = {"id": chunk_id, "object": "chat.completion.chunk", "model": model, "choices": choices}
+            self.wfile.write(b"data: " + json.dumps({**payload, **(extra or {})}).encode() + b"\n\n")
+            self.wfile.flush()
+
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.settings.token_delay())
+            event([{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            event([], {"usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1235)
+    parser.add_argument("--model", default="fake-model")
+    parser.add_argument("--latency-ms", type=float, default=200, help="Time to first token (mean / median)")
+    parser.add_argument("--latency-distribution", choices=["uniform", "exponential", "lognormal"], default="uniform")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Relative spread of latency and token timing")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Generation speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[500, 503, 429],
+                        help="Statuses injected errors are drawn from")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that never answer")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    FakeLLMHandler.settings = FakeLLMSettings(args)
+    server = ThreadingHTTPServer((args.host, args.port), FakeLLMHandler)
+    server.daemon_threads = True
+    print(f"Fake LLM server on http://{args.host}:{args.port}/v1 "
+          f"(latency {args.latency_ms:g}ms {args.latency_distribution}, {args.tokens_per_second:g} tok/s, "
+          f"errors {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served: {FakeLLMHandler.settings.stats}")
+
+
+if __name__ == "__main__":
+    main()
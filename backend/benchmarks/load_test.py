@@ -0,0 +1,192 @@
+"""
+Load test for the SafeSpace API
+Drives analysis, case listing and evidence upload at a fixed concurrency and
+reports throughput and latency percentiles per scenario
+
+Start the fake LLM server and the API, then (from backend/):
+    python -m benchmarks.load_test --scenario analyze --concurrency 8 --requests 200
+    python -m benchmarks.load_test --scenario mixed --concurrency 16 --duration 60 --json results.json
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+import requests
+
+CASE_IDS = ["case_001", "case_002", "case_003"]
+TITLE_IX_QUESTION = "Does this incident meet Title IX hostile environment standard and fall within institutional jurisdiction?"
+PERCENTILES = (50, 90, 95, 99)
+
+
+def analyze(session: requests.Session, base_url: str, rng: random.Random, args) -> requests.Response:
+    body = {"case_id": rng.choice(CASE_IDS), "question": TITLE_IX_QUESTION}
+    if args.strategy:
+        body["strategy"] = args.strategy
+    return session.post(f"{base_url}/api/ai/analyze", json=body, timeout=args.timeout)
+
+
+def list_cases(session: requests.Session, base_url: str, rng: random.Random, args) -> requests.Response:
+    return session.get(f"{base_url}/api/cases", timeout=args.timeout)
+
+
+def upload_evidence(session: requests.Session, base_url: str, rng: random.Random, args) -> requests.Response:
+    file_data = base64.b64encode(os.urandom(args.upload_bytes)).decode()
+    return session.post(
+        f"{base_url}/api/evidence/upload",
+        params={"case_id": rng.choice(CASE_IDS)},
+        json={"file_name": "statement.txt", "file_type": "text/plain", "file_data": file_data,
+              "description": "Load test upload"},
+        timeout=args.timeout
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "analyze": analyze,
+    "cases": list_cases,
+    "upload": upload_evidence,
+}
+
+# Request mix for --scenario mixed: mostly reads, some uploads, a few analyses
+MIXED_WEIGHTS = {"cases": 70, "upload": 20, "analyze": 10}
+
+
+class Results:
+    """Latencies and outcomes per scenario (thread-safe)"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def record(self, scenario: str, latency: float, status: str) -> None:
+        with self.lock:
+            self.latencies[scenario].append(latency)
+            self.statuses[scenario][status] += 1
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(results: Results, elapsed: float) -> Dict[str, Any]:
+    report = {"elapsed_seconds": round(elapsed, 2), "scenarios": {}}
+    for scenario, latencies in sorted(results.latencies.items()):
+        ordered = sorted(latencies)
+        statuses = results.statuses[scenario]
+        errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+        report["scenarios"][scenario] = {
+            "requests": len(ordered),
+            "errors": errors,
+            "statuses": dict(statuses),
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(1000 * sum(ordered) / len(ordered), 1),
+            **{f"p{p}_ms": round(1000 * percentile(ordered, p), 1) for p in PERCENTILES},
+            "max_ms": round(1000 * ordered[-1], 1),
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    columns = ["requests", "errors", "throughput_rps", "mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]
+    print(f"\nFinished in {report['elapsed_seconds']}s")
+    print(f"{'scenario':<10}" + "".join(f"{column:>16}" for column in columns))
+    for scenario, stats in report["scenarios"].items():
+        print(f"{scenario:<10}" + "".join(f"{stats[column]:>16}" for column in columns))
+        failed = {status: count for status, count in stats["statuses"].items() if not status.startswith("2")}
+        if failed:
+            print(f"{'':<10}  non-2xx: {failed}")
+
+
+def run(args) -> Dict[str, Any]:
+    base_url = args.base_url.rstrip("/")
+    results = Results()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    issued = Counter()
+    issued_lock = threading.Lock()
+
+    def next_scenario(rng: random.Random) -> Optional[str]:
+        with issued_lock:
+            if deadline is None and sum(issued.values()) >= args.requests:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            if args.scenario == "mixed":
+                scenario = rng.choices(list(MIXED_WEIGHTS), weights=list(MIXED_WEIGHTS.values()))[0]
+            else:
+                scenario = args.scenario
+            issued[scenario] += 1
+            return scenario
+
+    def client(index: int) -> None:
+        rng = random.Random(None if args.seed is None else args.seed + index)
+        session = requests.Session()
+        while True:
+            scenario = next_scenario(rng)
+            if scenario is None:
+                return
+            started = time.perf_counter()
+            try:
+                status = str(SCENARIOS[scenario](session, base_url, rng, args).status_code)
+            except requests.RequestException as e:
+                status = type(e).__name__
+            results.record(scenario, time.perf_counter() - started, status)
+
+    # Unmeasured warm-up so connection setup and cold models don't skew percentiles
+    warmup_session = requests.Session()
+    for _ in range(args.warmup):
+        try:
+            SCENARIOS["cases" if args.scenario == "mixed" else args.scenario](
+                warmup_session, base_url, random.Random(), args
+            )
+        except requests.RequestException as e:
+            print(f"Warm-up request failed: {e}")
+
+    target = f"{args.duration:g}s" if args.duration else f"{args.requests} requests"
+    print(f"Running '{args.scenario}' against {base_url}: {args.concurrency} clients, {target}")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(client, i) for i in range(args.concurrency)]:
+            future.result()
+    return summarize(results, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the SafeSpace API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["mixed"], default="analyze")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel clients")
+    parser.add_argument("--requests", type=int, default=100, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="Run for this many seconds instead")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests before the run")
+    parser.add_argument("--strategy", choices=["fan_out", "single_call", "cascade"], default=None,
+                        help="Consensus strategy for analyze requests")
+    parser.add_argument("--upload-bytes", type=int, default=64 * 1024, help="Evidence file size")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON (for comparing runs)")
+    args = parser.parse_args()
+
+    report = run(args)
+    report["config"] = {key: value for key, value in vars(args).items() if key != "json"}
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
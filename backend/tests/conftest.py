@@ -0,0 +1,28 @@
+"""
+Test configuration
+Points every store at a throwaway directory and the council at the mock LLM
+before the app (whose Config reads the environment at import) is loaded
+"""
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="safespace-tests-")
+os.environ.update({
+    "LLM_PROVIDER": "mock",
+    "CASE_DB_PATH": os.path.join(_data_dir, "cases.db"),
+    "JOB_DB_PATH": os.path.join(_data_dir, "jobs.db"),
+    "LEGAL_INDEX_DIR": os.path.join(_data_dir, "legal_index"),
+    "PRECOMPUTE_ANALYSES": "false",
+    "WARMUP_ENABLED": "false",
+    "TRACING_EXPORTER": "none",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
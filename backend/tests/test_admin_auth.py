@@ -0,0 +1,54 @@
+"""
+Admin endpoints accept only the configured ADMIN_API_TOKEN
+"""
+import pytest
+
+from app.config import Config
+
+ADMIN_API_TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(Config, "ADMIN_API_TOKEN", ADMIN_API_TOKEN)
+    return ADMIN_API_TOKEN
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _login_token(client, role="administrator"):
+    return client.post("/api/auth/login", json={"role": role}).json()["token"]
+
+
+def test_admin_endpoints_are_disabled_without_a_configured_token(monkeypatch, client):
+    monkeypatch.setattr(Config, "ADMIN_API_TOKEN", "")
+    response = client.get("/api/admin/profiles", headers=_bearer(""))
+    assert response.status_code == 403
+    assert "ADMIN_API_TOKEN" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("path", ["/api/admin/profiles", "/api/export/cases"])
+def test_login_and_forged_tokens_are_rejected(client, admin_token, path):
+    for token in (_login_token(client), "demo_token_administrator_forged", admin_token + "x"):
+        assert client.get(path, headers=_bearer(token)).status_code == 403
+
+
+def test_bulk_import_needs_the_admin_token(client, admin_token):
+    body = b'{"category": "Title IX", "incident_date": "2025-01-30", "description": "Imported complaint"}\n'
+    assert client.post("/api/cases/import", content=body, headers=_bearer(_login_token(client))).status_code == 403
+
+    response = client.post("/api/cases/import", content=body, headers=_bearer(admin_token))
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+
+
+def test_debug_profile_header_needs_the_admin_token(client, admin_token):
+    forged = client.get("/api/cases/stats", headers={**_bearer(_login_token(client)), "X-Debug-Profile": "1"})
+    assert "x-profile-id" not in forged.headers
+
+    profiled = client.get("/api/cases/stats", headers={**_bearer(admin_token), "X-Debug-Profile": "1"})
+    profile_id = profiled.headers["x-profile-id"]
+    response = client.get(f"/api/admin/profiles/{profile_id}", headers=_bearer(admin_token))
+    assert response.status_code == 200
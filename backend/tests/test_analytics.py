@@ -0,0 +1,121 @@
+"""
+Vectorized what-if re-scoring and the vote matrix it reads
+"""
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from app.analytics import VoteMatrix, rescore
+from app.ai_agents.consensus import calculate_consensus
+from app.data import analysis_history
+from app.models.schemas import AgentVote, WhatIfRules
+
+AGENTS = ["Lex", "Sofia", "Equity", "Holmes", "Sentinel"]
+CODES = {"YES": 1, "NO": -1, "ABSTAIN": 0}
+
+
+def _random_councils(count: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    councils = []
+    for _ in range(count):
+        taking_part = [agent for agent in AGENTS if rng.random() > 0.1]
+        councils.append([
+            (agent, str(rng.choice(["YES", "NO", "ABSTAIN"], p=[0.45, 0.45, 0.1])), round(float(rng.random()), 2))
+            for agent in taking_part
+        ])
+    return councils
+
+
+def _matrices(councils):
+    votes = np.zeros((len(councils), len(AGENTS)), dtype=np.int8)
+    confidence = np.full((len(councils), len(AGENTS)), np.nan)
+    for row, council in enumerate(councils):
+        for agent, vote, agent_confidence in council:
+            votes[row, AGENTS.index(agent)] = CODES[vote]
+            confidence[row, AGENTS.index(agent)] = agent_confidence
+    return votes, confidence
+
+
+def test_default_rules_reproduce_calculate_consensus():
+    councils = _random_councils(500)
+    votes, confidence = _matrices(councils)
+    result = rescore(votes, confidence, np.ones(len(AGENTS)), WhatIfRules())
+
+    decisions = {1: "YES", -1: "NO", 0: "UNCERTAIN"}
+    for row, council in enumerate(councils):
+        expected = calculate_consensus("q", [
+            AgentVote(agent_name=agent, agent_role="role", vote=vote, confidence=agent_confidence, reasoning="")
+            for agent, vote, agent_confidence in council
+        ])
+        assert decisions[int(result["decision"][row])] == expected.decision, council
+        assert abs(float(result["confidence"][row]) - expected.confidence) <= 0.01 + 1e-9, council
+        assert bool(result["disagreement"][row]) == expected.has_disagreement, council
+
+
+def test_zero_weight_leaves_the_agent_out():
+    votes, confidence = _matrices([[("Lex", "YES", 0.9), ("Sofia", "NO", 0.6)]])
+    weights = np.array([0.0, 1.0, 1.0, 1.0, 1.0])
+    result = rescore(votes, confidence, weights, WhatIfRules())
+
+    assert result["decision"].tolist() == [-1]
+    assert result["disagreement"].tolist() == [False]
+
+
+def test_uncertain_margin_turns_close_votes_uncertain():
+    votes, confidence = _matrices([[("Lex", "YES", 0.55), ("Sofia", "NO", 0.45)]])
+    result = rescore(votes, confidence, np.ones(len(AGENTS)), WhatIfRules(uncertain_margin=0.2))
+
+    assert result["decision"].tolist() == [0]
+
+
+def _record(case_id: str) -> str:
+    votes = [AgentVote(agent_name=agent, agent_role="role", vote="YES", confidence=0.8, reasoning="")
+             for agent in AGENTS]
+    result = calculate_consensus("Does this case fall under Title IX?", votes)
+    result.analyzed_at = datetime.now()
+    return analysis_history.record_analysis(case_id, result, "api")
+
+
+class _Fetched:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class _RecordAfterFirstRead:
+    """Connection whose first query is followed by another thread recording an analysis"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.recorded = []
+
+    def execute(self, sql, params=()):
+        cursor = self.conn.execute(sql, params)
+        if self.recorded:
+            return cursor
+        rows = cursor.fetchall()
+        writer = threading.Thread(target=lambda: self.recorded.append(_record("case_concurrent")))
+        writer.start()
+        writer.join()
+        return _Fetched(rows)
+
+
+def test_refresh_leaves_analyses_recorded_mid_read_for_the_next_refresh(monkeypatch):
+    _record("case_before")
+    matrix = VoteMatrix()
+    reader = threading.current_thread()
+    connection = _RecordAfterFirstRead(analysis_history._conn())
+    real_conn = analysis_history._conn
+    monkeypatch.setattr(analysis_history, "_conn",
+                        lambda: connection if threading.current_thread() is reader else real_conn())
+
+    snapshot = matrix.refresh()
+    assert connection.recorded[0] not in snapshot.ids
+
+    snapshot = matrix.refresh()
+    row = snapshot.ids.tolist().index(connection.recorded[0])
+    columns = [snapshot.agents.index(agent) for agent in AGENTS]
+    assert snapshot.votes[row, columns].tolist() == [1] * len(AGENTS)
@@ -0,0 +1,50 @@
+"""
+Routes that accept a case number in place of the case id must file their
+results under the case id
+"""
+CASE_ID = "case_001"
+CASE_NUMBER = "NW-2025-TIX-0147"
+
+
+def test_analysis_requested_by_case_number_is_recorded_under_case_id(client):
+    response = client.post("/api/ai/analyze", json={"case_id": CASE_NUMBER, "question": "Is there a pattern?"})
+    assert response.status_code == 200
+
+    history = client.get(f"/api/ai/history/{CASE_ID}", params={"question": "Is there a pattern?"}).json()
+    assert history, "analysis was not recorded under the case id"
+    assert all(record["case_id"] == CASE_ID for record in history)
+    assert client.get(f"/api/ai/history/{CASE_NUMBER}").json() == []
+
+
+def test_title_ix_by_case_number_is_served_from_pre_analysis(client):
+    from app import job_queue
+    from app.ai_agents.consensus import TITLE_IX_QUESTION
+    from app.data import case_store
+
+    live = client.get("/api/ai/analyze/title-ix/case_002")
+    assert live.headers["X-Analysis-Source"] == "live"
+
+    job = job_queue.enqueue_job(case_store.get_case("case_002"), TITLE_IX_QUESTION, "background", speculative=True)
+    assert job_queue.claim_next_job("test-worker")["id"] == job["id"]
+    job_queue.complete_job(job["id"], live.json())
+
+    response = client.get("/api/ai/analyze/title-ix/NW-2025-TIX-0148")
+    assert response.status_code == 200
+    assert response.headers["X-Analysis-Source"] == "precomputed"
+
+
+def test_evidence_uploaded_by_case_number_belongs_to_the_case(client):
+    from app import job_queue
+
+    revision = job_queue.get_case_revision("case_003")
+    response = client.post(
+        "/api/evidence/upload", params={"case_id": "NW-2025-DIS-0089"},
+        json={"file_name": "statement.txt", "file_type": "text/plain", "file_data": "c3RhdGVtZW50",
+              "description": "Written statement"}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["case_id"] == "case_003"
+
+    evidence = client.get("/api/evidence/case/case_003").json()
+    assert response.json()["data"]["id"] in [item["id"] for item in evidence]
+    assert job_queue.get_case_revision("case_003") == revision + 1
@@ -0,0 +1,53 @@
+"""
+Bulk import per-row error reporting
+"""
+import json
+
+from app.data import case_store, importer
+
+
+def _case(case_id, case_number, **fields):
+    return {
+        "id": case_id, "case_number": case_number, "complainant_id": "comp_import", "category": "Harassment",
+        "status": "Intake", "priority": "Standard", "filed_date": "2025-02-01", "incident_date": "2025-01-28",
+        "description": "Imported from the legacy system", "is_ongoing": False, **fields
+    }
+
+
+def _ndjson(*rows):
+    return [("\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n").encode()]
+
+
+def test_ndjson_rows_are_reported_by_number():
+    report = importer.import_stream(_ndjson(
+        _case("case_imp_ok1", "LEG-IMP-0001"),
+        "{not json",
+        "[1, 2]",
+        _case("case_imp_bad", "LEG-IMP-0002", category="Parking"),
+        _case("case_imp_ok1", "LEG-IMP-0003"),  # Repeats row 1's id in the same batch
+        _case("case_imp_ok2", "LEG-IMP-0001"),  # Repeats row 1's case number
+        {"category": "Title IX", "incident_date": "2025-01-30", "description": "Filed as a complaint"},
+    ), "ndjson", batch_size=3)
+
+    assert (report.rows, report.imported, report.failed, report.batches) == (7, 2, 5, 3)
+    assert [error.row for error in report.errors] == [2, 3, 4, 5, 6]
+    assert report.errors[0].error.startswith("Invalid JSON")
+    assert report.errors[1].error == "Expected a JSON object"
+    assert report.errors[2].error.startswith("category:") and report.errors[2].case_id == "case_imp_bad"
+    assert report.errors[3].error == "Case id case_imp_ok1 already exists"
+    assert report.errors[4].error == "Case number LEG-IMP-0001 already exists"
+    assert case_store.get_case("case_imp_ok1")["case_number"] == "LEG-IMP-0001"
+
+
+def test_csv_rows_with_extra_values_are_rejected():
+    csv = (
+        "id,case_number,complainant_id,category,status,priority,filed_date,incident_date,description,is_ongoing\n"
+        "case_imp_csv1,LEG-IMP-0101,comp_import,Retaliation,Review,Urgent,2025-03-01,2025-02-27,Imported,false\n"
+        "case_imp_csv2,LEG-IMP-0102,comp_import,Retaliation,Review,Urgent,2025-03-01,2025-02-27,Imported,false,extra\n"
+    )
+    report = importer.import_stream([csv[:40].encode(), csv[40:].encode()], "csv")
+
+    assert (report.rows, report.imported, report.failed) == (2, 1, 1)
+    assert report.errors[0].row == 2
+    assert report.errors[0].error == "More values than header columns"
+    assert case_store.get_case("case_imp_csv1")["priority"] == "Urgent"
@@ -0,0 +1,47 @@
+"""
+Citation verification against the bundled legal corpus
+"""
+import pytest
+
+from app.legal_corpus import BUNDLED_CORPUS, LegalIndex, citation_keys
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    return LegalIndex(BUNDLED_CORPUS, str(tmp_path_factory.mktemp("legal_index")))
+
+
+def test_citation_keys():
+    assert citation_keys("34 C.F.R. § 106.45(b)(1)") == [("code", "34 cfr 106.45")]
+    assert citation_keys("Davis v. Monroe County Bd. of Educ., 526 U.S. 629 (1999)") == [
+        ("reporter", "526 us 629"), ("name", "davis v monroe")
+    ]
+    assert citation_keys("Title IX") == []
+
+
+@pytest.mark.parametrize("citation", [
+    "Davis v. Monroe County Bd. of Educ., 526 U.S. 629 (1999)",
+    "20 U.S.C. § 1681(a)",
+    "34 C.F.R. § 106.45(b)(1)",
+    "85 Fed. Reg. 30026",
+    "Title IX",
+])
+def test_verify_accepts_corpus_authorities(index, citation):
+    assert index.verify(citation)
+
+
+@pytest.mark.parametrize("citation", [
+    "Davis v. Monroe, 524 U.S. 274",  # Real case name, another case's reporter cite
+    "Smith v. Jones University, 612 U.S. 101 (2023)",
+    "34 C.F.R. § 106.99",
+    "The Campus Harmony Act",
+])
+def test_verify_rejects_unknown_authorities(index, citation):
+    assert not index.verify(citation)
+
+
+
+def test_index_is_reloaded_from_disk(tmp_path):
+    LegalIndex(BUNDLED_CORPUS, str(tmp_path))
+    reloaded = LegalIndex(BUNDLED_CORPUS, str(tmp_path))
+    assert reloaded.verify("Davis v. Monroe County Bd. of Educ., 526 U.S. 629 (1999)")
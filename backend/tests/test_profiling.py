@@ -0,0 +1,42 @@
+"""
+The sampling profiler attributes stacks only to the request they work for
+"""
+import asyncio
+import threading
+
+from app import profiling
+
+
+def _spin_for_request(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _spin_for_another_request(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_contains_only_the_requests_threads():
+    profiler = profiling.SamplingProfiler(0.002)
+    stop = threading.Event()
+    other = threading.Thread(target=_spin_for_another_request, args=(stop,), daemon=True)
+    other.start()
+
+    async def profiled_request():
+        request = profiler.begin()
+        token = profiling._current_request.set(request)
+        try:
+            worker = asyncio.ensure_future(profiling.run_in_threadpool(_spin_for_request, stop))
+            await asyncio.sleep(0.2)
+            stop.set()
+            await worker
+        finally:
+            profiling._current_request.reset(token)
+        return profiler.end(request)
+
+    folded = "".join(asyncio.run(profiled_request()))
+    other.join()
+
+    assert "_spin_for_request" in folded
+    assert "_spin_for_another_request" not in folded
@@ -0,0 +1,41 @@
+"""
+Search snippets are safe to render as HTML
+"""
+PAYLOAD = "<script>alert('pwned')</script>"
+
+
+def test_case_snippets_escape_the_complaint_text(client):
+    response = client.post("/api/cases/intake", json={
+        "category": "Harassment",
+        "incident_date": "2025-03-01",
+        "description": f"Zanzibarite note left on my desk: {PAYLOAD} & more",
+    })
+    assert response.status_code == 200
+
+    hits = client.get("/api/search", params={"q": "zanzibarite", "type": "cases"}).json()["cases"]
+    assert len(hits) == 1
+    snippet = hits[0]["snippet"]
+    assert "<script>" not in snippet
+    assert "&lt;script&gt;alert(&#x27;pwned&#x27;)&lt;/script&gt; &amp; more" in snippet
+    assert snippet.startswith("<mark>Zanzibarite</mark>")
+
+
+def test_evidence_snippets_escape_the_description(client):
+    response = client.post("/api/evidence/upload", params={"case_id": "case_001"}, json={
+        "file_name": "note.txt",
+        "file_type": "text/plain",
+        "file_data": "bm90ZQ==",
+        "description": f"Photo of the quokkaesque note <img src=x onerror=alert(1)> {PAYLOAD}",
+    })
+    assert response.status_code == 200
+
+    hits = client.get("/api/search", params={"q": "quokkaesque", "type": "evidence"}).json()["evidence"]
+    assert len(hits) == 1
+    snippet = hits[0]["snippet"]
+    assert "<img" not in snippet and "<script>" not in snippet
+    assert "<mark>quokkaesque</mark> note &lt;img src=x onerror=alert(1)&gt;" in snippet
+
+
+def test_case_number_snippet_marks_the_matched_prefix(client):
+    hits = client.get("/api/search", params={"q": "nw-2025-tix-0147", "type": "cases"}).json()["cases"]
+    assert [hit["snippet"] for hit in hits] == ["<mark>NW-2025-TIX-0147</mark>"]
@@ -0,0 +1,40 @@
+"""
+Single-call council output parsing and response schema
+"""
+from types import SimpleNamespace
+
+from app.ai_agents.registry import AgentSpec
+from app.ai_agents.single_call import build_response_schema, split_council_votes
+
+AGENTS = ["Title IX Expert", "Bias Detector"]
+
+
+def test_split_council_votes_matches_member_keys_case_insensitively():
+    vote = {"vote": "YES", "confidence": 0.8, "reasoning": "..."}
+    votes = split_council_votes({" title ix expert ": vote, "BIAS DETECTOR": vote}, AGENTS)
+    assert votes == {"Title IX Expert": vote, "Bias Detector": vote}
+
+
+def test_split_council_votes_maps_missing_and_malformed_members_to_none():
+    vote = {"vote": "NO", "confidence": 0.6, "reasoning": "..."}
+    assert split_council_votes({"Title IX Expert": vote}, AGENTS) == {"Title IX Expert": vote, "Bias Detector": None}
+    assert split_council_votes({"Title IX Expert": "YES", "Bias Detector": [vote]}, AGENTS) == {
+        "Title IX Expert": None, "Bias Detector": None
+    }
+
+
+def test_split_council_votes_of_non_object_output():
+    assert split_council_votes(["YES", "NO"], AGENTS) == {"Title IX Expert": None, "Bias Detector": None}
+    assert split_council_votes(None, AGENTS) == {"Title IX Expert": None, "Bias Detector": None}
+
+
+def test_response_schema_allows_abstaining_and_optional_lists():
+    agents = [AgentSpec(module=SimpleNamespace(), name=name, role="") for name in AGENTS]
+    schema = build_response_schema(agents)
+    assert schema["required"] == AGENTS
+
+    member = schema["properties"]["Bias Detector"]
+    assert member["properties"]["vote"]["enum"] == ["YES", "NO", "ABSTAIN"]
+    assert member["properties"]["citations"] == {"type": "array", "items": {"type": "string"}}
+    assert "recommendations" in member["properties"]
+    assert member["additionalProperties"] is True
@@ -0,0 +1,93 @@
+"""
+Timeline interval parsing and contradiction flags
+"""
+from datetime import datetime
+
+from app.timeline import _interval, build_timeline, prompt_sections
+
+
+def test_interval_of_a_bare_date_spans_the_day():
+    start, end, precision, reversed_range = _interval("2025-03-15")
+    assert (start, precision, reversed_range) == (datetime(2025, 3, 15), "day", False)
+    assert end.date() == start.date() and end.hour == 23
+
+
+def test_interval_of_a_timestamp_is_an_instant():
+    start, end, precision, _ = _interval("2025-03-15T14:32:00Z")
+    assert start == end == datetime(2025, 3, 15, 14, 32)
+    assert precision == "time"
+
+
+def test_interval_accepts_range_forms():
+    expected = (datetime(2025, 3, 20), datetime(2025, 3, 25, 23, 59, 59, 999999), "day", False)
+    assert _interval("2025-03-20 to 2025-03-25") == expected
+    assert _interval(["2025-03-20", "2025-03-25"]) == expected
+    assert _interval({"start": "2025-03-20", "end": "2025-03-25"}) == expected
+    assert _interval("March 20, 2025 - March 25, 2025") == expected
+
+
+def test_interval_of_a_reversed_range_is_reordered_and_flagged():
+    start, end, _, reversed_range = _interval("2025-03-25 to 2025-03-20")
+    assert start < end
+    assert reversed_range
+
+
+def test_interval_rejects_unreadable_values():
+    assert _interval("sometime last spring") is None
+    assert _interval(["2025-03-20"]) is None
+    assert _interval(None) is None
+
+
+def _evidence(evidence_id, uploaded_at, **dates):
+    return {"id": evidence_id, "file_name": f"{evidence_id}.pdf", "uploaded_at": uploaded_at,
+            "ai_extracted_data": dates}
+
+
+def _kinds(timeline):
+    return sorted(flag.kind for flag in timeline.contradictions)
+
+
+def test_consistent_case_has_no_contradictions():
+    case = {"id": "c", "incident_date": "2025-03-10", "filed_date": "2025-04-01T09:00:00"}
+    timeline = build_timeline(case, [
+        _evidence("e1", "2025-04-02T10:00:00", date="2025-03-15T14:32:00", date_range="2025-03-15 to 2025-03-16"),
+    ])
+    assert _kinds(timeline) == []
+    assert [event.source for event in timeline.events] == ["incident", "e1", "e1"]
+
+
+def test_contradictions_are_flagged():
+    case = {"id": "c", "incident_date": "2025-05-01", "filed_date": "2025-04-01T09:00:00"}
+    timeline = build_timeline(case, [
+        _evidence("reversed", "2025-06-01T00:00:00", date_range="2025-03-25 to 2025-03-20"),
+        _evidence("future", "2025-04-02T10:00:00", date="2025-04-10"),
+        _evidence("mismatch", "2025-06-01T00:00:00", date="2025-03-01", timeline_position="2025-03-09"),
+    ])
+    assert _kinds(timeline) == ["after_upload", "incident_after_filing", "inconsistent_dates", "reversed_range"]
+
+
+def test_overlaps_are_between_different_sources():
+    case = {"id": "c", "incident_date": "2025-03-15"}
+    timeline = build_timeline(case, [_evidence("e1", None, date="2025-03-15T22:00:00")])
+    assert [flag.events for flag in timeline.overlaps] == [[0, 1]]
+
+
+def test_prompt_leaves_sentences_dated_on_the_timeline_to_it():
+    case = {
+        "incident_date": "2025-03-15",
+        "evidence_summary": "The incident was reported on March 15. Two witnesses support the alibi.",
+    }
+    sections = prompt_sections(case)
+    assert sections.evidence == "Two witnesses support the alibi."
+    assert sections.incident_on_timeline
+    assert "2025-03-15: Incident" in sections.timeline
+
+
+def test_prompt_keeps_dated_facts_the_timeline_lacks():
+    summary = (
+        "Security report dated Nov 3 records respondent blocking the exit. "
+        "Texts sent on 3/15/2025 and 3/16/2025 show a friendly exchange. "
+        "A follow-up meeting was scheduled for 2025-02-30."
+    )
+    sections = prompt_sections({"incident_date": "2025-03-15", "evidence_summary": summary})
+    assert sections.evidence == summary
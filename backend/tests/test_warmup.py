@@ -0,0 +1,60 @@
+"""
+Readiness waits for a successful warm-up pass
+"""
+import time
+
+import pytest
+
+from app import health, warmup
+
+
+class _LocalModel:
+    model = "qwen2.5-7b-instruct"
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(warmup, "state", warmup.WarmupState())
+    monkeypatch.setattr(health.local_llm, "checked_at", time.time())
+    return warmup.state
+
+
+def _prime(status, error=None):
+    return lambda agent, llm_provider: {"agent": agent.name, "status": status, "error": error}
+
+
+def test_failed_priming_keeps_the_app_unready(monkeypatch, client, fresh_state):
+    monkeypatch.setattr(warmup, "prime_agent", _prime("failed", "Connection refused"))
+    warmup.warm_up()
+
+    assert not fresh_state.completed
+    assert fresh_state.runs == 1
+    assert "Connection refused" in fresh_state.last_error
+    response = client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["warmup"]["last_error"] == fresh_state.last_error
+
+
+def test_unlisted_model_keeps_the_app_unready(monkeypatch, fresh_state):
+    monkeypatch.setattr(warmup, "LocalLLMProvider", _LocalModel)
+    monkeypatch.setattr(warmup, "get_agent_provider",
+                        lambda agent, providers: providers.setdefault("local", _LocalModel()))
+    monkeypatch.setattr(warmup, "check_local_model", lambda llm_provider: {
+        "provider": "local", "model": llm_provider.model, "listed": False, "error": "Model not listed by server (none)"
+    })
+    monkeypatch.setattr(warmup, "prime_agent", _prime("primed"))
+    warmup.warm_up()
+
+    assert not fresh_state.completed
+    assert "Model not listed" in fresh_state.last_error
+
+
+def test_successful_pass_after_a_failure_marks_the_app_ready(monkeypatch, client, fresh_state):
+    monkeypatch.setattr(warmup, "prime_agent", _prime("failed", "Connection refused"))
+    warmup.warm_up()
+    monkeypatch.setattr(warmup, "prime_agent", _prime("primed"))
+    warmup.warm_up()
+
+    assert fresh_state.completed
+    assert fresh_state.last_error is None
+    assert client.get("/api/health/ready").status_code == 200